@@ -1,3 +1,4 @@
+import asyncio
 import time
 from fastapi import APIRouter, Request, HTTPException, Depends
 from fastapi.responses import RedirectResponse
@@ -5,9 +6,11 @@ from starlette import status
 from starlette.status import HTTP_302_FOUND
 
 from backend.core.dependencies import get_current_user, check_session_only
-from backend.core.session import rotate_sid, approx_cookie_size_bytes, TOKENS, SERVER_BOOT_ID
+from backend.core.session import (
+    rotate_sid, TOKENS, SERVER_BOOT_ID, get_user_from_session, store_user_in_session,
+)
 from backend.database.users import (
-    upsert_user, get_user_permissions, get_user, set_group_admin, revoke_group_admin,
+    upsert_user, get_user, set_group_admin, revoke_group_admin,
 )
 from backend.services.admin_sync import (
     decide_group_admin_action, ACTION_PROMOTE, ACTION_REVOKE,
@@ -20,7 +23,7 @@ from backend.schemas.ticket import UserOut
 from backend.services.microsoft_auth import (
     initiate_auth_flow, acquire_token_by_auth_code,
 )
-from backend.services.microsoft_graph import get_user_profile
+from backend.services.microsoft_graph import get_user_profile_cached
 from backend.database.audit_log import record_audit
 from backend.database.sessions import upsert_session, delete_session
 from backend.utils.config import config
@@ -57,13 +60,14 @@ def refresh_session(
     user_groups = user.get("groups", []) or []
 
     if user_groups:
-        group_types = get_allowed_ticket_types_for_user(user["id"], user_groups)
+        group_types = get_allowed_ticket_types_for_user(user["id"], user_groups, db_user=db_user)
         for tt in group_types:
             perm = f"create_{tt}"
             if perm not in permissions:
                 permissions.append(perm)
 
-    request.session["user"]["permissions"] = permissions
+    user["permissions"] = permissions
+    store_user_in_session(request.session, user)
     request.session["last_activity"] = int(time.time())
 
     return DataResponse(data=UserOut(
@@ -80,7 +84,8 @@ def refresh_session(
 def me(request: Request, user: dict = Depends(get_current_user)):
     from backend.services.ticket_permissions import get_allowed_ticket_types_for_user
 
-    permissions = get_user_permissions(user["id"])
+    # get_current_user hat die Permissions in diesem Request bereits aus der DB geladen.
+    permissions = list(user.get("permissions") or [])
     user_groups = user.get("groups", []) or []
 
     # Gruppen-basierte create_* Permissions hinzufügen
@@ -111,12 +116,102 @@ def check_session(user: dict = Depends(check_session_only)):
     return {"status": "ok"}
 
 
+# Optionale Graph-Profilfelder – landen nur in der Session, wenn sie gefüllt sind
+# (leere Werte kosten bei jedem Request Cookie-Bytes).
+_OPTIONAL_PROFILE_FIELDS = ("phone", "mobile", "company", "position", "address")
+
+
+def _build_user_payload(id_claims: dict, infos: dict) -> dict:
+    payload = {
+        "id":          id_claims.get("oid") or id_claims.get("sub"),
+        "displayName": id_claims.get("name") or infos.get("displayName"),
+        "email":       id_claims.get("preferred_username")
+                       or id_claims.get("email")
+                       or infos.get("mail"),
+        "groups":      id_claims.get("groups", []) or [],
+    }
+    for key in _OPTIONAL_PROFILE_FIELDS:
+        value = infos.get(key)
+        if value:
+            payload[key] = value
+    return payload
+
+
+def _sync_db_user(
+    user_payload: dict,
+    *,
+    admin_group_configured: bool,
+    groups_authoritative: bool,
+    is_in_admin_group: bool,
+    ip: str | None,
+):
+    """User anlegen/aktualisieren und die Admin-Rolle mit der AD-Gruppe abgleichen."""
+    # User anlegen / last_login aktualisieren (Rolle wird separat synchronisiert)
+    db_user = upsert_user(
+        microsoft_id=user_payload["id"],
+        display_name=user_payload["displayName"] or "",
+        email=user_payload["email"] or "",
+    )
+
+    # Admin-Rolle mit der AD-Gruppe abgleichen: gruppen-basierte Admins werden
+    # bei Austritt entzogen; manuell vergebene Rollen bleiben unberührt
+    # (siehe services.admin_sync). Defensiv – ein Fehler darf den Login nicht
+    # blockieren.
+    action = decide_group_admin_action(
+        admin_group_configured=admin_group_configured,
+        groups_authoritative=groups_authoritative,
+        is_in_admin_group=is_in_admin_group,
+        current_role=db_user.role,
+        admin_via_group=db_user.admin_via_group,
+    )
+    try:
+        if action == ACTION_PROMOTE:
+            db_user = set_group_admin(user_payload["id"]) or db_user
+            record_audit(action="admin_granted", actor_id=user_payload["id"],
+                         actor_name=user_payload["displayName"] or "", entity_type="user",
+                         entity_id=user_payload["id"], summary="Admin via AD-Gruppe",
+                         ip=ip)
+        elif action == ACTION_REVOKE:
+            logger.info("Admin-Rolle entzogen (nicht mehr in AAD-Admin-Gruppe): %s",
+                        user_payload["id"])
+            db_user = revoke_group_admin(user_payload["id"]) or db_user
+            record_audit(action="admin_revoked", actor_id=user_payload["id"],
+                         actor_name=user_payload["displayName"] or "", entity_type="user",
+                         entity_id=user_payload["id"], summary="Nicht mehr in AD-Admin-Gruppe",
+                         ip=ip)
+    except Exception:
+        logger.exception("Admin-Gruppen-Sync fehlgeschlagen für %s", user_payload["id"])
+    return db_user
+
+
+def _register_login(sid: str, user_payload: dict, *, ip: str | None, user_agent: str | None) -> None:
+    """Serverseitige Session-Row (Live-Liste + Force-Logout) + Login-Audit.
+    Synchrone DB-Zugriffe → wird per asyncio.to_thread aufgerufen."""
+    # Best-effort – ein DB-Fehler darf den Login nicht verhindern.
+    try:
+        upsert_session(
+            sid=sid,
+            user_id=user_payload["id"],
+            user_name=user_payload["displayName"] or "",
+            ip=ip,
+            user_agent=user_agent,
+        )
+    except Exception:
+        logger.exception("Session-Registrierung fehlgeschlagen (sid=%s)", sid)
+
+    record_audit(action="login", actor_id=user_payload["id"],
+                 actor_name=user_payload["displayName"] or "", entity_type="auth",
+                 entity_id=user_payload["id"], ip=ip)
+
+
 # ── Login-Flow ─────────────────────────────────────────────────────────────────
 
+# Login-Start/Logout sind rein synchron (MSAL, DB) → normale def-Endpunkte,
+# FastAPI führt sie im Threadpool aus statt auf dem Event-Loop.
 @router.get("/start-auth", include_in_schema=False)
-async def start_auth(request: Request):
+def start_auth(request: Request):
     record_login_attempt()
-    if request.session.get("user"):
+    if get_user_from_session(request.session):
         return RedirectResponse(config.FRONTEND_URL, status_code=HTTP_302_FOUND)
     auth_url = initiate_auth_flow(request)
     return RedirectResponse(auth_url)
@@ -130,14 +225,16 @@ async def auth_callback(request: Request):
         if not request.session.get("auth_flow"):
             raise HTTPException(status_code=400, detail="OAuth Flow fehlt")
 
-        result = acquire_token_by_auth_code(request)
-
+        # MSAL ist synchron (HTTP-Call zum Token-Endpunkt) → nicht im Event-Loop blockieren.
+        result = await asyncio.to_thread(acquire_token_by_auth_code, request)
 
         if not result or "access_token" not in result:
             record_login_failed(reason="token_error")
-            record_audit(action="login_failed", actor_type="system", actor_name="?",
-                         entity_type="auth", summary="Token konnte nicht bezogen werden",
-                         details={"reason": "token_error"}, ip=_client_ip(request))
+            await asyncio.to_thread(
+                record_audit, action="login_failed", actor_type="system", actor_name="?",
+                entity_type="auth", summary="Token konnte nicht bezogen werden",
+                details={"reason": "token_error"}, ip=_client_ip(request),
+            )
             return RedirectResponse(
                 f"{config.FRONTEND_URL}/login?error=token_error",
                 status_code=HTTP_302_FOUND,
@@ -146,13 +243,15 @@ async def auth_callback(request: Request):
         id_claims = result.get("id_token_claims", {}) or {}
 
         try:
-            infos = await get_user_profile(result["access_token"])
+            infos = await get_user_profile_cached(
+                result["access_token"], id_claims.get("oid") or id_claims.get("sub"),
+            )
         except Exception:
             logger.exception("Graph-Call fehlgeschlagen")
             infos = {}
 
         # Die AAD-Admin-Gruppe ist maßgeblich für die Admin-Rolle.
-        # Wichtig: nur auswerten, wenn ADMIN_GROUP_ID konfiguriert ist und der
+        # Wichtig: nur auswerten, wenn ADMIN_GROUP_ID(S) konfiguriert ist und der
         # groups-Claim tatsächlich geliefert wurde. Bei "groups overage" (User in
         # sehr vielen Gruppen) fehlt der Claim – dann NICHT anfassen (fail-safe),
         # sonst würde man Admins fälschlich degradieren.
@@ -160,61 +259,22 @@ async def auth_callback(request: Request):
         groups_authoritative = isinstance(raw_groups, list)  # kein Overage
         user_groups = raw_groups if groups_authoritative else []
 
-        admin_group_configured = bool(config.ADMIN_GROUP_ID)
-        is_in_admin_group = admin_group_configured and config.ADMIN_GROUP_ID in user_groups
+        admin_group_configured = bool(config.ADMIN_GROUP_IDS)
+        is_in_admin_group = admin_group_configured and not config.ADMIN_GROUP_IDS.isdisjoint(user_groups)
 
         # Gruppen-GUIDs nur im DEBUG-Log (verraten Org-Struktur, nicht ins INFO-Log).
         logger.debug("Login groups for user %s: %s", id_claims.get("name"), user_groups)
 
-        user_payload = {
-            "id":          id_claims.get("oid") or id_claims.get("sub"),
-            "displayName": id_claims.get("name") or infos.get("displayName"),
-            "email":       id_claims.get("preferred_username")
-                           or id_claims.get("email")
-                           or infos.get("mail"),
-            "phone":       infos.get("phone"),
-            "mobile":      infos.get("mobile"),
-            "company":     infos.get("company"),
-            "position":    infos.get("position"),
-            "address":     infos.get("address") or {},
-            "groups":      id_claims.get("groups", []) or [],
-        }
-
-        # User anlegen / last_login aktualisieren (Rolle wird separat synchronisiert)
-        db_user = upsert_user(
-            microsoft_id=user_payload["id"],
-            display_name=user_payload["displayName"] or "",
-            email=user_payload["email"] or "",
-        )
+        user_payload = _build_user_payload(id_claims, infos)
 
-        # Admin-Rolle mit der AD-Gruppe abgleichen: gruppen-basierte Admins werden
-        # bei Austritt entzogen; manuell vergebene Rollen bleiben unberührt
-        # (siehe services.admin_sync). Defensiv – ein Fehler darf den Login nicht
-        # blockieren.
-        action = decide_group_admin_action(
+        # User-Row + Admin-Gruppen-Abgleich sind synchrone DB-Zugriffe → im Thread.
+        db_user = await asyncio.to_thread(
+            _sync_db_user, user_payload,
             admin_group_configured=admin_group_configured,
             groups_authoritative=groups_authoritative,
             is_in_admin_group=is_in_admin_group,
-            current_role=db_user.role,
-            admin_via_group=db_user.admin_via_group,
+            ip=_client_ip(request),
         )
-        try:
-            if action == ACTION_PROMOTE:
-                db_user = set_group_admin(user_payload["id"]) or db_user
-                record_audit(action="admin_granted", actor_id=user_payload["id"],
-                             actor_name=user_payload["displayName"] or "", entity_type="user",
-                             entity_id=user_payload["id"], summary="Admin via AD-Gruppe",
-                             ip=_client_ip(request))
-            elif action == ACTION_REVOKE:
-                logger.info("Admin-Rolle entzogen (nicht mehr in AAD-Admin-Gruppe): %s",
-                            user_payload["id"])
-                db_user = revoke_group_admin(user_payload["id"]) or db_user
-                record_audit(action="admin_revoked", actor_id=user_payload["id"],
-                             actor_name=user_payload["displayName"] or "", entity_type="user",
-                             entity_id=user_payload["id"], summary="Nicht mehr in AD-Admin-Gruppe",
-                             ip=_client_ip(request))
-        except Exception:
-            logger.exception("Admin-Gruppen-Sync fehlgeschlagen für %s", user_payload["id"])
 
         # Permissions in die Session schreiben
         user_payload["permissions"] = db_user.permissions
@@ -222,48 +282,29 @@ async def auth_callback(request: Request):
         sid = rotate_sid(request.session)
         TOKENS.put(sid, result)
         request.session.update({
-            "user": user_payload,
             "last_activity": int(time.time()),
             "boot_id": SERVER_BOOT_ID,
         })
         request.session.pop("auth_flow", None)
 
-        if approx_cookie_size_bytes(request.session) > 3000:
-            logger.warning("Session cookie zu groß, shrinking")
-            request.session.clear()
-            request.session.update({
-                "sid": sid,
-                "user": user_payload,
-                "last_activity": int(time.time()),
-                "boot_id": SERVER_BOOT_ID,
-            })
-
-        # Serverseitige Session-Row anlegen (für Live-Liste + Force-Logout).
-        # Best-effort – ein DB-Fehler darf den Login nicht verhindern.
-        try:
-            upsert_session(
-                sid=sid,
-                user_id=user_payload["id"],
-                user_name=user_payload["displayName"] or "",
-                ip=_client_ip(request),
-                user_agent=request.headers.get("user-agent"),
-            )
-        except Exception:
-            logger.exception("Session-Registrierung fehlgeschlagen (sid=%s)", sid)
+        store_user_in_session(request.session, user_payload)
 
+        await asyncio.to_thread(
+            _register_login, sid, user_payload,
+            ip=_client_ip(request), user_agent=request.headers.get("user-agent"),
+        )
         record_login_success()
-        record_audit(action="login", actor_id=user_payload["id"],
-                     actor_name=user_payload["displayName"] or "", entity_type="auth",
-                     entity_id=user_payload["id"], ip=_client_ip(request))
 
         return RedirectResponse(config.FRONTEND_URL, status_code=HTTP_302_FOUND)
 
     except Exception:
         logger.exception("Login fehlgeschlagen")
         record_login_failed(reason="exception")
-        record_audit(action="login_failed", actor_type="system", actor_name="?",
-                     entity_type="auth", summary="Login fehlgeschlagen",
-                     details={"reason": "exception"}, ip=_client_ip(request))
+        await asyncio.to_thread(
+            record_audit, action="login_failed", actor_type="system", actor_name="?",
+            entity_type="auth", summary="Login fehlgeschlagen",
+            details={"reason": "exception"}, ip=_client_ip(request),
+        )
         return RedirectResponse(
             f"{config.FRONTEND_URL}/login?error=login_failed",
             status_code=HTTP_302_FOUND,
@@ -273,12 +314,13 @@ async def auth_callback(request: Request):
 # ── Logout ────────────────────────────────────────────────────────────────────
 
 @router.get("/logout", include_in_schema=False)
-async def logout(request: Request):
+def logout(request: Request):
+    # User vor dem Löschen des Store-Eintrags lesen (liegt serverseitig zur sid).
+    u = get_user_from_session(request.session) or {}
     sid = request.session.get("sid")
     if sid:
         TOKENS.delete(sid)
         delete_session(sid)
-    u = request.session.get("user") or {}
     record_audit(action="logout", actor_id=u.get("id"), actor_name=u.get("displayName") or "",
                  entity_type="auth", entity_id=u.get("id"), ip=_client_ip(request))
     request.session.clear()
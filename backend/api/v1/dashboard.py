@@ -1,8 +1,10 @@
+from datetime import datetime
+
 from fastapi import APIRouter, Depends, Query
 from backend.core.dependencies import get_current_user
 from backend.database import tickets as database
 from backend.models.models import TicketType
-from backend.services.ticket_permissions import can_user_create_ticket
+from backend.services.ticket_permissions import get_allowed_ticket_types_for_user
 from backend.services.workflow_state import get_dashboard_work, get_involved_tickets
 from backend.schemas.dashboard import (
     DashboardResponse, DashboardTicket, DepartmentGroup, DepartmentTicket,
@@ -17,10 +19,10 @@ def _to_dashboard_ticket(t) -> DashboardTicket:
     return DashboardTicket(
         id=t.id,
         title=t.title,
-        type_key=t.ticket_type if isinstance(t.ticket_type, str) else t.ticket_type.value,
-        status=t.status if isinstance(t.status, str) else t.status.value,
-        priority=t.priority if isinstance(t.priority, str) else t.priority.value,
-        created_at=t.created_at.strftime("%d.%m.%Y") if hasattr(t.created_at, "strftime") else str(t.created_at)[:10],
+        type_key=getattr(t.ticket_type, "value", t.ticket_type),
+        status=getattr(t.status, "value", t.status),
+        priority=getattr(t.priority, "value", t.priority),
+        created_at=t.created_at.strftime("%d.%m.%Y") if isinstance(t.created_at, datetime) else str(t.created_at)[:10],
     )
 
 
@@ -69,16 +71,13 @@ def get_dashboard(user: dict = Depends(get_current_user)):
     ]
 
     # 3. Beobachtete Tickets (Ersteller ist automatisch Beobachter)
-    from backend.database.ticket_watchers import list_ticket_ids_for_watcher
-    watched_tickets = [database.get_ticket(tid) for tid in list_ticket_ids_for_watcher(user_id)]
-    watched_orders = [_to_dashboard_ticket(t) for t in watched_tickets if t]
+    watched_orders = [_to_dashboard_ticket(t) for t in database.list_tickets_watched_by(user_id)]
 
     # ── Erlaubte Ticket-Typen ──────────────────────────────────────────────────
+    # Einmal für alle Typen auswerten (ein User-Lookup) statt can-create je Typ.
     user_groups = user.get("groups", []) or []
-    allowed = [
-        t.value for t in TicketType
-        if can_user_create_ticket(t.value, user_id, user_groups)
-    ]
+    allowed_set = set(get_allowed_ticket_types_for_user(user_id, user_groups))
+    allowed = [t.value for t in TicketType if t.value in allowed_set]
 
     return DataResponse(data=DashboardResponse(
         orders=my_orders,
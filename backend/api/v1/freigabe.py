@@ -27,8 +27,9 @@ FREIGABE_PHASE_KEY = "freigabe"
 
 def _render(request: Request, status: str, ticket=None) -> HTMLResponse:
     return request.app.templates.TemplateResponse(
-        "freigabe_result.html",
-        {"request": request, "status": status, "ticket": ticket},
+        request,
+        request.app.state.freigabe_template,
+        {"status": status, "ticket": ticket},
     )
 
 
@@ -12,7 +12,6 @@ from fastapi import APIRouter, Request, Depends
 from backend.core.dependencies import get_current_user
 from backend.core.session import TOKENS
 from backend.database import sessions as session_store
-from backend.database.users import PERM_ADMIN
 from backend.database.audit_log import record_audit
 from backend.metrics.auth_metrics import record_force_logout
 from backend.schemas.responses import ErrorCode, api_error
@@ -22,7 +21,7 @@ router = APIRouter()
 
 
 def _require_admin(user: dict) -> dict:
-    if PERM_ADMIN not in user.get("permissions", []):
+    if not user.get("is_admin", False):
         raise api_error(403, ErrorCode.ADMIN_REQUIRED, "Admin-Rechte erforderlich")
     return user
 
@@ -1,18 +1,19 @@
 import re
 import uuid
+from functools import lru_cache
 from fastapi import APIRouter, Depends, HTTPException, Request, Query
 from pydantic import BaseModel
 from typing import Optional
 
 from backend.core.dependencies import get_current_user
-from backend.database.groups import get_groups, save_groups
+from backend.database.groups import get_groups, group_name_exists, groups_by_id, save_groups
 from backend.database.settings import (
     get_companies_full, set_companies_full,
 )
 from backend.database.users import (
     list_users, set_user_role, get_user,
     add_extra_permission, remove_extra_permission, set_extra_permissions,
-    VALID_ROLES, PERM_ADMIN,
+    VALID_ROLES,
 )
 from backend.models.models import TicketType
 from backend.database.audit_log import record_audit, list_audit, distinct_actions
@@ -35,7 +36,7 @@ EMAIL_REGEX = re.compile(r"^[^@\s]+@[^@\s]+\.[^@\s]+$")
 # ── Auth helper ───────────────────────────────────────────────────────────────
 
 def require_admin(user: dict) -> None:
-    if PERM_ADMIN not in user.get("permissions", []):
+    if not user.get("is_admin", False):
         raise HTTPException(403, "Admin-Rechte erforderlich")
 
 
@@ -51,9 +52,14 @@ def _audit(user: dict, action: str, **kw) -> None:
 
 # ── Diff-Helfer fürs Audit (Bulk-Speichern schickt alles → nur echte Änderungen loggen) ──
 
-def _names_from(request) -> dict:
-    return {u["id"]: (u.get("displayName") or u.get("mail") or u["id"])
-            for u in getattr(request.app.state, "user_cache", [])}
+def _names_from(request):
+    """id → Anzeigename über den User-Index (nur die benötigten IDs, kein Dict über alle User)."""
+    index = getattr(request.app.state, "user_index", {})
+
+    def name_of(uid: str) -> str:
+        u = index.get(uid)
+        return (u.get("displayName") or u.get("mail") or uid) if u else uid
+    return name_of
 
 
 def _summary(parts: list[str], noun: str) -> str:
@@ -233,10 +239,11 @@ class EnvResponse(BaseModel):
     session: dict
 
 
-@router.get("/settings/env", response_model=DataResponse[EnvResponse])
-def get_env(user: dict = Depends(get_current_user)):
-    require_admin(user)
-    return DataResponse(data=EnvResponse(
+@lru_cache(maxsize=1)
+def _env_view() -> EnvResponse:
+    """Baut die Env-Übersicht einmalig – die Werte stammen aus der Prozess-Umgebung
+    und ändern sich erst mit einem Neustart."""
+    return EnvResponse(
         general={
             "APP_ENV":     {"value": config.APP_ENV,           "sensitive": False},
             "PORT":        {"value": config.PORT,              "sensitive": False},
@@ -255,7 +262,13 @@ def get_env(user: dict = Depends(get_current_user)):
             "SESSION_TIMEOUT": {"value": config.SESSION_TIMEOUT,      "sensitive": False},
             "SECRET_KEY":      {"is_set": bool(config.SECRET_KEY),    "sensitive": True},
         },
-    ))
+    )
+
+
+@router.get("/settings/env", response_model=DataResponse[EnvResponse])
+def get_env(user: dict = Depends(get_current_user)):
+    require_admin(user)
+    return DataResponse(data=_env_view())
 
 
 # ── Companies ─────────────────────────────────────────────────────────────────
@@ -375,14 +388,18 @@ class PermissionsIn(BaseModel):
     group_permissions: dict[TicketType, list[str]] = {}
 
 
+# Tickettypen + Labels sind statisch (Enum) → einmal beim Import bauen.
+_TICKET_TYPES: list[TicketTypeInfo] = [
+    TicketTypeInfo(key=t.value, label=TICKET_LABELS.get(t, t.value), allowed_users=[], allowed_groups=[])
+    for t in TicketType
+]
+
+
 @router.get("/settings/ticket-types", response_model=DataResponse[list[TicketTypeInfo]])
 def get_ticket_types(user: dict = Depends(get_current_user)):
     """Listet alle gültigen Tickettypen – nützlich für Frontend-Dropdowns."""
     require_admin(user)
-    return DataResponse(data=[
-        TicketTypeInfo(key=t.value, label=TICKET_LABELS.get(t, t.value), allowed_users=[], allowed_groups=[])
-        for t in TicketType
-    ])
+    return DataResponse(data=_TICKET_TYPES)
 
 
 @router.get("/settings/permissions", response_model=DataResponse[PermissionsOut])
@@ -408,13 +425,13 @@ def set_permissions(
     user: dict = Depends(get_current_user),
 ):
     require_admin(user)
-    user_cache = getattr(request.app.state, "user_cache", [])
+    user_index = getattr(request.app.state, "user_index", {})
     old_users = load_ticket_permissions()
     old_groups = load_group_ticket_permissions()
 
     set_ticket_permissions_safe(
         {k.value: v for k, v in payload.permissions.items()},
-        user_cache=user_cache,
+        user_index=user_index,
     )
     new_users = {k.value: v for k, v in payload.permissions.items()}
     new_groups = {k.value: v for k, v in payload.group_permissions.items()}
@@ -424,7 +441,7 @@ def set_permissions(
 
     # Nur echte Änderungen protokollieren – mit Person/Gruppe (aufgelöst zu Namen).
     from backend.database.groups import get_groups as _get_groups
-    names = _names_from(request)
+    name_of = _names_from(request)
     gmap = {g["id"]: g["name"] for g in _get_groups()}
     for g in getattr(request.app.state, "group_cache", []):
         gmap.setdefault(g["id"], g.get("displayName") or g["id"])
@@ -437,8 +454,8 @@ def set_permissions(
         ou, nu = set(old_users.get(tk, [])), set(new_users.get(tk, []))
         og, ng = set(old_groups.get(tk, [])), set(new_groups.get(tk, []))
         ch: list[str] = []
-        if nu - ou: ch.append("Person +: " + ", ".join(sorted(names.get(i, i) for i in nu - ou)))
-        if ou - nu: ch.append("Person −: " + ", ".join(sorted(names.get(i, i) for i in ou - nu)))
+        if nu - ou: ch.append("Person +: " + ", ".join(sorted(name_of(i) for i in nu - ou)))
+        if ou - nu: ch.append("Person −: " + ", ".join(sorted(name_of(i) for i in ou - nu)))
         if ng - og: ch.append("Gruppe +: " + ", ".join(sorted(_glabel(i) for i in ng - og)))
         if og - ng: ch.append("Gruppe −: " + ", ".join(sorted(_glabel(i) for i in og - ng)))
         if ch:
@@ -513,13 +530,15 @@ class GroupsBulkIn(BaseModel):
 
 
 def _validate_emails(emails: list[str]) -> list[str]:
-    cleaned = []
+    """Normalisiert + validiert in einem Durchlauf; Duplikate fallen weg,
+    die Reihenfolge der Eingabe bleibt erhalten."""
+    cleaned: dict[str, None] = {}
     for m in emails:
         m = m.strip().lower()
         if not EMAIL_REGEX.match(m):
             raise HTTPException(400, f"Ungültige E-Mail: '{m}'")
-        cleaned.append(m)
-    return list(set(cleaned))
+        cleaned[m] = None
+    return list(cleaned)
 
 
 def _group_out(g: dict) -> GroupOut:
@@ -550,7 +569,7 @@ def set_groups_bulk(payload: GroupsBulkIn, request: Request, user: dict = Depend
     Schritt. Pflichtgruppen dürfen nicht gelöscht/umbenannt werden."""
     from backend.services.workflow_state import required_group_names
     require_admin(user)
-    valid_ids = {u["id"] for u in getattr(request.app.state, "user_cache", [])}
+    valid_ids = getattr(request.app.state, "user_index", {})
     old_groups = get_groups()
 
     cleaned: list[dict] = []
@@ -583,8 +602,8 @@ def set_groups_bulk(payload: GroupsBulkIn, request: Request, user: dict = Depend
 
     save_groups(cleaned)
 
-    names = _names_from(request)
-    created, deleted, modified = _diff_groups(old_groups, cleaned, lambda i: names.get(i, i))
+    name_of = _names_from(request)
+    created, deleted, modified = _diff_groups(old_groups, cleaned, name_of)
     parts = ([f"„{n}“ angelegt" for n in created]
              + [f"„{n}“ gelöscht" for n in deleted]
              + [f"„{m['name']}“: {'; '.join(m['changes'])}" for m in modified])
@@ -605,9 +624,9 @@ def create_group(payload: GroupCreate, user: dict = Depends(get_current_user)):
     name = payload.name.strip()
     if not name:
         raise HTTPException(400, "Name erforderlich")
-    groups = get_groups()
-    if any(g["name"].lower() == name.lower() for g in groups):
+    if group_name_exists(name):
         raise HTTPException(400, f"Gruppe '{name}' existiert bereits")
+    groups = get_groups()
     new = {
         "id": uuid.uuid4().hex,
         "name": name,
@@ -628,37 +647,37 @@ def update_group(
     user: dict = Depends(get_current_user),
 ):
     require_admin(user)
-    valid_ids = {u["id"] for u in request.app.state.user_cache}
+    valid_ids = request.app.state.user_index
     for m in payload.members:
         if m not in valid_ids:
             raise HTTPException(400, f"Ungültige User-ID '{m}'")
     new_name = payload.name.strip()
     groups = get_groups()
-    for g in groups:
-        if g["id"] == group_id:
-            # Pflichtgruppen dürfen nicht umbenannt werden – der Workflow löst sie
-            # über den Namen auf. Mitglieder/Verteiler bleiben editierbar.
-            if is_required_group_name(g["name"]) and new_name.lower() != g["name"].lower():
-                raise HTTPException(
-                    409,
-                    f"Die Fachabteilung '{g['name']}' wird von den Workflows benötigt "
-                    f"und kann nicht umbenannt werden.",
-                )
-            g["name"]          = new_name
-            g["members"]       = payload.members
-            g["distributions"] = _validate_emails(payload.distributions)
-            g["hidden"]        = bool(payload.hidden)
-            save_groups(groups)
-            _audit(user, "group_updated", entity_type="group", entity_id=group_id, summary=new_name)
-            return DataResponse(data=_group_out(g))
-    raise HTTPException(404, "Gruppe nicht gefunden")
+    g = groups_by_id(groups).get(group_id)
+    if g is None:
+        raise HTTPException(404, "Gruppe nicht gefunden")
+    # Pflichtgruppen dürfen nicht umbenannt werden – der Workflow löst sie
+    # über den Namen auf. Mitglieder/Verteiler bleiben editierbar.
+    if is_required_group_name(g["name"]) and new_name.lower() != g["name"].lower():
+        raise HTTPException(
+            409,
+            f"Die Fachabteilung '{g['name']}' wird von den Workflows benötigt "
+            f"und kann nicht umbenannt werden.",
+        )
+    g["name"]          = new_name
+    g["members"]       = list(dict.fromkeys(payload.members))
+    g["distributions"] = _validate_emails(payload.distributions)
+    g["hidden"]        = bool(payload.hidden)
+    save_groups(groups)
+    _audit(user, "group_updated", entity_type="group", entity_id=group_id, summary=new_name)
+    return DataResponse(data=_group_out(g))
 
 
 @router.delete("/settings/groups/{group_id}", status_code=204)
 def delete_group(group_id: str, user: dict = Depends(get_current_user)):
     require_admin(user)
     groups = get_groups()
-    target = next((g for g in groups if g["id"] == group_id), None)
+    target = groups_by_id(groups).get(group_id)
     if not target:
         raise HTTPException(404, "Gruppe nicht gefunden")
     # Workflow-Pflichtgruppen dürfen nicht gelöscht werden.
@@ -680,19 +699,19 @@ def add_member(
     user: dict = Depends(get_current_user),
 ):
     require_admin(user)
-    valid_ids = {u["id"] for u in request.app.state.user_cache}
+    valid_ids = request.app.state.user_index
     if payload.user_id not in valid_ids:
         raise HTTPException(400, f"Ungültige User-ID '{payload.user_id}'")
     groups = get_groups()
-    for g in groups:
-        if g["id"] == group_id:
-            if payload.user_id not in g["members"]:
-                g["members"].append(payload.user_id)
-            save_groups(groups)
-            _audit(user, "group_member_added", entity_type="group", entity_id=group_id,
-                   summary=g["name"], details={"user_id": payload.user_id})
-            return DataResponse(data=_group_out(g))
-    raise HTTPException(404, "Gruppe nicht gefunden")
+    g = groups_by_id(groups).get(group_id)
+    if g is None:
+        raise HTTPException(404, "Gruppe nicht gefunden")
+    if payload.user_id not in g["members"]:
+        g["members"].append(payload.user_id)
+    save_groups(groups)
+    _audit(user, "group_member_added", entity_type="group", entity_id=group_id,
+           summary=g["name"], details={"user_id": payload.user_id})
+    return DataResponse(data=_group_out(g))
 
 
 @router.delete("/settings/groups/{group_id}/members/{user_id}", response_model=DataResponse[GroupOut])
@@ -703,16 +722,16 @@ def remove_member(
 ):
     require_admin(user)
     groups = get_groups()
-    for g in groups:
-        if g["id"] == group_id:
-            if user_id not in g["members"]:
-                raise HTTPException(400, "User nicht in Gruppe")
-            g["members"] = [m for m in g["members"] if m != user_id]
-            save_groups(groups)
-            _audit(user, "group_member_removed", entity_type="group", entity_id=group_id,
-                   summary=g["name"], details={"user_id": user_id})
-            return DataResponse(data=_group_out(g))
-    raise HTTPException(404, "Gruppe nicht gefunden")
+    g = groups_by_id(groups).get(group_id)
+    if g is None:
+        raise HTTPException(404, "Gruppe nicht gefunden")
+    if user_id not in g["members"]:
+        raise HTTPException(400, "User nicht in Gruppe")
+    g["members"] = [m for m in g["members"] if m != user_id]
+    save_groups(groups)
+    _audit(user, "group_member_removed", entity_type="group", entity_id=group_id,
+           summary=g["name"], details={"user_id": user_id})
+    return DataResponse(data=_group_out(g))
 
 
 # ── Gruppen (öffentlich, für Dropdowns) ──────────────────────────────────────
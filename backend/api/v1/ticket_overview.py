@@ -1,16 +1,18 @@
-import json
+from datetime import datetime
 from typing import Optional
 
 from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import ORJSONResponse
 from pydantic import BaseModel
 
 from backend.core.dependencies import get_current_user
 from backend.database import tickets as database
 from backend.schemas.responses import DataResponse, ListResponse, Meta
-from backend.services.ticket_history import get_ticket_history
+from backend.services.ticket_history import sorted_history
 from backend.services.workflow_state import responsibility_label
 
-router = APIRouter()
+# orjson statt json-Modul für alle Antworten (Listen mit bis zu 2000 Einträgen).
+router = APIRouter(default_response_class=ORJSONResponse)
 
 
 # ── Schemas ────────────────────────────────────────────────────────────────────
@@ -99,10 +101,10 @@ def _assert_overview_detail_access(user: dict, ticket) -> None:
 # ── Helpers ────────────────────────────────────────────────────────────────────
 
 def _fmt_dt(val) -> str:
+    if isinstance(val, datetime):
+        return val.isoformat()
     if val is None:
         return ""
-    if hasattr(val, "isoformat"):
-        return val.isoformat()
     return str(val)
 
 
@@ -134,16 +136,15 @@ def list_overview_tickets(
     _require_view(user)
 
     offset  = (page - 1) * page_size
-    tickets = database.list_all_tickets(limit=page_size, offset=offset)
-    total   = database.count_all_tickets()
+    tickets, total = database.list_ticket_summaries(limit=page_size, offset=offset)
 
     items = [
         TicketOverviewItem(
             id=t.id,
             title=t.title,
-            type_key=t.ticket_type if isinstance(t.ticket_type, str) else t.ticket_type.value,
-            status=t.status        if isinstance(t.status,        str) else t.status.value,
-            priority=t.priority    if isinstance(t.priority,      str) else t.priority.value,
+            type_key=getattr(t.ticket_type, "value", t.ticket_type),
+            status=getattr(t.status, "value", t.status),
+            priority=getattr(t.priority, "value", t.priority),
             created_at=_fmt_dt(t.created_at),
             creator=t.owner_name,
             responsible=responsibility_label(t),
@@ -161,10 +162,7 @@ def list_overview_tickets(
 def build_overview_detail(ticket) -> TicketOverviewDetail:
     """Baut das (read-only) Detail-Objekt eines Tickets. Wird sowohl vom normalen
     Overview-Endpunkt als auch vom Admin-Detail (tickets.py) genutzt."""
-    try:
-        description = json.loads(ticket.description or "{}")
-    except Exception:
-        description = {}
+    description = ticket.description_parsed
 
     workflow = ticket.workflow_state_parsed or {}
     # departments aus der department_review-Phase (neues Format), Fallback altes Format.
@@ -189,7 +187,7 @@ def build_overview_detail(ticket) -> TicketOverviewDetail:
     from backend.services.workflow_state import primary_responsibility
     resp = primary_responsibility(ticket)
 
-    raw_history = get_ticket_history(ticket.id)
+    raw_history = sorted_history(ticket.history_parsed)
     history = []
     for e in raw_history:
         actor_raw = e.get("actor", {})
@@ -58,11 +58,7 @@ def get_ticket_view(
 
     can_complete = user_can_complete_department(ticket_id, user["id"], department)
 
-    import json
-    try:
-        desc = json.loads(ticket.description or "{}")
-    except Exception:
-        desc = {}
+    desc = ticket.description_parsed
 
     return DataResponse(data=TicketViewResponse(
         ticket=TicketMeta(
@@ -1,17 +1,23 @@
-import json
 from datetime import datetime
 
 from fastapi import APIRouter, Request, Depends, Query
+from fastapi.responses import ORJSONResponse
 from typing import Optional
 from backend.core.dependencies import get_current_user
 from backend.database import tickets as database
 from backend.models.models import RequestStatus, TicketType
-from backend.services.ticket_history import add_history_event
+from backend.services.ticket_history import (
+    add_history_event, add_history_events, history_event, record_history_audit,
+    update_ticket_with_event,
+)
 from backend.services.microsoft_graph import get_cached_user_mail
-from backend.services.microsoft_mail import send_newrequest_mail, send_mail_to_all_fachabteilung
+from backend.services.microsoft_mail import (
+    send_newrequest_mail, send_mail_to_all_fachabteilung, send_freigabe_mail,
+    send_personalnummer_warning_mail, send_rejection_mail, send_nachtrag_mail,
+)
 from backend.services.ticket_permissions import can_user_create_ticket
 from backend.schemas.ticket import (
-    TicketOut, TicketCreateRequest, TicketUpdateRequest, UserOut, BasisTicketCreateRequest,
+    TicketOut, TicketCreateRequest, TicketUpdateRequest, BasisTicketCreateRequest,
     ResponsibilityOverrideRequest, LockState,
     RawTicketUpdateRequest, BulkTicketActionRequest, BulkActionResult,
 )
@@ -23,64 +29,103 @@ from backend.services.bulk_actions import normalize_bulk_action, required_permis
 from backend.database.users import PERM_MANAGE, PERM_ADMIN
 from backend.database.audit_log import record_audit
 from backend.services.workflow_state import (
-    build_workflow, set_workflow_state, advance_phase,
+    build_workflow, advance_phase,
     reject_workflow, get_current_phase, all_required_departments_done,
+    user_is_responsible, set_phase_responsibility, involved_group_ids, get_workflow_state,
+    get_departments_for_user, get_all_department_statuses, user_can_complete_department,
+    set_department_status as set_workflow_department_status, department_entry,
+)
+from backend.database.groups import (
+    group_exists, get_distributions_from_group, get_group_ids_for_user, get_groups, get_group_name_from_id,
+)
+from backend.services.phase_definitions import PhaseType, PhaseView, TICKET_PHASES
+from backend.services.freigabe_token import make_token
+from backend.utils.config import config
+from backend.database.ticket_watchers import is_watcher, list_watchers, add_watcher, remove_watcher
+from backend.database.ticket_locks import (
+    get_active_lock, acquire_lock, refresh_lock, release_lock, force_release_lock,
+)
+from backend.database.personalnummer import (
+    db_assign_personalnummer_for_company, PersonalnummerNotConfigured, PersonalnummerExhausted,
 )
+from backend.utils import json_codec
 from backend.utils.ticket_labels import TICKET_LABELS
 from backend.utils.logger import logger
-from backend.metrics.ticket_metrics import tickets_created_total
+from backend.metrics.ticket_metrics import record_ticket_created
 from zoneinfo import ZoneInfo
-router = APIRouter()
+# orjson statt json-Modul: schneller und ohne \uXXXX-Escapes für Umlaute.
+router = APIRouter(default_response_class=ORJSONResponse)
 
 
-def _user_can_delete_ticket(user: dict, ticket_id: int) -> bool:
-    """Admins oder Besitzer dürfen löschen."""
-    if user.get("is_admin", False):
-        return True
-    try:
-        owned = database.list_tickets_by_owner(user["id"])
-    except Exception:
-        logger.exception("Konnte Tickets des Users nicht laden")
-        return False
-    return any(t.id == ticket_id for t in owned)
+_BERLIN = ZoneInfo("Europe/Berlin")
+
+
+# Profilfelder, die als owner_info am Ticket gespeichert werden. Gruppen-IDs und
+# die pro Request geladenen Permissions gehören nicht dazu (kein Leser, nur Ballast).
+_OWNER_INFO_FIELDS = ("id", "displayName", "email", "phone", "mobile", "company", "position", "address")
+
+
+def owner_info_json(user: dict) -> str:
+    return json_codec.dumps({k: user[k] for k in _OWNER_INFO_FIELDS if user.get(k)})
+
+
+# ── Ticket-Titel ──────────────────────────────────────────────────────────────
+# Typ → Funktion (user, desc) → Titel-Label; Typen ohne Eintrag nutzen TICKET_LABELS.
+
+def _person_title(prefix: str):
+    """Präfix + Name der Person aus dem Formular (On-/Offboarding)."""
+    def build(user: dict, desc: dict) -> str:
+        personal = desc.get("personal", {})
+        name = f"{personal.get('first_name', '')} {personal.get('last_name', '')}".strip()
+        return f"{prefix} – {name}"
+    return build
+
+
+def _stellenanzeige_title(user: dict, desc: dict) -> str:
+    stelle = desc.get("stelle", {})
+
+    unit = stelle.get("gesellschaft", "")
+    Niederlassung = stelle.get("niederlassung", "")
+    Job = stelle.get("berufsbezeichnung", "")
+
+    return f"{unit}_{Niederlassung}_{Job}"
+
+
+def _hotelbuchung_title(user: dict, desc: dict) -> str:
+    return f"Hotelbuchung – {user['displayName']}"
+
+
+def _basis_ticket_title(user: dict, desc: dict) -> str:
+    ticket_data = desc.get("ticket", {})
+    betreff = ticket_data.get("betreff", "").strip()
+    return f"Basis-Ticket – {betreff}" if betreff else f"Basis-Ticket – {user['displayName']}"
+
+
+_TITLE_BUILDERS = {
+    TicketType.zugang_beantragen: _person_title("Onboarding Mitarbeiter:innen"),
+    TicketType.zugang_sperren: _person_title("Offboarding Mitarbeiter:innen"),
+    TicketType.marketing_stellenanzeige: _stellenanzeige_title,
+    TicketType.hotelbuchung: _hotelbuchung_title,
+    TicketType.basis_ticket: _basis_ticket_title,
+}
 
 
 def generate_title(ticket_type, user, desc):
-    now_str = datetime.now(ZoneInfo("Europe/Berlin")).strftime("%Y-%m-%d %H:%M")
+    now_str = f"{datetime.now(_BERLIN):%Y-%m-%d %H:%M}"
 
     if isinstance(desc, str):
-        desc = json.loads(desc)
-
-    personal = desc.get("personal", {})
-    first_name = personal.get("first_name", "")
-    last_name = personal.get("last_name", "")
-    name = f"{first_name} {last_name}".strip()
-
-    if ticket_type == TicketType.zugang_beantragen:
-        label = f"Onboarding Mitarbeiter:innen – {name}"
-    elif ticket_type == TicketType.zugang_sperren:
-        label = f"Offboarding Mitarbeiter:innen – {name}"
-    elif ticket_type == TicketType.marketing_stellenanzeige:
-        stelle = desc.get("stelle", {})
-
-        unit = stelle.get("gesellschaft", "")
-        Niederlassung = stelle.get("niederlassung", "")
-        Job = stelle.get("berufsbezeichnung", "")
-
-        label = f"{unit}_{Niederlassung}_{Job}"
-    elif ticket_type == TicketType.hotelbuchung:
-        label = f"Hotelbuchung – {user['displayName']}"
-    elif ticket_type == TicketType.basis_ticket:
-        ticket_data = desc.get("ticket", {})
-        betreff = ticket_data.get("betreff", "").strip()
-        label = f"Basis-Ticket – {betreff}" if betreff else f"Basis-Ticket – {user['displayName']}"
+        desc = json_codec.loads(desc)
+
+    builder = _TITLE_BUILDERS.get(ticket_type)
+    if builder is not None:
+        label = builder(user, desc)
     else:
         label = TICKET_LABELS.get(ticket_type, ticket_type.value)
 
     return f"{label} – {now_str}"
 
 
-def validate_assignee(user_cache, assignee_id: str) -> bool:
+def validate_assignee(user_index, assignee_id: str) -> bool:
     if not assignee_id:
         return False
     # Platzhalter für Ticket-Typen ohne Bearbeitungsphase (z.B. Marketing,
@@ -88,19 +133,35 @@ def validate_assignee(user_cache, assignee_id: str) -> bool:
     # steht im workflow_state.departments, nicht im assignee.
     if assignee_id == "fachabteilung":
         return True
-    # Check if it's a valid group ID
-    from backend.database.groups import get_groups
-    group_ids = {g["id"] for g in get_groups()}
-    if assignee_id in group_ids:
-        return True
-    return any(u.get("id") == assignee_id for u in user_cache)
+    # AD-User (app.state.user_index, reiner Dict-Lookup) zuerst, dann Gruppe
+    # (gecachter id-Index, lädt bei kaltem Cache aus den Settings).
+    return assignee_id in user_index or group_exists(assignee_id)
+
+
+def _initial_watchers(data, user: dict) -> list[tuple]:
+    """Beobachter: vom Client übergebene Liste (inkl. Ersteller), sonst nur Ersteller."""
+    if data.watchers:
+        return [(w.id, w.name) for w in data.watchers]
+    return [(user["id"], user["displayName"])]
+
+
+def _parse_description(raw: str) -> dict:
+    """description des Create-Requests genau einmal parsen. Muss ein JSON-Objekt
+    sein (Titel und Workflow lesen daraus) – sonst 400 statt späterem 500."""
+    try:
+        parsed = json_codec.loads(raw)
+    except Exception:
+        parsed = None
+    if not isinstance(parsed, dict):
+        raise api_error(400, ErrorCode.INVALID_DESCRIPTION,
+                        "description muss gültiges JSON sein")
+    return parsed
 
 
 def _build_and_init_workflow(ticket) -> dict:
     """Builds workflow, saves it, advances past the creation phase. Returns updated workflow."""
     workflow = build_workflow(ticket)
-    set_workflow_state(ticket.id, workflow)
-    return advance_phase(ticket.id)
+    return advance_phase(ticket.id, workflow=workflow, ticket=ticket)
 
 
 def notify_phase_entry(request, ticket, phase: Optional[dict]) -> None:
@@ -114,8 +175,6 @@ def notify_phase_entry(request, ticket, phase: Optional[dict]) -> None:
     """
     if not phase:
         return
-    from backend.services.phase_definitions import PhaseType, PhaseView
-    from backend.database.groups import get_distributions_from_group
 
     ptype = phase.get("type")
     if ptype == PhaseType.department_review.value:
@@ -127,9 +186,6 @@ def notify_phase_entry(request, ticket, phase: Optional[dict]) -> None:
 
     # Freigabe-Phase: Mail mit JA/NEIN-Buttons (signierte Links) an die Verteiler
     if phase.get("view") == PhaseView.approval.value and kind == "group":
-        from backend.services.freigabe_token import make_token
-        from backend.services.microsoft_mail import send_freigabe_mail
-        from backend.utils.config import config
         base = config.FRONTEND_URL.rstrip("/")
         approve_url = f"{base}/api/v1/freigabe?token={make_token(ticket.id, 'approve')}"
         reject_url  = f"{base}/api/v1/freigabe?token={make_token(ticket.id, 'reject')}"
@@ -147,10 +203,21 @@ def notify_phase_entry(request, ticket, phase: Optional[dict]) -> None:
             send_newrequest_mail(mail_to, ticket.priority, ticket.title, ticket.ticket_type, ticket.id)
 
 
+async def _json_body(request: Request) -> dict:
+    """JSON-Body als Dict ({} wenn leer/ungültig). Als async Dependency gelesen,
+    damit die Handler selbst sync bleiben – FastAPI führt sie im Threadpool aus
+    und die synchronen DB-/Mail-Aufrufe blockieren nicht den Event-Loop."""
+    try:
+        body = await request.json()
+    except Exception:
+        return {}
+    return body if isinstance(body, dict) else {}
+
+
 # ── Permission helpers ────────────────────────────────────────────────────────
 
 def _require_admin(user: dict) -> dict:
-    if PERM_ADMIN not in user.get("permissions", []):
+    if not user.get("is_admin", False):
         raise api_error(403, ErrorCode.ADMIN_REQUIRED, "Admin-Rechte erforderlich")
     return user
 
@@ -186,16 +253,13 @@ def _assert_ticket_access(ticket, user: dict):
     if PERM_MANAGE in user.get("permissions", []):
         return
 
-    from backend.database.groups import get_group_ids_for_user
     user_group_ids = get_group_ids_for_user(user_id)
 
     # In der aktuellen Phase zuständig (Person, Gruppe oder Reviewing-Fachabteilung)?
-    from backend.services.workflow_state import user_is_responsible
     if user_is_responsible(ticket, user_id, user_group_ids):
         return
 
     # Beobachter dürfen das Ticket sehen
-    from backend.database.ticket_watchers import is_watcher
     if is_watcher(ticket.id, user_id):
         return
 
@@ -205,9 +269,8 @@ def _assert_ticket_access(ticket, user: dict):
 def _assert_not_locked_by_other(ticket_id: int, user: dict) -> None:
     """Schreibzugriff verweigern, wenn ein ANDERER Nutzer den Edit-Lock hält.
     Admins umgehen den Lock (können ihn per Force-Unlock ohnehin aufheben)."""
-    if PERM_ADMIN in user.get("permissions", []):
+    if user.get("is_admin", False):
         return
-    from backend.database.ticket_locks import get_active_lock
     lock = get_active_lock(ticket_id)
     if lock and lock["holder_id"] != user["id"]:
         raise api_error(
@@ -216,30 +279,26 @@ def _assert_not_locked_by_other(ticket_id: int, user: dict) -> None:
         )
 
 
-# ══════════════════════════════════════════════════════════════════════════════
-# AUTH
-# ══════════════════════════════════════════════════════════════════════════════
-
-@router.get("/auth/me", response_model=DataResponse[UserOut])
-def get_me(user: dict = Depends(get_current_user)):
-    return DataResponse(data=UserOut(
-        id=user["id"],
-        displayName=user["displayName"],
-        mail=user.get("mail") or user.get("email"),
-        permissions=user.get("permissions", []),
-    ))
-
-
 # ══════════════════════════════════════════════════════════════════════════════
 # TICKETS – User
 # ══════════════════════════════════════════════════════════════════════════════
 
 @router.get("/tickets", response_model=ListResponse[TicketOut])
-def list_my_tickets(user: dict = Depends(get_current_user)):
-    items = database.list_tickets_by_owner(user["id"])
+def list_my_tickets(
+    limit: Optional[int] = Query(None, ge=1, le=500),
+    offset: int = Query(0, ge=0),
+    user: dict = Depends(get_current_user),
+):
+    """Eigene Tickets. Ohne `limit` wie bisher alle; mit `limit`/`offset` wird
+    seitenweise aus der DB gelesen statt die komplette Liste aufzubauen."""
+    if limit is None:
+        items = database.list_tickets_by_owner(user["id"], fields=database.TICKET_LIST_FIELDS)
+        total, limit, offset = len(items), len(items), 0
+    else:
+        items, total = database.list_tickets_by_owner_page(user["id"], limit=limit, offset=offset)
     return ListResponse(
         data=[TicketOut.from_ticket(t) for t in items],
-        meta=Meta(total=len(items), limit=len(items), offset=0),
+        meta=Meta(total=total, limit=limit, offset=offset),
     )
 
 
@@ -247,7 +306,6 @@ def list_my_tickets(user: dict = Depends(get_current_user)):
 def get_ticket(ticket_id: int, user: dict = Depends(get_current_user)):
     ticket = _get_ticket_or_404(ticket_id)
     _assert_ticket_access(ticket, user)
-    from backend.database.ticket_watchers import list_watchers
     return DataResponse(data=TicketOut.from_ticket(ticket, watchers=list_watchers(ticket_id)))
 
 
@@ -258,20 +316,21 @@ def get_ticket(ticket_id: int, user: dict = Depends(get_current_user)):
 def get_ticket_watchers(ticket_id: int, user: dict = Depends(get_current_user)):
     ticket = _get_ticket_or_404(ticket_id)
     _assert_ticket_access(ticket, user)
-    from backend.database.ticket_watchers import list_watchers
     return DataResponse(data={"watchers": list_watchers(ticket_id)})
 
 
 @router.post("/tickets/{ticket_id}/watchers", status_code=201)
-async def add_ticket_watcher(ticket_id: int, request: Request, user: dict = Depends(get_current_user)):
+def add_ticket_watcher(
+    ticket_id: int,
+    body: dict = Depends(_json_body),
+    user: dict = Depends(get_current_user),
+):
     ticket = _get_ticket_or_404(ticket_id)
     _assert_ticket_access(ticket, user)
-    body = await request.json()
     watcher_id = (body.get("user_id") or "").strip()
     watcher_name = (body.get("user_name") or "").strip()
     if not watcher_id:
         raise api_error(400, ErrorCode.INVALID_WATCHER, "user_id ist erforderlich")
-    from backend.database.ticket_watchers import add_watcher, list_watchers
     add_watcher(ticket_id, watcher_id, watcher_name or None)
     return DataResponse(data={"watchers": list_watchers(ticket_id)})
 
@@ -280,7 +339,6 @@ async def add_ticket_watcher(ticket_id: int, request: Request, user: dict = Depe
 def remove_ticket_watcher(ticket_id: int, watcher_id: str, user: dict = Depends(get_current_user)):
     ticket = _get_ticket_or_404(ticket_id)
     _assert_ticket_access(ticket, user)
-    from backend.database.ticket_watchers import remove_watcher, list_watchers
     remove_watcher(ticket_id, watcher_id)
     return DataResponse(data={"watchers": list_watchers(ticket_id)})
 
@@ -291,7 +349,6 @@ def get_ticket_phases(ticket_type: TicketType, user: dict = Depends(get_current_
     Phasen-Vorschau für einen Tickettyp (statische Definition aus TICKET_PHASES,
     ohne dass ein Ticket existiert) – für die Ablauf-Anzeige beim Erstellen.
     """
-    from backend.services.phase_definitions import TICKET_PHASES
     defs = TICKET_PHASES.get(ticket_type, [])
     return DataResponse(data=[
         {"key": p.key, "label": p.label, "type": p.type.value} for p in defs
@@ -299,7 +356,7 @@ def get_ticket_phases(ticket_type: TicketType, user: dict = Depends(get_current_
 
 
 @router.post("/tickets", response_model=DataResponse[TicketOut], status_code=201)
-async def create_ticket(
+def create_ticket(
     data: TicketCreateRequest,
     request: Request,
     user: dict = Depends(get_current_user),
@@ -316,51 +373,43 @@ async def create_ticket(
     # einen frei wählbaren Bearbeiter braucht (siehe unten). Tickettypen mit fester
     # Zuständigkeit der ersten Phase (assign_group/Freigabe/Fachabteilungen) kommen
     # ohne Assignee aus.
-    try:
-        json.loads(data.description)   # nur Validierung: muss gültiges JSON sein
-    except Exception:
-        raise api_error(400, ErrorCode.INVALID_DESCRIPTION,
-                        "description muss gültiges JSON sein")
+    # Einmal parsen: Validierung, Titel und Workflow nutzen dasselbe Objekt.
+    parsed_description = _parse_description(data.description)
 
     description = data.description
     # Hinweis: Die Personalnummer wird NICHT bei der Erstellung vergeben, sondern
     # erst beim Abschluss der BackOffice-Phase (endgültige „Firma lt. Arbeitsvertrag“)
     # – siehe _assign_onboarding_personalnummer() in submit_ticket.
 
-    title = generate_title(data.ticket_type, user, description)
+    title = generate_title(data.ticket_type, user, parsed_description)
+    # Ticket, Erstellungs-Event und Beobachter in einer Transaktion anlegen.
+    created = [history_event(
+        actor_id=user["id"],
+        actor_name=user["displayName"],
+        action="ticket_created",
+        details={"priority": data.priority.value, "ticket_type": data.ticket_type.value},
+    )]
     ticket_id = request.app.state.manager.create_ticket(
         title=title,
         ticket_type=data.ticket_type,
         description=description,
         owner_id=user["id"],
         owner_name=user["displayName"],
-        owner_info=json.dumps(user, ensure_ascii=False),
+        owner_info=owner_info_json(user),
         comment=data.comment,
         priority=data.priority,
+        history=created,
+        watchers=_initial_watchers(data, user),
     )
-    add_history_event(
-        ticket_id,
-        actor_id=user["id"],
-        actor_name=user["displayName"],
-        action="ticket_created",
-        details={"priority": data.priority.value, "ticket_type": data.ticket_type.value},
-    )
-    tickets_created_total.labels(type=data.ticket_type.value).inc()
-
-    # Beobachter: vom Client übergebene Liste (inkl. Ersteller), sonst nur Ersteller
-    from backend.database.ticket_watchers import add_watcher
-    if data.watchers:
-        for w in data.watchers:
-            add_watcher(ticket_id, w.id, w.name)
-    else:
-        add_watcher(ticket_id, user["id"], user["displayName"])
+    record_history_audit(ticket_id, title, created)
+    record_ticket_created(data.ticket_type)
 
     ticket = database.get_ticket(ticket_id)
+    ticket.prime_parsed("description", parsed_description)
     updated_workflow = _build_and_init_workflow(ticket)
     ticket = database.get_ticket(ticket_id)
 
     # Phase nach dem Vorbei-Advancen der Erstellung
-    from backend.services.workflow_state import PhaseType as WfPhaseType, set_phase_responsibility
     phases = updated_workflow.get("phases", [])
     current_idx = updated_workflow.get("current_phase_index", 0)
     current_phase = phases[current_idx] if current_idx < len(phases) else None
@@ -369,14 +418,13 @@ async def create_ticket(
     # (kein assign_group), muss der Client einen Bearbeiter mitliefern.
     needs_assignee = (
         current_phase is not None
-        and current_phase.get("type") == WfPhaseType.assignment.value
+        and current_phase.get("type") == PhaseType.assignment.value
         and not (current_phase.get("responsibility") or {}).get("kind")
     )
     if needs_assignee:
-        if not validate_assignee(request.app.state.user_cache, data.assignee_id):
+        if not validate_assignee(request.app.state.user_index, data.assignee_id):
             raise api_error(400, ErrorCode.INVALID_ASSIGNEE,
                             f"Unbekannter Assignee '{data.assignee_id}'")
-        from backend.database.groups import get_groups
         group_map = {g["id"]: g["name"] for g in get_groups()}
         if data.assignee_id in group_map:
             set_phase_responsibility(ticket_id, current_idx,
@@ -387,7 +435,7 @@ async def create_ticket(
         ticket = database.get_ticket(ticket_id)
         current_phase = ticket.workflow_state_parsed.get("phases", [])[current_idx]
 
-    if current_phase and current_phase.get("type") == WfPhaseType.department_review.value:
+    if current_phase and current_phase.get("type") == PhaseType.department_review.value:
         add_history_event(
             ticket_id,
             actor_id=user["id"],
@@ -407,68 +455,57 @@ async def create_ticket(
 
 
 @router.post("/tickets/basis", response_model=DataResponse[TicketOut], status_code=201)
-async def create_basis_ticket(
+def create_basis_ticket(
     data: BasisTicketCreateRequest,
     request: Request,
     user: dict = Depends(get_current_user),
 ):
     # Keine Permission-Prüfung – jeder eingeloggte User darf Basis-Tickets erstellen
 
-    if not validate_assignee(request.app.state.user_cache, data.assignee_id):
+    if not validate_assignee(request.app.state.user_index, data.assignee_id):
         raise api_error(400, ErrorCode.INVALID_ASSIGNEE,
                         f"Unbekannter Assignee '{data.assignee_id}'")
-    try:
-        json.loads(data.description)
-    except Exception:
-        raise api_error(400, ErrorCode.INVALID_DESCRIPTION,
-                        "description muss gültiges JSON sein")
+    parsed_description = _parse_description(data.description)
 
     # Basis-Tickets sind ausschließlich Fachabteilungen zuweisbar (keine Personen).
-    from backend.database.groups import get_groups
     group_map = {g["id"]: g["name"] for g in get_groups()}
     if data.assignee_id not in group_map:
         raise api_error(400, ErrorCode.INVALID_ASSIGNEE,
                         "Basis-Tickets können nur einer Fachabteilung zugewiesen werden")
 
-    now_str = datetime.now(ZoneInfo("Europe/Berlin")).strftime("%Y-%m-%d %H:%M")
+    now_str = f"{datetime.now(_BERLIN):%Y-%m-%d %H:%M}"
     title = f"{data.title.strip()} – {now_str}" if data.title.strip() else f"Basis-Ticket – {user['displayName']} – {now_str}"
 
+    created = [history_event(
+        actor_id=user["id"],
+        actor_name=user["displayName"],
+        action="ticket_created",
+        details={"priority": data.priority, "ticket_type": "basis-ticket"},
+    )]
     ticket_id = request.app.state.manager.create_ticket(
         title=title,
         ticket_type=TicketType.basis_ticket,
         description=data.description,
         owner_id=user["id"],
         owner_name=user["displayName"],
-        owner_info=json.dumps(user, ensure_ascii=False),
+        owner_info=owner_info_json(user),
         comment=data.comment or "",
         priority=data.priority or "medium",
+        history=created,
+        watchers=_initial_watchers(data, user),
     )
-    add_history_event(
-        ticket_id,
-        actor_id=user["id"],
-        actor_name=user["displayName"],
-        action="ticket_created",
-        details={"priority": data.priority, "ticket_type": "basis-ticket"},
-    )
-    tickets_created_total.labels(type=TicketType.basis_ticket.value).inc()
-
-    # Beobachter: vom Client übergebene Liste (inkl. Ersteller), sonst nur Ersteller
-    from backend.database.ticket_watchers import add_watcher
-    if data.watchers:
-        for w in data.watchers:
-            add_watcher(ticket_id, w.id, w.name)
-    else:
-        add_watcher(ticket_id, user["id"], user["displayName"])
+    record_history_audit(ticket_id, title, created)
+    record_ticket_created(TicketType.basis_ticket)
 
     # Workflow aufbauen und an der Erstellungsphase vorbei in die Bearbeitung schieben.
     # Basis-Tickets haben Phasen [creation, assignment] – danach immer Assignment-Phase.
     ticket = database.get_ticket(ticket_id)
+    ticket.prime_parsed("description", parsed_description)
     updated_workflow = _build_and_init_workflow(ticket)
     current_idx = updated_workflow.get("current_phase_index", 0)
 
     # Zuständigkeit der Bearbeitungsphase (immer eine Fachabteilung) in den
     # Workflow schreiben + Verteiler der Gruppe benachrichtigen.
-    from backend.services.workflow_state import set_phase_responsibility
     set_phase_responsibility(ticket_id, current_idx,
         {"kind": "group", "id": data.assignee_id, "name": group_map[data.assignee_id]})
     for g in get_groups():
@@ -482,7 +519,7 @@ async def create_basis_ticket(
 
 
 @router.patch("/tickets/{ticket_id}", response_model=DataResponse[TicketOut])
-async def update_ticket(
+def update_ticket(
     ticket_id: int,
     data: TicketUpdateRequest,
     request: Request,
@@ -495,34 +532,35 @@ async def update_ticket(
     # assignee_id/assignee_name werden beim PATCH ignoriert (siehe unten) – daher
     # hier auch keine Assignee-Validierung mehr.
 
-    # --- Änderungen tracken (old → new) ---
+    # --- Änderungen tracken (old → new); geschrieben werden nur echte Änderungen ---
     changes = {}
+    updates = {}
 
     if data.priority is not None and data.priority != ticket.priority:
         changes["priority"] = {"old": ticket.priority.value, "new": data.priority.value}
+        updates["priority"] = data.priority.value
 
     if data.comment is not None:
         stripped = data.comment.strip()
         if stripped != ticket.comment:
             changes["comment"] = {"old": ticket.comment, "new": stripped}
+            updates["comment"] = stripped
 
     if data.description is not None and data.description != ticket.description:
+        # Einmal parsen und inhaltlich vergleichen: nur anders formatiertes, aber
+        # gleiches JSON (Key-Reihenfolge, Whitespace) ist keine Änderung – kein
+        # UPDATE, kein History-/Audit-Eintrag.
         try:
-            old_desc = json.loads(ticket.description) if ticket.description else {}
-            new_desc = json.loads(data.description)
+            new_desc = json_codec.loads(data.description)
         except Exception:
-            old_desc, new_desc = ticket.description, data.description
-        changes["description"] = {"old": old_desc, "new": new_desc}
-
-    # --- DB Update ---
-    updates = {k: v for k, v in {
-        "description": data.description,
-        "comment":     data.comment.strip() if data.comment else None,
-        "priority":    data.priority.value if data.priority else None,
-    }.items() if v is not None}
-
-    if updates:
-        database.update_ticket(ticket_id=ticket_id, **updates)
+            new_desc = None
+        old_desc = ticket.description_parsed if ticket.description else {}
+        if new_desc is None:
+            changes["description"] = {"old": ticket.description, "new": data.description}
+            updates["description"] = data.description
+        elif new_desc != old_desc:
+            changes["description"] = {"old": old_desc, "new": new_desc}
+            updates["description"] = data.description
 
     # Hinweis: Ein PATCH (Feld-Speichern) ändert BEWUSST NICHT die Zuständigkeit.
     # Die Zuständigkeit wird ausschließlich bei der Erstellung (create_ticket) und
@@ -532,15 +570,19 @@ async def update_ticket(
     # hat dadurch beim Speichern die echte Zuständigkeit überschrieben. data.assignee_id
     # wird hier deshalb ignoriert.
 
-    # --- Ein gebündeltes History-Event für alle Änderungen ---
-    if changes:
-        add_history_event(
-            ticket_id,
-            actor_id=user["id"],
-            actor_name=user["displayName"],
-            action="ticket_updated",
-            details={"changes": changes},
-        )
+    if not changes:
+        # Nichts geändert → das bereits geladene Ticket ist aktuell.
+        return DataResponse(data=TicketOut.from_ticket(ticket))
+
+    # --- DB-Update + ein gebündeltes History-Event in EINER Transaktion ---
+    update_ticket_with_event(
+        ticket_id,
+        updates,
+        actor_id=user["id"],
+        actor_name=user["displayName"],
+        action="ticket_updated",
+        details={"changes": changes},
+    )
 
     return DataResponse(data=TicketOut.from_ticket(database.get_ticket(ticket_id)))
 
@@ -558,7 +600,6 @@ def acquire_ticket_lock(ticket_id: int, user: dict = Depends(get_current_user)):
     """
     ticket = _get_ticket_or_404(ticket_id)
     _assert_ticket_access(ticket, user)
-    from backend.database.ticket_locks import acquire_lock
     state = acquire_lock(ticket_id, user["id"], user["displayName"])
     return DataResponse(data=LockState(**state))
 
@@ -566,7 +607,6 @@ def acquire_ticket_lock(ticket_id: int, user: dict = Depends(get_current_user)):
 @router.post("/tickets/{ticket_id}/lock/heartbeat", response_model=DataResponse[LockState])
 def heartbeat_ticket_lock(ticket_id: int, user: dict = Depends(get_current_user)):
     """Lebenszeichen des Editors – hält den Lock aktiv. is_me=False → Lock verloren."""
-    from backend.database.ticket_locks import refresh_lock, get_active_lock
     still_mine = refresh_lock(ticket_id, user["id"])
     if still_mine:
         return DataResponse(data=LockState(locked=True, is_me=True,
@@ -582,7 +622,6 @@ def heartbeat_ticket_lock(ticket_id: int, user: dict = Depends(get_current_user)
 @router.delete("/tickets/{ticket_id}/lock", status_code=204)
 def release_ticket_lock(ticket_id: int, user: dict = Depends(get_current_user)):
     """Gibt den eigenen Lock frei (beim Verlassen der Bearbeitung)."""
-    from backend.database.ticket_locks import release_lock
     release_lock(ticket_id, user["id"])
 
 
@@ -591,7 +630,6 @@ def get_ticket_lock(ticket_id: int, user: dict = Depends(get_current_user)):
     """Aktuellen Sperr-Status abfragen (z.B. für die read-only Übersicht)."""
     ticket = _get_ticket_or_404(ticket_id)
     _assert_ticket_access(ticket, user)
-    from backend.database.ticket_locks import get_active_lock
     lock = get_active_lock(ticket_id)
     if not lock:
         return DataResponse(data=LockState(locked=False, is_me=False))
@@ -612,10 +650,7 @@ def _assign_onboarding_personalnummer(ticket_id: int, user: dict) -> None:
     oder erschöpft ist (dann wird die Phase nicht weitergeschaltet).
     """
     ticket = database.get_ticket(ticket_id)
-    try:
-        desc_obj = json.loads(ticket.description or "{}")
-    except Exception:
-        desc_obj = {}
+    desc_obj = ticket.description_parsed
     personal = desc_obj.get("personal") or {}
     if str(personal.get("personal_number") or "").strip():
         return  # bereits vergeben – nicht erneut
@@ -625,11 +660,6 @@ def _assign_onboarding_personalnummer(ticket_id: int, user: dict) -> None:
         raise api_error(400, "PERSONALNUMMER_FAILED",
                         "Bitte zuerst die „Firma lt. Arbeitsvertrag“ auswählen.")
 
-    from backend.database.personalnummer import (
-        db_assign_personalnummer_for_company,
-        PersonalnummerNotConfigured, PersonalnummerExhausted,
-    )
-    from backend.utils.config import config
     try:
         result = db_assign_personalnummer_for_company(
             company, warn_remaining=config.PERSONALNUMMER_WARN_REMAINING,
@@ -650,7 +680,7 @@ def _assign_onboarding_personalnummer(ticket_id: int, user: dict) -> None:
 
     personal["personal_number"] = str(result["number"])
     desc_obj["personal"] = personal
-    database.update_ticket(ticket_id=ticket_id, description=json.dumps(desc_obj, ensure_ascii=False))
+    database.update_ticket(ticket_id=ticket_id, description=json_codec.dumps(desc_obj))
 
     person_name = f"{personal.get('first_name', '')} {personal.get('last_name', '')}".strip()
     record_audit(
@@ -674,16 +704,16 @@ def _assign_onboarding_personalnummer(ticket_id: int, user: dict) -> None:
             details={"company": company, "remaining": result.get("remaining"), "pnr_to": result.get("pnr_to")},
         )
         try:
-            from backend.services.microsoft_mail import send_personalnummer_warning_mail
             send_personalnummer_warning_mail(company, result["remaining"], result["pnr_to"])
         except Exception:
             logger.exception("Personalnummern-Warn-Mail fehlgeschlagen (Firma %s)", company)
 
 
 @router.post("/tickets/{ticket_id}/submit", response_model=DataResponse[TicketOut])
-async def submit_ticket(
+def submit_ticket(
     ticket_id: int,
     request: Request,
+    body: dict = Depends(_json_body),
     user: dict = Depends(get_current_user),
 ):
     ticket = _get_ticket_or_404(ticket_id)
@@ -694,21 +724,38 @@ async def submit_ticket(
     if not current_phase:
         raise api_error(400, ErrorCode.INVALID_STATUS, "Ticket hat keine aktive Phase")
 
-    from backend.services.phase_definitions import PhaseType
     if current_phase["type"] != PhaseType.assignment:
         raise api_error(400, ErrorCode.INVALID_STATUS, "Aktuelle Phase kann nicht über Submit abgeschlossen werden")
 
     # Optionaler „nächster Bearbeiter" (z.B. BackOffice wählt Person/Fachabteilung,
     # Zuständigkeit wird erst beim Abschluss aktiviert).
-    try:
-        body = await request.json()
-    except Exception:
-        body = {}
-    next_assignee_id   = (body or {}).get("assignee_id")
-    next_assignee_name = (body or {}).get("assignee_name")
+    next_assignee_id   = body.get("assignee_id")
+    next_assignee_name = body.get("assignee_name")
 
     completed_key = current_phase["key"]
 
+    # Nächste assignment-Phase ohne feste Zuständigkeit → gewählten Bearbeiter
+    # setzen – VOR dem Advance im geladenen Workflow, damit Phasenwechsel und
+    # Zuständigkeit in einem Update landen (und ein ungültiger Bearbeiter weder
+    # weiterschaltet noch eine Personalnummer verbraucht).
+    workflow = ticket.workflow_state_parsed
+    phases = workflow.get("phases", [])
+    upcoming_idx = workflow.get("current_phase_index", 0) + 1
+    upcoming = phases[upcoming_idx] if upcoming_idx < len(phases) else None
+    if (upcoming is not None
+            and upcoming.get("type") == PhaseType.assignment.value
+            and not (upcoming.get("responsibility") or {}).get("kind")
+            and next_assignee_id):
+        if not validate_assignee(request.app.state.user_index, next_assignee_id):
+            raise api_error(400, ErrorCode.INVALID_ASSIGNEE,
+                            f"Unbekannter Assignee '{next_assignee_id}'")
+        if group_exists(next_assignee_id):
+            upcoming["responsibility"] = {"kind": "group", "id": next_assignee_id,
+                                          "name": get_group_name_from_id(next_assignee_id)}
+        else:
+            upcoming["responsibility"] = {"kind": "user", "id": next_assignee_id,
+                                          "name": next_assignee_name or next_assignee_id}
+
     # Personalnummer erst beim Abschluss des BackOffice vergeben (endgültige
     # „Firma lt. Arbeitsvertrag"). Schlägt es fehl (kein Bereich / erschöpft),
     # wird NICHT weitergegeben (advance_phase folgt erst danach).
@@ -716,31 +763,12 @@ async def submit_ticket(
     if tt == TicketType.zugang_beantragen.value and completed_key == "backoffice":
         _assign_onboarding_personalnummer(ticket_id, user)
 
-    updated_workflow = advance_phase(ticket_id)
+    updated_workflow = advance_phase(ticket_id, workflow=workflow)
 
     phases = updated_workflow.get("phases", [])
     current_idx = updated_workflow.get("current_phase_index", 0)
     next_phase = phases[current_idx] if current_idx < len(phases) else None
 
-    # Nächste assignment-Phase ohne feste Zuständigkeit → gewählten Bearbeiter setzen.
-    from backend.services.workflow_state import set_phase_responsibility
-    if (next_phase is not None
-            and next_phase.get("type") == PhaseType.assignment.value
-            and not (next_phase.get("responsibility") or {}).get("kind")
-            and next_assignee_id):
-        if not validate_assignee(request.app.state.user_cache, next_assignee_id):
-            raise api_error(400, ErrorCode.INVALID_ASSIGNEE,
-                            f"Unbekannter Assignee '{next_assignee_id}'")
-        from backend.database.groups import get_groups
-        group_map = {g["id"]: g["name"] for g in get_groups()}
-        if next_assignee_id in group_map:
-            set_phase_responsibility(ticket_id, current_idx,
-                {"kind": "group", "id": next_assignee_id, "name": group_map[next_assignee_id]})
-        else:
-            set_phase_responsibility(ticket_id, current_idx,
-                {"kind": "user", "id": next_assignee_id, "name": next_assignee_name or next_assignee_id})
-        next_phase = database.get_ticket(ticket_id).workflow_state_parsed["phases"][current_idx]
-
     ticket = database.get_ticket(ticket_id)
 
     if next_phase and next_phase["type"] == PhaseType.department_review.value:
@@ -767,9 +795,10 @@ async def submit_ticket(
 
 
 @router.post("/tickets/{ticket_id}/reject", response_model=DataResponse[TicketOut])
-async def reject_ticket(
+def reject_ticket(
     ticket_id: int,
     request: Request,
+    body: dict = Depends(_json_body),
     user: dict = Depends(get_current_user),
 ):
     ticket = _get_ticket_or_404(ticket_id)
@@ -778,13 +807,11 @@ async def reject_ticket(
     if ticket.status in (RequestStatus.archived, RequestStatus.rejected):
         raise api_error(400, ErrorCode.INVALID_STATUS, "Ticket ist bereits abgeschlossen")
 
-    body = await request.json()
     message = (body.get("message") or "").strip()
     if not message:
         raise api_error(400, ErrorCode.INVALID_DESCRIPTION, "Ablehnungsgrund (message) ist erforderlich")
 
-    from zoneinfo import ZoneInfo
-    rejected_at = datetime.now(ZoneInfo("Europe/Berlin")).isoformat()
+    rejected_at = datetime.now(_BERLIN).isoformat()
     reject_workflow(ticket_id, message=message, rejected_by=user["displayName"], rejected_at=rejected_at)
 
     add_history_event(
@@ -797,7 +824,6 @@ async def reject_ticket(
 
     # Ersteller über die Ablehnung informieren (Mailfehler darf den Reject nicht kippen).
     try:
-        from backend.services.microsoft_mail import send_rejection_mail
         owner_mail = ticket.owner_info_parsed.get("mail") or get_cached_user_mail(request.app, ticket.owner_id)
         send_rejection_mail(ticket, message, owner_mail)
     except Exception:
@@ -807,9 +833,10 @@ async def reject_ticket(
 
 
 @router.post("/tickets/{ticket_id}/nachtrag", response_model=DataResponse[TicketOut])
-async def add_nachtrag(
+def add_nachtrag(
     ticket_id: int,
     request: Request,
+    body: dict = Depends(_json_body),
     user: dict = Depends(get_current_user),
 ):
     """
@@ -821,7 +848,6 @@ async def add_nachtrag(
     if "view" not in user.get("permissions", []):
         _assert_ticket_access(ticket, user)
 
-    body = await request.json()
     text = (body.get("text") or "").strip()
     if not text:
         raise api_error(400, ErrorCode.INVALID_DESCRIPTION, "Nachtrag-Text ist erforderlich")
@@ -836,9 +862,6 @@ async def add_nachtrag(
 
     # Beteiligte Fachabteilungen benachrichtigen (Mailfehler darf den Nachtrag nicht kippen).
     try:
-        from backend.services.workflow_state import involved_group_ids
-        from backend.database.groups import get_distributions_from_group
-        from backend.services.microsoft_mail import send_nachtrag_mail
         recipients: set[str] = set()
         for gid in involved_group_ids(ticket):
             for mail in get_distributions_from_group(gid):
@@ -854,11 +877,17 @@ async def add_nachtrag(
 
 @router.delete("/tickets/{ticket_id}", status_code=204)
 def delete_ticket(ticket_id: int, user: dict = Depends(get_current_user)):
-    ticket = _get_ticket_or_404(ticket_id)
-    ticket_id_val = ticket["id"] if isinstance(ticket, dict) else ticket.id
-    if not _user_can_delete_ticket(user, ticket_id_val):
-        raise api_error(403, ErrorCode.TICKET_FORBIDDEN, "Kein Zugriff")
-    database.delete_ticket(ticket_id)
+    """Admins oder Besitzer dürfen löschen. Der Besitz wird im DELETE selbst
+    geprüft; nur wenn nichts gelöscht wurde, klärt ein PK-Lookup 404 vs. 403."""
+    if user.get("is_admin", False):
+        deleted = database.delete_ticket(ticket_id)
+    else:
+        deleted = database.delete_ticket_if_owned(ticket_id, user["id"])
+    if deleted:
+        return
+    if not database.ticket_exists(ticket_id):
+        raise api_error(404, ErrorCode.TICKET_NOT_FOUND, "Ticket nicht gefunden")
+    raise api_error(403, ErrorCode.TICKET_FORBIDDEN, "Kein Zugriff")
 
 
 # ══════════════════════════════════════════════════════════════════════════════
@@ -872,7 +901,7 @@ def list_all_tickets(
     user: dict = Depends(get_current_user),
 ):
     _require_manage(user)
-    items = database.list_all_tickets(limit=limit, offset=offset)
+    items = database.list_all_tickets(limit=limit, offset=offset, fields=database.TICKET_LIST_FIELDS)
     total = database.count_all_tickets()
     return ListResponse(
         data=[TicketOut.from_ticket(t) for t in items],
@@ -887,16 +916,17 @@ def archive_ticket(
     user: dict = Depends(get_current_user),
 ):
     _require_manage(user)
-    ticket = _get_ticket_or_404(ticket_id)
-    request.app.state.manager.update_ticket(ticket_id=ticket.id, status=RequestStatus.archived)
+    old_status = database.archive_ticket(ticket_id)
+    if old_status is None:
+        raise api_error(404, ErrorCode.TICKET_NOT_FOUND, "Ticket nicht gefunden")
     add_history_event(
-        ticket.id,
+        ticket_id,
         actor_id=user["id"],
         actor_name=user["displayName"],
         action="status_changed",
         details={
             "field": "status",
-            "old_value": ticket.status.value,
+            "old_value": old_status,
             "new_value": RequestStatus.archived.value,
         },
     )
@@ -919,9 +949,6 @@ def override_responsibility(
     _require_admin(user)
     _get_ticket_or_404(ticket_id)   # 404, falls es das Ticket nicht gibt
 
-    from backend.services.workflow_state import (
-        get_workflow_state, set_phase_responsibility, PhaseType as WfPhaseType,
-    )
     wf = get_workflow_state(ticket_id)
     phases = wf.get("phases", [])
     if not phases:
@@ -934,19 +961,18 @@ def override_responsibility(
                         f"Phase-Index {idx} ungültig (erlaubt: 0..{len(phases) - 1})")
 
     phase = phases[idx]
-    if phase.get("type") != WfPhaseType.assignment.value:
+    if phase.get("type") != PhaseType.assignment.value:
         raise api_error(400, ErrorCode.INVALID_STATUS,
                         f"Phase '{phase.get('key')}' ist keine Bearbeitungsphase – "
                         "Zuständigkeit kann hier nicht gesetzt werden "
                         "(Durchführung wird über die Fachabteilungen gesteuert).")
 
     # Person oder Gruppe/Fachabteilung auflösen
-    from backend.database.groups import get_groups
     group_map = {g["id"]: g["name"] for g in get_groups()}
     if data.assignee_id in group_map:
         new_resp = {"kind": "group", "id": data.assignee_id, "name": group_map[data.assignee_id]}
     else:
-        if not validate_assignee(request.app.state.user_cache, data.assignee_id):
+        if not validate_assignee(request.app.state.user_index, data.assignee_id):
             raise api_error(400, ErrorCode.INVALID_ASSIGNEE,
                             f"Unbekannte Person/Gruppe '{data.assignee_id}'")
         new_resp = {"kind": "user", "id": data.assignee_id,
@@ -977,7 +1003,6 @@ def admin_force_unlock(ticket_id: int, user: dict = Depends(get_current_user)):
     dauerhaften Lockout, falls ein Editor den Tab nicht sauber geschlossen hat)."""
     _require_admin(user)
     _get_ticket_or_404(ticket_id)
-    from backend.database.ticket_locks import force_release_lock
     force_release_lock(ticket_id)
     add_history_event(
         ticket_id,
@@ -1023,15 +1048,12 @@ def admin_raw_update(
 
     if data.description is not None:
         try:
-            parsed_new = json.loads(data.description)
+            parsed_new = json_codec.loads(data.description)
         except Exception:
             raise api_error(400, ErrorCode.INVALID_DESCRIPTION, "description ist kein gültiges JSON")
-        try:
-            parsed_old = json.loads(ticket.description or "{}")
-        except Exception:
-            parsed_old = {}
+        parsed_old = ticket.description_parsed
         if parsed_new != parsed_old:
-            updates["description"] = json.dumps(parsed_new, ensure_ascii=False)
+            updates["description"] = json_codec.dumps(parsed_new)
             changes["description"] = {"old": parsed_old, "new": parsed_new}
 
     if data.title is not None and data.title != ticket.title:
@@ -1057,9 +1079,9 @@ def admin_raw_update(
     if not updates:
         raise api_error(400, ErrorCode.INVALID_STATUS, "Keine Änderungen übermittelt")
 
-    database.update_ticket(ticket_id, **updates)
-    add_history_event(
+    update_ticket_with_event(
         ticket_id,
+        updates,
         actor_id=user["id"],
         actor_name=user["displayName"],
         action="admin_raw_edited",
@@ -1130,9 +1152,9 @@ def admin_bulk_action(
                     failed.append({"id": tid, "error": "bereits archiviert"})
                     continue
                 old_status = ticket.status.value if hasattr(ticket.status, "value") else str(ticket.status)
-                database.update_ticket(tid, status=RequestStatus.archived.value)
-                add_history_event(
-                    tid, actor_id=user["id"], actor_name=user["displayName"],
+                update_ticket_with_event(
+                    tid, {"status": RequestStatus.archived.value},
+                    actor_id=user["id"], actor_name=user["displayName"],
                     action="ticket_archived_manual",
                     details={"field": "status", "old_value": old_status,
                              "new_value": RequestStatus.archived.value, "bulk": True},
@@ -1154,30 +1176,24 @@ def admin_bulk_action(
 
 @router.get("/tickets/{ticket_id}/departments")
 def get_my_departments(ticket_id: int, user: dict = Depends(get_current_user)):
-    from backend.services.workflow_state import get_departments_for_user
     return DataResponse(data=get_departments_for_user(ticket_id, user["id"]))
 
 
 @router.get("/tickets/{ticket_id}/departments/all")
 def get_all_departments(ticket_id: int, user: dict = Depends(get_current_user)):
     _require_manage(user)
-    from backend.services.workflow_state import get_all_department_statuses
     return DataResponse(data=get_all_department_statuses(ticket_id))
 
 
 @router.patch("/tickets/{ticket_id}/departments/{group_id}")
-async def set_department_status(
+def set_department_status(
     ticket_id: int,
     group_id: str,
     request: Request,
+    body: dict = Depends(_json_body),
     user: dict = Depends(get_current_user),
 ):
-    from backend.services.workflow_state import (
-        user_can_complete_department, set_department_status,
-    )
-    from backend.database.groups import get_group_name_from_id
 
-    body = await request.json()
     status = body.get("status")
 
     if not user_can_complete_department(ticket_id, user["id"], group_id):
@@ -1187,45 +1203,36 @@ async def set_department_status(
         raise api_error(400, ErrorCode.INVALID_STATUS,
                         "Erlaubte Werte: done, rejected, skipped")
 
-    set_department_status(ticket_id, group_id, status)
-    add_history_event(
-        ticket_id,
+    workflow = set_workflow_department_status(ticket_id, group_id, status)
+    events = [history_event(
         actor_id=user["id"],
         actor_name=user["displayName"],
         action="department_status_changed",
         details={
             "department_id": group_id,
-            "department_name": get_group_name_from_id(group_id),
+            "department_name": (department_entry(workflow, group_id).get("name")
+                                or get_group_name_from_id(group_id)),
             "new_value": status,
         },
-    )
+    )]
 
-    if all_required_departments_done(ticket_id):
-        updated_workflow = advance_phase(ticket_id)
+    next_phase = None
+    if all_required_departments_done(ticket_id, workflow=workflow):
+        updated_workflow = advance_phase(ticket_id, workflow=workflow)
         phases = updated_workflow.get("phases", [])
         current_idx = updated_workflow.get("current_phase_index", 0)
         next_phase = phases[current_idx] if current_idx < len(phases) else None
 
         if next_phase:
-            add_history_event(
-                ticket_id,
+            events.append(history_event(
                 actor_id=None,
                 actor_name="System",
                 actor_type="system",
                 action="phase_advanced",
                 details={"new_phase": next_phase["key"]},
-            )
-            # Zuständige der neu aktiven Phase benachrichtigen (z.B. Reisestelle
-            # nach der Durchführung) – analog zu create_ticket/submit_ticket.
-            # Status + Advance sind bereits persistiert, ein Mailfehler darf
-            # die Antwort nicht kippen.
-            try:
-                notify_phase_entry(request, database.get_ticket(ticket_id), next_phase)
-            except Exception:
-                logger.exception("Phasen-Benachrichtigung nach Fachabteilungs-Abschluss fehlgeschlagen (Ticket %s)", ticket_id)
+            ))
         else:
-            add_history_event(
-                ticket_id,
+            events.append(history_event(
                 actor_id=None,
                 actor_name="System",
                 actor_type="system",
@@ -1235,6 +1242,19 @@ async def set_department_status(
                     "old_value": RequestStatus.in_request.value,
                     "new_value": RequestStatus.archived.value,
                 },
-            )
+            ))
+
+    # Statuswechsel + evtl. Phasenwechsel in einem Schreibvorgang protokollieren.
+    add_history_events(ticket_id, events)
+
+    if next_phase:
+        # Zuständige der neu aktiven Phase benachrichtigen (z.B. Reisestelle
+        # nach der Durchführung) – analog zu create_ticket/submit_ticket.
+        # Status + Advance sind bereits persistiert, ein Mailfehler darf
+        # die Antwort nicht kippen.
+        try:
+            notify_phase_entry(request, database.get_ticket(ticket_id), next_phase)
+        except Exception:
+            logger.exception("Phasen-Benachrichtigung nach Fachabteilungs-Abschluss fehlgeschlagen (Ticket %s)", ticket_id)
 
     return {"ok": True}
\ No newline at end of file
@@ -1,4 +1,4 @@
-from fastapi import APIRouter, Request, Depends
+from fastapi import APIRouter, Request, Depends, Response
 from pydantic import BaseModel
 from backend.core.dependencies import get_current_user
 from backend.schemas.responses import DataResponse
@@ -16,10 +16,16 @@ class UserListResponse(BaseModel):
     users: list[UserEntry]
 
 
-@router.get("/users", response_model=DataResponse[UserListResponse])
-def list_users(request: Request, user: dict = Depends(get_current_user)):
-    """Gibt alle gecachten AD-User zurück – für Dropdowns im Frontend."""
-    user_cache = getattr(request.app.state, "user_cache", [])
+# Serialisierte Antwort je User-Snapshot: app.state.user_cache wird beim Sync als
+# neues Tuple ersetzt – solange dasselbe Objekt vorliegt, gilt das gecachte JSON.
+_users_payload: tuple[object, bytes] | None = None
+
+
+def _user_list_payload(user_cache) -> bytes:
+    global _users_payload
+    hit = _users_payload
+    if hit is not None and hit[0] is user_cache:
+        return hit[1]
     users = [
         UserEntry(
             id=u.get("id", ""),
@@ -29,4 +35,14 @@ def list_users(request: Request, user: dict = Depends(get_current_user)):
         for u in user_cache
         if u.get("id") and u.get("displayName")
     ]
-    return DataResponse(data=UserListResponse(users=users))
\ No newline at end of file
+    body = DataResponse[UserListResponse](data=UserListResponse(users=users)).model_dump_json().encode()
+    _users_payload = (user_cache, body)
+    return body
+
+
+@router.get("/users", response_model=DataResponse[UserListResponse])
+def list_users(request: Request, user: dict = Depends(get_current_user)):
+    """Gibt alle gecachten AD-User zurück – für Dropdowns im Frontend.
+    Pro User-Sync einmal serialisiert; komprimiert wird global (GZipMiddleware)."""
+    user_cache = getattr(request.app.state, "user_cache", ())
+    return Response(content=_user_list_payload(user_cache), media_type="application/json")
@@ -1,10 +1,15 @@
 import asyncio
+import random
 import time
 from contextlib import asynccontextmanager
 from backend.utils.config import config
-from backend.services.microsoft_graph import list_all_users_with_e3_license, list_all_groups
+from backend.core.session import TOKENS
+from backend.services.microsoft_graph import (
+    list_all_users_with_e3_license, list_all_groups, close_graph_client,
+)
 from backend.services.microsoft_auth import acquire_app_token
 from backend.utils.logger import logger
+from backend.database.connection import dispose_pool
 from backend.database.ticket_group_permissions import ensure_table as ensure_group_perms_table
 from backend.database.ticket_locks import ensure_table as ensure_ticket_locks_table
 from backend.database.sessions import (
@@ -14,16 +19,43 @@ from backend.database.sessions import (
 
 EXCLUDED_USERS = {"Administrator AlphaConsult", "CodeTwo Admin"}
 
+# Erster erneuter Versuch nach einem fehlgeschlagenen Sync (Sekunden).
+SYNC_RETRY_BASE = 30
+
+
+def next_sync_delay(interval: float, failures: int) -> float:
+    """Wartezeit bis zum nächsten Hintergrund-Sync: regulär das Intervall, nach
+    Fehlschlägen früher erneut versuchen (30 s, 60 s, 120 s … höchstens das
+    Intervall). ±10 % Jitter, damit mehrere Instanzen Graph nicht im Gleichtakt
+    abfragen."""
+    base = interval if failures <= 0 else min(interval, SYNC_RETRY_BASE * 2 ** (failures - 1))
+    return base * random.uniform(0.9, 1.1)
+
+
 async def sync_users_into_cache(app):
     logger.info("🔄 Syncing AD user list…")
 
-    token = acquire_app_token()
+    # MSAL ist synchron (HTTP beim Token-Refresh) → nicht auf dem Event-Loop.
+    token = await asyncio.to_thread(acquire_app_token)
     access = token["access_token"]
 
     users = await list_all_users_with_e3_license(access)
 
-    users = [u for u in users if u.get("displayName") not in EXCLUDED_USERS]
-
+    # Liste + Index id → User (O(1)-Prüfungen für Mitglieder, Zuständige) in
+    # einem Durchlauf. Die Liste ist ein Tuple: Requests teilen sich denselben
+    # unveränderlichen Snapshot, ein Sync ersetzt ihn nur als Ganzes.
+    kept: list = []
+    index: dict = {}
+    for u in users:
+        if u.get("displayName") in EXCLUDED_USERS:
+            continue
+        kept.append(u)
+        if u.get("id"):
+            index[u["id"]] = u
+    users = tuple(kept)
+
+    # Index vor der Liste setzen, damit die Liste nie ohne passenden Index sichtbar ist.
+    app.state.user_index = index
     app.state.user_cache = users
     app.state.user_cache_timestamp = time.time()
 
@@ -33,7 +65,7 @@ async def sync_users_into_cache(app):
 async def sync_groups_into_cache(app):
     logger.info("🔄 Syncing AD group list…")
 
-    token = acquire_app_token()
+    token = await asyncio.to_thread(acquire_app_token)
     access = token["access_token"]
 
     groups = await list_all_groups(access)
@@ -51,7 +83,8 @@ async def lifespan(app):
     from backend.utils.logger import install_access_log_redaction
     install_access_log_redaction()
 
-    app.state.user_cache = []
+    app.state.user_cache = ()
+    app.state.user_index = {}
     app.state.user_cache_timestamp = 0
     app.state.group_cache = []
     app.state.group_cache_timestamp = 0
@@ -70,22 +103,33 @@ async def lifespan(app):
     interval = int(config.USER_SYNC_INTERVAL) * 60
 
     async def user_sync_background():
+        # Erst warten: Der Start hat die Caches gerade geladen (sonst Doppel-Sync).
+        failures = 0
         while True:
+            await asyncio.sleep(next_sync_delay(interval, failures))
+            ok = True
             try:
                 await sync_users_into_cache(app)
             except Exception:
+                ok = False
                 logger.exception("User cache sync failed")
             try:
                 await sync_groups_into_cache(app)
             except Exception:
+                ok = False
                 logger.exception("Group cache sync failed")
+            failures = 0 if ok else failures + 1
             # Abgelaufene Session-Rows aufräumen (Präsenz-Fenster = SESSION_TIMEOUT).
             try:
-                prune_stale(int(config.SESSION_TIMEOUT))
+                await asyncio.to_thread(prune_stale, int(config.SESSION_TIMEOUT))
             except Exception:
                 logger.exception("Session prune failed")
-            await asyncio.sleep(interval)
+            TOKENS.purge_expired()
 
     asyncio.create_task(user_sync_background())
 
-    yield
\ No newline at end of file
+    yield
+
+    # Geteilten Graph-HTTP-Client (Keep-Alive-Verbindungen) sauber schließen.
+    await close_graph_client()
+    dispose_pool()
@@ -1,10 +1,11 @@
 from typing import Dict
+import logging
 import time
 from fastapi import Request, HTTPException, status
 from backend.utils.config import config
 from backend.utils.logger import logger
-from backend.core.session import TOKENS, SERVER_BOOT_ID
-from backend.database.users import get_user_permissions
+from backend.core.session import TOKENS, SERVER_BOOT_ID, get_user_from_session
+from backend.database.users import PERM_ADMIN, get_user_permissions
 from backend.database import sessions as session_store
 
 SAFE_UPDATE_INTERVAL = 60  # seconds
@@ -36,9 +37,32 @@ def _check_session_store(request, session: dict) -> None:
         logger.exception("Session-Store-Check fehlgeschlagen (sid=%s) – fail-open", sid)
 
 
+def _mark_activity(session: dict, now: int) -> None:
+    """last_activity im Cookie setzen und den serverseitigen Eintrag (User +
+    Tokens) mitverlängern, damit er nicht vor der Session abläuft."""
+    session["last_activity"] = now
+    sid = session.get("sid")
+    if sid:
+        TOKENS.touch(sid)
+
+
+def _attach_permissions(user: dict) -> None:
+    """Permissions immer frisch aus der DB – nie aus der Session. is_admin wird
+    dabei einmal abgeleitet; Admin-Checks lesen danach nur noch das Flag."""
+    perms = get_user_permissions(user["id"])
+    user["permissions"] = perms
+    user["is_admin"] = PERM_ADMIN in perms
+
+
 def get_current_user(request: Request) -> Dict:
+    # Pro Request nur einmal auflösen (Session-Store + Permissions = 2 DB-Zugriffe);
+    # Middleware und Hilfsfunktionen lesen danach request.state.user.
+    cached = getattr(request.state, "user", None)
+    if cached is not None:
+        return cached
+
     session = request.session
-    user = session.get("user")
+    user = get_user_from_session(session)
     now = int(time.time())
     last_activity_raw = session.get("last_activity")
 
@@ -53,17 +77,18 @@ def get_current_user(request: Request) -> Dict:
     # Serverseitige Session prüfen (Force-Logout) + Präsenz auffrischen (fail-open).
     _check_session_store(request, session)
 
-    try:
-        cookie_len = sum((len(k) + len(v)) for k, v in request.cookies.items())
-    except Exception:
-        cookie_len = -1
-
     # DEBUG statt INFO: sid ist der Schlüssel zum serverseitigen Token-Store und
     # soll nicht bei jedem Request in die regulären Logs geschrieben werden.
-    logger.debug(
-        "session_keys=%s sid=%s last=%s now=%s cookie_len=%s",
-        list(session.keys()), session.get("sid"), last_activity_raw, now, cookie_len,
-    )
+    # Argumente nur aufbereiten, wenn DEBUG aktiv ist (sonst pro Request umsonst).
+    if logger.isEnabledFor(logging.DEBUG):
+        try:
+            cookie_len = sum((len(k) + len(v)) for k, v in request.cookies.items())
+        except Exception:
+            cookie_len = -1
+        logger.debug(
+            "session_keys=%s sid=%s last=%s now=%s cookie_len=%s",
+            list(session.keys()), session.get("sid"), last_activity_raw, now, cookie_len,
+        )
 
     try:
         last_activity = int(last_activity_raw) if last_activity_raw is not None else 0
@@ -71,8 +96,9 @@ def get_current_user(request: Request) -> Dict:
         last_activity = 0
 
     if last_activity == 0:
-        session["last_activity"] = now
-        user["permissions"] = get_user_permissions(user["id"])
+        _mark_activity(session, now)
+        _attach_permissions(user)
+        request.state.user = user
         return user
 
     if now - last_activity > int(config.SESSION_TIMEOUT):
@@ -87,10 +113,10 @@ def get_current_user(request: Request) -> Dict:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED)
 
     if now - last_activity >= SAFE_UPDATE_INTERVAL:
-        session["last_activity"] = now
+        _mark_activity(session, now)
 
-    # Permissions immer frisch aus der DB – nie aus der Session
-    user["permissions"] = get_user_permissions(user["id"])
+    _attach_permissions(user)
+    request.state.user = user
     return user
 
 
@@ -102,7 +128,7 @@ def check_session_only(request: Request) -> Dict:
     nicht künstlich am Leben hält.
     """
     session = request.session
-    user = session.get("user")
+    user = get_user_from_session(session)
     now = int(time.time())
 
     if not user:
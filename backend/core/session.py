@@ -1,29 +1,93 @@
-import json
 import time
+import threading
 import uuid
+from collections import OrderedDict
 from typing import Dict, Any, Optional
 from fastapi import Request
 from starlette.middleware.sessions import SessionMiddleware
 from backend.utils.config import config
 
 
+# Lebensdauer eines Eintrags im Token-Store ohne Aktivität: knapp unter der
+# Access-Token-Laufzeit, mindestens aber der Session-Timeout (+ Schreib-Drossel
+# von last_activity), da der Eintrag auch den User der Session trägt.
+TOKEN_TTL_SECONDS = max(3500, int(config.SESSION_TIMEOUT) + 60)
+# Obergrenze der Einträge – schützt vor unbegrenztem Wachstum (z.B. Login-Scans).
+TOKEN_STORE_MAX_ENTRIES = 100_000
+
+
 class TokenStore:
-    """Server-side token storage, was in server.py stand."""
-    def __init__(self) -> None:
-        self._db: Dict[str, Dict[str, Any]] = {}
+    """Server-side token storage, was in server.py stand. Hält je sid die
+    OAuth-Tokens und den User-Payload der Session (das Cookie trägt nur noch
+    sid, boot_id und last_activity).
+
+    Einträge laufen TOKEN_TTL_SECONDS nach dem letzten put/set_user/touch ab:
+    get() liefert sie dann nicht mehr, purge_expired() (periodisch aus dem
+    Lifespan) entfernt sie endgültig. Jede Auffrischung hängt den Eintrag ans
+    Ende – die Reihenfolge ist damit die Ablaufreihenfolge: Aufräumen stoppt am
+    ersten gültigen Eintrag, und bei voller Kapazität fliegt der älteste raus."""
+    def __init__(self, max_entries: int = TOKEN_STORE_MAX_ENTRIES) -> None:
+        self._db: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._max_entries = max_entries
+        self._lock = threading.Lock()
+
+    def _store(self, sid: str, rec: Dict[str, Any]) -> None:
+        """Eintrag (neu) ans Ende setzen; nur unter self._lock aufrufen."""
+        rec["expires_at"] = time.time() + TOKEN_TTL_SECONDS
+        self._db.pop(sid, None)
+        self._db[sid] = rec
+        while len(self._db) > self._max_entries:
+            self._db.popitem(last=False)
 
     def put(self, sid: str, tokens: Dict[str, Any]) -> None:
-        self._db[sid] = {
-            "access_token": tokens.get("access_token"),
-            "refresh_token": tokens.get("refresh_token"),
-            "expires_at": time.time() + 3500,
-        }
+        with self._lock:
+            prev = self._db.get(sid)
+            self._store(sid, {
+                "access_token": tokens.get("access_token"),
+                "refresh_token": tokens.get("refresh_token"),
+                "user": prev.get("user") if prev else None,
+            })
+
+    def set_user(self, sid: str, user: dict) -> None:
+        with self._lock:
+            rec = self._db.get(sid) or {"access_token": None, "refresh_token": None}
+            rec["user"] = user
+            self._store(sid, rec)
+
+    def touch(self, sid: str) -> None:
+        """Ablauf bei Aktivität nach hinten schieben (sliding expiry)."""
+        with self._lock:
+            rec = self._db.get(sid)
+            if rec is not None:
+                self._store(sid, rec)
 
     def get(self, sid: str) -> Optional[Dict[str, Any]]:
-        return self._db.get(sid)
+        rec = self._db.get(sid)
+        if rec is not None and rec["expires_at"] <= time.time():
+            self.delete(sid)
+            return None
+        return rec
 
     def delete(self, sid: str) -> None:
-        self._db.pop(sid, None)
+        with self._lock:
+            self._db.pop(sid, None)
+
+    def purge_expired(self) -> int:
+        """Abgelaufene Einträge entfernen; liefert deren Anzahl."""
+        now = time.time()
+        removed = 0
+        with self._lock:
+            while self._db:
+                sid, rec = next(iter(self._db.items()))
+                if rec["expires_at"] > now:
+                    break
+                del self._db[sid]
+                removed += 1
+        return removed
+
+    def approx_size(self) -> int:
+        """Anzahl Einträge (inkl. noch nicht aufgeräumter abgelaufener) – fürs Monitoring."""
+        return len(self._db)
 
 
 TOKENS = TokenStore()
@@ -57,12 +121,20 @@ def rotate_sid(session: dict) -> str:
     return new
 
 
-def approx_cookie_size_bytes(session: dict) -> int:
-    try:
-        raw = json.dumps(session, separators=(",", ":"))
-        return len(raw.encode("utf-8"))
-    except Exception:
-        return -1
+def get_user_from_session(session: dict) -> Optional[dict]:
+    """User der Session aus dem serverseitigen Store (Schlüssel: sid im Cookie).
+    Liefert eine flache Kopie – Aufrufer setzen z.B. permissions pro Request."""
+    sid = session.get("sid")
+    rec = TOKENS.get(sid) if sid else None
+    user = rec.get("user") if rec else None
+    return dict(user) if user else None
+
+
+def store_user_in_session(session: dict, user: dict) -> None:
+    """User serverseitig zur sid der Session ablegen. Das signierte Cookie bleibt
+    klein (kein User-Payload, keine AD-Gruppen) – Starlette serialisiert und
+    signiert es bei jeder Antwort neu."""
+    TOKENS.set_user(ensure_sid(session), user)
 
 
 def get_access_token_from_store(request: Request) -> Optional[str]:
@@ -7,10 +7,10 @@ Rollen-/Rechte-Änderungen).
 Tabelle: audit_log (nie löschen, nur einfügen/lesen).
 """
 
-import json
 from typing import Optional
 
 from backend.database.connection import get_connection, _exec, _fetchall, _fetchone
+from backend.utils import json_codec
 from backend.utils.logger import logger
 
 
@@ -45,6 +45,35 @@ def ensure_table() -> None:
         conn.close()
 
 
+_AUDIT_INSERT = (
+    "INSERT INTO audit_log "
+    "(created_at, actor_id, actor_name, actor_type, action, entity_type, "
+    " entity_id, summary, details, ip) VALUES "
+)
+_AUDIT_ROW = "(NOW(), %s, %s, %s, %s, %s, %s, %s, %s, %s)"
+
+
+def _audit_params(
+    *,
+    action: str,
+    actor_id: Optional[str] = None,
+    actor_name: str = "System",
+    actor_type: str = "user",
+    entity_type: Optional[str] = None,
+    entity_id: Optional[str] = None,
+    summary: Optional[str] = None,
+    details: Optional[dict] = None,
+    ip: Optional[str] = None,
+) -> tuple:
+    return (
+        actor_id, actor_name, actor_type, action, entity_type,
+        (str(entity_id) if entity_id is not None else None),
+        (summary or "")[:512] or None,
+        (json_codec.dumps(details) if details is not None else None),
+        ip,
+    )
+
+
 def record_audit(
     *,
     action: str,
@@ -59,36 +88,43 @@ def record_audit(
 ) -> None:
     """Schreibt einen Audit-Eintrag. Fehler brechen NIE den Aufrufer (der Audit
     darf keine Fachlogik verhindern) – sie werden nur geloggt."""
+    record_audits([dict(
+        action=action, actor_id=actor_id, actor_name=actor_name, actor_type=actor_type,
+        entity_type=entity_type, entity_id=entity_id, summary=summary,
+        details=details, ip=ip,
+    )])
+
+
+def record_audits(entries: list[dict]) -> None:
+    """Mehrere Audit-Einträge (Keyword-Argumente wie record_audit) in EINEM
+    mehrzeiligen INSERT. Fehler werden wie bei record_audit nur geloggt."""
+    if not entries:
+        return
     try:
+        # Auch das Serialisieren der details liegt im try – kein Fehler erreicht den Aufrufer.
+        params: list = []
+        for entry in entries:
+            params.extend(_audit_params(**entry))
         conn = get_connection()
         try:
-            _exec(
-                conn,
-                "INSERT INTO audit_log "
-                "(created_at, actor_id, actor_name, actor_type, action, entity_type, "
-                " entity_id, summary, details, ip) "
-                "VALUES (NOW(), %s, %s, %s, %s, %s, %s, %s, %s, %s)",
-                (
-                    actor_id, actor_name, actor_type, action, entity_type,
-                    (str(entity_id) if entity_id is not None else None),
-                    (summary or "")[:512] or None,
-                    (json.dumps(details, ensure_ascii=False) if details is not None else None),
-                    ip,
-                ),
-            )
+            _exec(conn, _AUDIT_INSERT + ", ".join([_AUDIT_ROW] * len(entries)), tuple(params))
             conn.commit()
         finally:
             conn.close()
     except Exception:
         logger.exception(
-            "Audit-Eintrag fehlgeschlagen (action=%s entity=%s/%s)", action, entity_type, entity_id
+            "Audit-Eintrag fehlgeschlagen (%s)",
+            ", ".join(f"action={e.get('action')} entity={e.get('entity_type')}/{e.get('entity_id')}"
+                      for e in entries),
         )
         return
 
-    logger.info(
-        "AUDIT action=%s actor=%s(%s) entity=%s/%s",
-        action, actor_name or "?", actor_id or "-", entity_type or "-", entity_id or "-",
-    )
+    for entry in entries:
+        logger.info(
+            "AUDIT action=%s actor=%s(%s) entity=%s/%s",
+            entry.get("action"), entry.get("actor_name", "System") or "?", entry.get("actor_id") or "-",
+            entry.get("entity_type") or "-", entry.get("entity_id") or "-",
+        )
 
 
 def list_audit(
@@ -145,7 +181,7 @@ def list_audit(
         d = dict(r)
         raw = d.get("details")
         try:
-            d["details"] = json.loads(raw) if raw else {}
+            d["details"] = json_codec.loads(raw) if raw else {}
         except Exception:
             d["details"] = {}
         ca = d.get("created_at")
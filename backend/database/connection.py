@@ -1,17 +1,34 @@
 """
 Shared DB connection helpers.
 Importiert von database.py UND users.py – kein circular import.
+
+Verbindungen kommen aus einem Pool (SQLAlchemy QueuePool über pymysql):
+`conn.close()` gibt die Verbindung zurück (offene Transaktion wird zurückgerollt),
+statt jedes Mal TCP-Verbindung + Login neu aufzubauen.
 """
 import os
-from typing import Any, Tuple
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Iterator, Tuple
 import pymysql
 from pymysql.cursors import DictCursor
+from sqlalchemy import event, exc
 from sqlalchemy.engine import make_url
+from sqlalchemy.pool import QueuePool
 
+POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "10"))
+POOL_MAX_OVERFLOW = int(os.getenv("DB_POOL_MAX_OVERFLOW", "20"))
+POOL_TIMEOUT = 30      # Sekunden warten, wenn alle Verbindungen vergeben sind
+POOL_RECYCLE = 1800    # deutlich unter MariaDBs wait_timeout
+PING_IDLE_SECONDS = 10  # kürzer ungenutzte Verbindungen ohne Ping ausgeben
 
-def get_connection():
-    dsn = os.getenv("MARIADB_DSN")
-    url = make_url(dsn)
+_pool: QueuePool | None = None
+_pool_lock = threading.Lock()
+
+
+def _connect():
+    url = make_url(os.getenv("MARIADB_DSN"))
     return pymysql.connect(
         host=url.host,
         port=url.port or 3306,
@@ -24,6 +41,74 @@ def get_connection():
     )
 
 
+def _ping_on_checkout(dbapi_conn, record, _proxy):
+    """Tote Verbindungen (Server-Neustart, Timeout) vor der Ausgabe aussortieren –
+    der Pool verwirft sie bei DisconnectionError und verbindet neu. Gerade erst
+    zurückgegebene Verbindungen werden nicht gepingt (spart pro Request einen
+    Roundtrip); nur wer länger als PING_IDLE_SECONDS lag, wird geprüft."""
+    last_used = record.info.get("last_checkin")
+    if last_used is not None and time.monotonic() - last_used < PING_IDLE_SECONDS:
+        return
+    try:
+        dbapi_conn.ping(reconnect=False)
+    except Exception:
+        raise exc.DisconnectionError()
+
+
+def _mark_checkin(_dbapi_conn, record):
+    record.info["last_checkin"] = time.monotonic()
+
+
+def _get_pool() -> QueuePool:
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                pool = QueuePool(
+                    _connect,
+                    pool_size=POOL_SIZE,
+                    max_overflow=POOL_MAX_OVERFLOW,
+                    timeout=POOL_TIMEOUT,
+                    recycle=POOL_RECYCLE,
+                )
+                event.listen(pool, "checkout", _ping_on_checkout)
+                event.listen(pool, "checkin", _mark_checkin)
+                _pool = pool
+    return _pool
+
+
+def get_connection():
+    return _get_pool().connect()
+
+
+@contextmanager
+def transaction(conn=None) -> Iterator[Any]:
+    """Mehrere Schreibzugriffe in EINER Transaktion: eine Pool-Verbindung, ein
+    Commit am Ende (bei Fehler Rollback). Wird `conn` übergeben, läuft der Block
+    in dieser bereits offenen Transaktion – Commit macht dann deren Besitzer."""
+    if conn is not None:
+        yield conn
+        return
+    conn = get_connection()
+    try:
+        yield conn
+        conn.commit()
+    except BaseException:
+        conn.rollback()
+        raise
+    finally:
+        conn.close()
+
+
+def dispose_pool() -> None:
+    """Alle Pool-Verbindungen schließen (Shutdown)."""
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.dispose()
+            _pool = None
+
+
 def _exec(conn, sql: str, params: Tuple[Any, ...] = ()):
     cur = conn.cursor()
     cur.execute(sql, params)
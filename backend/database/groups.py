@@ -1,12 +1,22 @@
 import uuid
-from typing import List, Optional
+from typing import Dict, List, Optional, Tuple
 
 from backend.database.settings import settings_get, settings_set
 
 
-# ── CRUD ──────────────────────────────────────────────────────────────────────
+# ── Cache ─────────────────────────────────────────────────────────────────────
 
-def get_groups() -> List[dict]:
+# Prozess-Cache der Gruppenliste (Settings-Key TICKET_GROUPS). get_groups() wird
+# pro Ticket-Request mehrfach gebraucht, geändert wird nur über save_groups – dort
+# wird der Cache verworfen und die Version hochgezählt (für abgeleitete Caches).
+# Liste + beide Indizes liegen in EINEM Tupel, damit Leser nie eine halb
+# ersetzte Kombination sehen.
+_GroupsSnapshot = Tuple[List[dict], Dict[str, dict], Dict[str, dict]]
+_groups_snapshot: Optional[_GroupsSnapshot] = None
+_groups_version: int = 0
+
+
+def _load_groups() -> List[dict]:
     groups = settings_get("TICKET_GROUPS", default=[])
     if not isinstance(groups, list):
         return []
@@ -23,10 +33,74 @@ def get_groups() -> List[dict]:
     return groups
 
 
+def _groups_index() -> _GroupsSnapshot:
+    """(Liste, id → Gruppe, name.lower() → Gruppe) – nur lesend verwenden."""
+    global _groups_snapshot
+    snapshot = _groups_snapshot
+    if snapshot is not None:
+        return snapshot
+    version = _groups_version
+    groups = _load_groups()
+    # Namen sind case-insensitiv eindeutig; bei Altdaten-Dubletten gewinnt die erste.
+    by_lname: Dict[str, dict] = {}
+    for g in groups:
+        by_lname.setdefault((g.get("name") or "").strip().lower(), g)
+    snapshot = (groups, {g.get("id"): g for g in groups}, by_lname)
+    # Lief währenddessen ein save_groups, ist das Gelesene evtl. veraltet –
+    # dann nur für diesen Aufruf verwenden, nicht veröffentlichen.
+    if version == _groups_version:
+        _groups_snapshot = snapshot
+    return snapshot
+
+
+def _cached_groups() -> List[dict]:
+    """Gecachte Gruppenliste – nur lesend verwenden (geteilte Objekte)."""
+    return _groups_index()[0]
+
+
+def _cached_group(group_id: str) -> Optional[dict]:
+    return _groups_index()[1].get(group_id)
+
+
+def _copy_group(g: dict) -> dict:
+    # Veränderlich sind nur die Listen – der Rest sind Strings/Bools.
+    copy = dict(g)
+    for key in ("members", "distributions"):
+        if isinstance(copy.get(key), list):
+            copy[key] = list(copy[key])
+    return copy
+
+
+def groups_version() -> int:
+    """Wird bei jedem save_groups erhöht."""
+    return _groups_version
+
+
+def invalidate_groups_cache() -> None:
+    global _groups_snapshot, _groups_version
+    _groups_version += 1
+    _groups_snapshot = None
+
+
+# ── CRUD ──────────────────────────────────────────────────────────────────────
+
+def get_groups() -> List[dict]:
+    # Aufrufer verändern die Liste und speichern sie zurück → Kopie herausgeben.
+    return [_copy_group(g) for g in _cached_groups()]
+
+
 def save_groups(groups: List[dict]) -> None:
     if not isinstance(groups, list):
         raise ValueError("Groups must be list")
-    settings_set("TICKET_GROUPS", groups)
+    try:
+        settings_set("TICKET_GROUPS", groups)
+    finally:
+        invalidate_groups_cache()
+
+
+def groups_by_id(groups: List[dict]) -> Dict[str, dict]:
+    """Index id → Gruppe über eine (veränderliche) Liste aus get_groups()."""
+    return {g.get("id"): g for g in groups}
 
 
 def ensure_required_groups(required_names: List[str], hidden_names: Optional[List[str]] = None) -> List[str]:
@@ -65,17 +139,31 @@ def ensure_required_groups(required_names: List[str], hidden_names: Optional[Lis
 def get_users_from_group(group_id: str) -> List[str]:
     if not group_id:
         return []
-    for g in get_groups():
-        if g.get("id") == group_id:
-            members = g.get("members", [])
-            return members if isinstance(members, list) else []
-    return []
+    g = _cached_group(group_id)
+    if g is None:
+        return []
+    members = g.get("members", [])
+    return list(members) if isinstance(members, list) else []
+
+
+def find_group_by_name(group_name: str) -> Optional[dict]:
+    """Gruppe zum Namen, ohne Groß-/Kleinschreibung (Kopie)."""
+    if not group_name:
+        return None
+    g = _groups_index()[2].get(group_name.strip().lower())
+    return _copy_group(g) if g is not None else None
+
+
+def group_name_exists(group_name: str) -> bool:
+    if not group_name:
+        return False
+    return group_name.strip().lower() in _groups_index()[2]
 
 
 def get_groupID_from_name(group_name: str) -> Optional[str]:
     if not group_name:
         return None
-    for g in get_groups():
+    for g in _cached_groups():
         if g.get("name") == group_name:
             return g.get("id")
     return None
@@ -86,16 +174,18 @@ def get_group_ids_for_user(user_id: str) -> List[str]:
         return []
     return [
         g.get("id")
-        for g in get_groups()
+        for g in _cached_groups()
         if isinstance(g.get("members"), list) and user_id in g["members"]
     ]
 
 
+def group_exists(group_id: str) -> bool:
+    return bool(group_id) and _cached_group(group_id) is not None
+
+
 def get_group_name_from_id(group_id: str) -> Optional[str]:
-    for g in get_groups():
-        if g.get("id") == group_id:
-            return g.get("name")
-    return None
+    g = _cached_group(group_id)
+    return g.get("name") if g is not None else None
 
 
 # ── Distributions ─────────────────────────────────────────────────────────────
@@ -103,15 +193,15 @@ def get_group_name_from_id(group_id: str) -> Optional[str]:
 def get_distributions_from_group(group_id: str) -> List[str]:
     if not group_id:
         return []
-    for g in get_groups():
-        if g.get("id") == group_id:
-            distributions = g.get("distributions", [])
-            return distributions if isinstance(distributions, list) else []
-    return []
+    g = _cached_group(group_id)
+    if g is None:
+        return []
+    distributions = g.get("distributions", [])
+    return list(distributions) if isinstance(distributions, list) else []
 
 
 def get_distributions_from_group_name(group_name: str) -> List[str]:
     group_id = get_groupID_from_name(group_name)
     if not group_id:
         return []
-    return get_distributions_from_group(group_id)
\ No newline at end of file
+    return get_distributions_from_group(group_id)
@@ -1,7 +1,6 @@
-import json
-
 from backend.database.connection import get_connection, _fetchone, _exec
-from backend.database.settings import normalize_company, pnr_format
+from backend.utils import json_codec
+from backend.database.settings import invalidate_settings_cache, normalize_company, pnr_format
 
 COMPANIES_KEY = "COMPANIES"
 
@@ -92,7 +91,7 @@ def db_assign_personalnummer_for_company(company_name: str, warn_remaining: int)
             (COMPANIES_KEY,),
         )
         try:
-            raw = json.loads(row["value"]) if row and row["value"] else []
+            raw = json_codec.loads(row["value"]) if row and row["value"] else []
         except Exception:
             raw = []
         if not isinstance(raw, list):
@@ -105,9 +104,10 @@ def db_assign_personalnummer_for_company(company_name: str, warn_remaining: int)
             conn,
             "INSERT INTO settings(`key`,`value`) VALUES(%s,%s) "
             "ON DUPLICATE KEY UPDATE `value`=VALUES(`value`)",
-            (COMPANIES_KEY, json.dumps(companies, ensure_ascii=False)),
+            (COMPANIES_KEY, json_codec.dumps(companies)),
         )
         conn.commit()
+        invalidate_settings_cache(COMPANIES_KEY)
         return result
     except Exception:
         conn.rollback()
@@ -1,7 +1,8 @@
-import json
-from typing import Any, Dict, List, Optional
+import time
+from typing import Any, Dict, List, Optional, Tuple
 
-from backend.database.connection import get_connection, _exec, _fetchall, _fetchone
+from backend.database.connection import get_connection, transaction, _exec, _fetchall, _fetchone
+from backend.utils import json_codec
 
 
 DDL_SETTINGS = """
@@ -16,37 +17,79 @@ def _parse_json(raw: Optional[str], fallback):
     if not raw:
         return fallback
     try:
-        return json.loads(raw)
+        return json_codec.loads(raw)
     except Exception:
         return fallback
 
 
-# ── Core ──────────────────────────────────────────────────────────────────────
-
-def settings_get(key: str, default=None) -> Any:
+# ── Cache ─────────────────────────────────────────────────────────────────────
+
+# Prozess-Cache der ROHEN Settings-Werte: key → (Ladezeitpunkt, JSON-String bzw.
+# None, wenn der Key fehlt). Firmen, Gruppen, Overview-Mitglieder … werden auf fast
+# jedem Request gelesen, aber selten geschrieben. Gecacht wird der String und pro
+# Zugriff neu geparst (orjson), damit Aufrufer das Ergebnis gefahrlos verändern
+# können. Die TTL begrenzt, wie lange Änderungen anderer Worker unsichtbar bleiben.
+SETTINGS_CACHE_TTL = 30.0
+_settings_cache: Dict[str, Tuple[float, Optional[str]]] = {}
+# Wird bei jeder Invalidierung hochgezählt: ein Lesezugriff, der VOR der
+# Invalidierung gestartet ist, darf seinen (evtl. alten) Wert nicht mehr ablegen.
+_settings_generation = 0
+
+_SETTINGS_UPSERT = (
+    "INSERT INTO settings(`key`,`value`) VALUES(%s,%s) "
+    "ON DUPLICATE KEY UPDATE `value`=VALUES(`value`)"
+)
+
+
+def invalidate_settings_cache(key: Optional[str] = None) -> None:
+    """Einen Key (oder alles) verwerfen – für Schreibzugriffe an settings_set vorbei."""
+    global _settings_generation
+    _settings_generation += 1
+    if key is None:
+        _settings_cache.clear()
+    else:
+        _settings_cache.pop(key, None)
+
+
+def _settings_raw(key: str) -> Optional[str]:
+    hit = _settings_cache.get(key)
+    if hit is not None and time.monotonic() - hit[0] < SETTINGS_CACHE_TTL:
+        return hit[1]
+    generation = _settings_generation
     conn = get_connection()
     try:
         row = _fetchone(conn, "SELECT value FROM settings WHERE `key`=%s", (key,))
-        if not row:
-            return default
-        return _parse_json(row["value"], row["value"])
     finally:
         conn.close()
+    raw = row["value"] if row else None
+    if generation == _settings_generation:
+        _settings_cache[key] = (time.monotonic(), raw)
+    return raw
+
+
+# ── Core ──────────────────────────────────────────────────────────────────────
+
+def settings_get(key: str, default=None) -> Any:
+    raw = _settings_raw(key)
+    if raw is None:
+        return default
+    return _parse_json(raw, raw)
 
 
 def settings_set(key: str, value: Any) -> None:
-    payload = json.dumps(value, ensure_ascii=False)
+    # Kompaktes JSON (orjson, ohne Leerzeichen) – die Werte (Gruppen, Firmen, …)
+    # werden bei jeder Änderung komplett geschrieben.
+    payload = json_codec.dumps(value)
     conn = get_connection()
     try:
-        _exec(
-            conn,
-            "INSERT INTO settings(`key`,`value`) VALUES(%s,%s) "
-            "ON DUPLICATE KEY UPDATE `value`=VALUES(`value`)",
-            (key, payload),
-        )
+        _exec(conn, _SETTINGS_UPSERT, (key, payload))
         conn.commit()
     finally:
         conn.close()
+    # Erst invalidieren (Generation hoch), damit ein parallel vor dem Commit
+    # gestarteter Lesezugriff den neuen Wert nicht mit dem alten überschreibt.
+    invalidate_settings_cache(key)
+    _settings_cache[key] = (time.monotonic(), payload)
 
 
 def settings_all() -> Dict[str, Any]:
@@ -105,6 +148,16 @@ def _str_or_none(v) -> Optional[str]:
     return s or None
 
 
+def _unique_by_name(companies) -> List[dict]:
+    """Dedupliziert normalisierte Firmen in einem Durchlauf nach Name (erster gewinnt,
+    Reihenfolge bleibt erhalten); Einträge ohne Namen fallen weg."""
+    by_name: dict = {}
+    for c in companies:
+        if c["name"]:
+            by_name.setdefault(c["name"], c)
+    return list(by_name.values())
+
+
 def normalize_company(item) -> dict:
     """Ein Firmen-Eintrag (String oder Objekt) → kanonisches Objekt.
     pnr_from/pnr_to werden als Ziffern-STRINGS gehalten (führende Nullen bleiben),
@@ -129,23 +182,32 @@ def normalize_company(item) -> dict:
             "pnr_shared_with": None}
 
 
-def get_companies_full() -> List[dict]:
-    """Alle Firmen als vollständige Objekte (dedupliziert nach Name)."""
-    val = settings_get("COMPANIES")
+# Zuletzt normalisierte Firmenliste samt dem Roh-String, aus dem sie entstand.
+# Solange sich der Settings-Wert nicht ändert, entfallen Parsen + Normalisieren.
+_companies_memo: Tuple[Optional[str], List[dict]] = (None, [])
+
+
+def _companies_from_raw(raw: Optional[str]) -> List[dict]:
+    val = _parse_json(raw, raw)
     if not val:
         return []
     if isinstance(val, str):
         val = [x.strip() for x in val.split(",") if x.strip()]
     if not isinstance(val, list):
         return []
-    out: List[dict] = []
-    seen = set()
-    for item in val:
-        c = normalize_company(item)
-        if c["name"] and c["name"] not in seen:
-            seen.add(c["name"])
-            out.append(c)
-    return out
+    return _unique_by_name(normalize_company(item) for item in val)
+
+
+def get_companies_full() -> List[dict]:
+    """Alle Firmen als vollständige Objekte (dedupliziert nach Name). Liefert
+    Kopien – die Einträge enthalten nur Skalare, flache Kopien genügen."""
+    global _companies_memo
+    raw = _settings_raw("COMPANIES")
+    memo_raw, companies = _companies_memo
+    if raw is None or raw != memo_raw:
+        companies = _companies_from_raw(raw)
+        _companies_memo = (raw, companies)
+    return [dict(c) for c in companies]
 
 
 def get_companies() -> List[str]:
@@ -162,13 +224,8 @@ def merge_companies(incoming: List[dict], existing: List[dict]) -> List[dict]:
     zurück. Firmen mit geteiltem Zähler verlieren eigenen Bereich/Zähler.
     """
     existing_by_name = {c["name"]: c for c in existing}
-    out: List[dict] = []
-    seen = set()
-    for item in incoming:
-        c = normalize_company(item)
-        if not c["name"] or c["name"] in seen:
-            continue
-        seen.add(c["name"])
+    out = _unique_by_name(normalize_company(item) for item in incoming)
+    for c in out:
         if c["pnr_shared_with"]:
             c["pnr_from"] = None
             c["pnr_to"] = None
@@ -185,13 +242,21 @@ def merge_companies(incoming: List[dict], existing: List[dict]) -> List[dict]:
             else:
                 c["pnr_current"] = None
                 c["pnr_warned"] = False
-        out.append(c)
     return out
 
 
 def set_companies_full(companies: List[dict]) -> None:
-    """Firmen speichern (dünne DB-Hülle um merge_companies)."""
-    settings_set("COMPANIES", merge_companies(companies, get_companies_full()))
+    """Firmen speichern (dünne DB-Hülle um merge_companies). Der Bestand wird
+    UNGECACHT und gesperrt (FOR UPDATE) in derselben Transaktion gelesen – sonst
+    könnte ein veralteter pnr_current aus dem Cache den Zähler zurücksetzen, den
+    die Personalnummern-Vergabe inzwischen hochgezählt hat."""
+    with transaction() as conn:
+        row = _fetchone(
+            conn, "SELECT `value` FROM settings WHERE `key`=%s FOR UPDATE", ("COMPANIES",),
+        )
+        existing = _companies_from_raw(row["value"] if row else None)
+        _exec(conn, _SETTINGS_UPSERT, ("COMPANIES", json_codec.dumps(merge_companies(companies, existing))))
+    invalidate_settings_cache("COMPANIES")
 
 
 def set_companies(companies: List[str]) -> None:
@@ -67,18 +67,25 @@ def get_groups_for_type(ticket_type: str) -> list[str]:
 
 # ── Write ─────────────────────────────────────────────────────────────────────
 
+def _insert_pairs(conn, pairs: list[tuple[str, str]]) -> None:
+    """Alle (ticket_type, group_id)-Paare als EIN mehrzeiliges INSERT statt
+    einem Roundtrip pro Zeile."""
+    if not pairs:
+        return
+    _exec(
+        conn,
+        "INSERT INTO ticket_group_permissions (ticket_type, group_id) VALUES "
+        + ", ".join(["(%s, %s)"] * len(pairs)),
+        tuple(v for pair in pairs for v in pair),
+    )
+
+
 def set_groups_for_type(ticket_type: str, group_ids: list[str]) -> None:
     """Ersetzt alle berechtigten Gruppen für einen Tickettyp."""
     conn = get_connection()
     try:
         _exec(conn, "DELETE FROM ticket_group_permissions WHERE ticket_type = %s", (ticket_type,))
-        for gid in set(group_ids):
-            if gid:
-                _exec(
-                    conn,
-                    "INSERT INTO ticket_group_permissions (ticket_type, group_id) VALUES (%s, %s)",
-                    (ticket_type, gid),
-                )
+        _insert_pairs(conn, [(ticket_type, gid) for gid in set(group_ids) if gid])
         conn.commit()
     finally:
         conn.close()
@@ -92,14 +99,12 @@ def set_all(payload: dict[str, list[str]]) -> None:
     conn = get_connection()
     try:
         _exec(conn, "DELETE FROM ticket_group_permissions")
-        for ticket_type, group_ids in payload.items():
-            for gid in set(group_ids):
-                if gid:
-                    _exec(
-                        conn,
-                        "INSERT INTO ticket_group_permissions (ticket_type, group_id) VALUES (%s, %s)",
-                        (ticket_type, gid),
-                    )
+        _insert_pairs(conn, [
+            (ticket_type, gid)
+            for ticket_type, group_ids in payload.items()
+            for gid in set(group_ids)
+            if gid
+        ])
         conn.commit()
     finally:
         conn.close()
@@ -1,8 +1,10 @@
-import json
 from datetime import datetime, timezone
-from typing import List, Optional, Tuple
+from typing import Iterator, List, Optional, Sequence, Tuple
 
-from backend.database.connection import get_connection, _exec, _fetchall, _fetchone
+from pymysql.cursors import SSDictCursor
+
+from backend.database.connection import get_connection, transaction, _exec, _fetchall, _fetchone
+from backend.utils import json_codec
 from backend.models.models import Ticket, RequestStatus
 
 
@@ -20,6 +22,26 @@ assignee_group_id, assignee_group_name,
 assignment_history, history
 """
 
+# Projektion für Ticket-Listen im API-Format (TicketOut): ohne owner_info,
+# ninja_metadata und die beiden History-Spalten – die braucht nur die Detailansicht.
+TICKET_LIST_FIELDS = """
+id, title, ticket_type, description,
+owner_id, owner_name,
+comment, status, priority,
+created_at, updated_at,
+workflow_state
+"""
+
+# Schmale Projektion für Listen, die nur Kopfdaten + Workflow brauchen (Übersicht):
+# die großen JSON-/Text-Spalten (description, history, …) werden nicht übertragen.
+TICKET_SUMMARY_FIELDS = """
+id, title, ticket_type,
+owner_id, owner_name,
+status, priority,
+created_at, updated_at,
+workflow_state
+"""
+
 DDL_TICKETS = f"""
 CREATE TABLE IF NOT EXISTS {TICKET_TABLE} (
     id                  INT AUTO_INCREMENT PRIMARY KEY,
@@ -32,8 +54,8 @@ CREATE TABLE IF NOT EXISTS {TICKET_TABLE} (
     comment             LONGTEXT NULL,
     status              VARCHAR(64) NOT NULL,
     priority            VARCHAR(64) DEFAULT 'medium',
-    created_at          VARCHAR(64) NOT NULL,
-    updated_at          VARCHAR(64) NULL,
+    created_at          DATETIME(6) NOT NULL,
+    updated_at          DATETIME(6) NULL,
     ninja_metadata      LONGTEXT NULL,
     workflow_state      LONGTEXT NULL,
     assignee_id         VARCHAR(255) NULL,
@@ -47,16 +69,53 @@ CREATE TABLE IF NOT EXISTS {TICKET_TABLE} (
 ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4;
 """
 
+
+def _varchar_to_datetime(column: str, definition: str) -> List[str]:
+    """Stellt eine ISO-String-Spalte auf natives DATETIME(6) um – nur solange sie
+    noch VARCHAR ist (sonst würde jeder Start die Tabelle neu aufbauen)."""
+    stmt = f"ticket_{column}_ddl"
+    return [
+        f"""
+        SET @ddl := IF(
+            (SELECT DATA_TYPE FROM information_schema.COLUMNS
+              WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = '{TICKET_TABLE}'
+                AND COLUMN_NAME = '{column}') = 'varchar',
+            'ALTER TABLE {TICKET_TABLE} MODIFY {column} {definition}',
+            'DO 0'
+        )
+        """,
+        f"PREPARE {stmt} FROM @ddl",
+        f"EXECUTE {stmt}",
+        f"DEALLOCATE PREPARE {stmt}",
+    ]
+
+
 # Idempotente In-Place-Migrationen (kein Datenverlust) – in init_db aufgerufen.
 TICKETS_MIGRATIONS = [
+    # created_at/updated_at als natives DATETIME(6) statt ISO-String: 8 statt bis
+    # zu 64 Byte je Zeile bzw. Index-Eintrag, Sortierung ohne String-Collation.
+    *_varchar_to_datetime("created_at", "DATETIME(6) NOT NULL"),
+    *_varchar_to_datetime("updated_at", "DATETIME(6) NULL"),
     # Index auf created_at beschleunigt ORDER BY created_at und die
     # Zeitfenster-Filter (Involviert-Ansicht, Übersicht) bei vielen Tickets.
     f"ALTER TABLE {TICKET_TABLE} ADD INDEX IF NOT EXISTS idx_tickets_created_at (created_at)",
+    # Status-Filter der Arbeitslisten (nur offene Tickets) inkl. Sortierung.
+    f"ALTER TABLE {TICKET_TABLE} ADD INDEX IF NOT EXISTS idx_tickets_status_created (status, created_at)",
+    # „Meine Tickets“ + Besitz-Check (ticket_owned_by) als Index-Scan statt Full-Scan.
+    f"ALTER TABLE {TICKET_TABLE} ADD INDEX IF NOT EXISTS idx_tickets_owner_created (owner_id, created_at)",
+    # Zugewiesen-Ansichten (direkt bzw. über die Fachabteilung) nach Datum sortiert.
+    f"ALTER TABLE {TICKET_TABLE} ADD INDEX IF NOT EXISTS idx_tickets_assignee_created (assignee_id, created_at)",
+    f"ALTER TABLE {TICKET_TABLE} ADD INDEX IF NOT EXISTS idx_tickets_group_created (assignee_group_id, created_at)",
 ]
 
 
+def _now_utc() -> datetime:
+    """Naive UTC-Zeit – pymysql bindet sie direkt an DATETIME-Spalten."""
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
 def _now_iso() -> str:
-    return datetime.now(timezone.utc).replace(tzinfo=None).isoformat()
+    return _now_utc().isoformat()
 
 
 def _select_tickets(
@@ -65,7 +124,9 @@ def _select_tickets(
     *,
     limit: Optional[int] = None,
     offset: Optional[int] = None,
+    fields: str = TICKET_FIELDS,
 ) -> List[Ticket]:
+    """Nicht selektierte Spalten bleiben im Ticket auf ihrem Default."""
     conn = get_connection()
     try:
         sql_params = list(params)
@@ -81,7 +142,7 @@ def _select_tickets(
         rows = _fetchall(
             conn,
             f"""
-            SELECT {TICKET_FIELDS}
+            SELECT {fields}
             FROM {TICKET_TABLE}
             {where_sql}
             ORDER BY created_at DESC
@@ -105,8 +166,12 @@ def insert_ticket(
     status: str,
     ninja_metadata: Optional[str] = None,
     priority: str = "medium",
+    history: Sequence[dict] = (),
+    watchers: Sequence[Tuple[str, Optional[str]]] = (),
 ) -> int:
-    now = _now_iso()
+    """Legt das Ticket an – inkl. initialer History-Events und Beobachter
+    (user_id, user_name) in EINER Transaktion statt einzelner Folge-Statements."""
+    now = _now_utc()
     conn = get_connection()
     try:
         cur = _exec(conn, f"""
@@ -140,29 +205,109 @@ def insert_ticket(
             comment, status, priority,
             now,
             ninja_metadata,
-            json.dumps([], ensure_ascii=False),
-            json.dumps([], ensure_ascii=False),
+            json_codec.dumps([]),
+            json_codec.dumps(list(history)),
         ))
+        ticket_id = int(cur.lastrowid)
+        watchers = [(uid, name) for uid, name in watchers if uid]
+        if watchers:
+            _exec(
+                conn,
+                "INSERT INTO ticket_watchers (ticket_id, user_id, user_name) VALUES "
+                + ", ".join(["(%s, %s, %s)"] * len(watchers))
+                + " ON DUPLICATE KEY UPDATE user_name = VALUES(user_name)",
+                tuple(v for uid, name in watchers for v in (ticket_id, uid, name)),
+            )
         conn.commit()
-        return int(cur.lastrowid)
+        return ticket_id
     finally:
         conn.close()
 
 
+def _all_tickets_where(since: str | None, statuses: Sequence[str] | None) -> Tuple[str, Tuple]:
+    where: list[str] = []
+    params: list = []
+    if since:
+        where.append("created_at >= %s")
+        params.append(since)
+    if statuses:
+        where.append(f"status IN ({', '.join(['%s'] * len(statuses))})")
+        params.extend(statuses)
+    where_sql = ("WHERE " + " AND ".join(where)) if where else ""
+    return where_sql, tuple(params)
+
+
 def list_all_tickets(
     *,
     limit: int | None = None,
     offset: int | None = None,
     since: str | None = None,
+    statuses: Sequence[str] | None = None,
+    fields: str = TICKET_FIELDS,
 ) -> List[Ticket]:
     """Tickets (neueste zuerst). `since` = ISO-Zeitstempel; nur Tickets mit
-    created_at >= since (begrenzt den Scan, z.B. für die Involviert-Ansicht)."""
-    where_sql = ""
-    params: Tuple = ()
-    if since:
-        where_sql = "WHERE created_at >= %s"
-        params = (since,)
-    return _select_tickets(where_sql, params, limit=limit, offset=offset)
+    created_at >= since (begrenzt den Scan, z.B. für die Involviert-Ansicht).
+    `statuses` schränkt per SQL auf diese Status ein (z.B. nur offene Tickets),
+    statt alle Zeilen zu laden und in Python zu filtern. `fields` = Projektion
+    (z.B. TICKET_LIST_FIELDS für Listen ohne die großen Text-Spalten)."""
+    where_sql, params = _all_tickets_where(since, statuses)
+    return _select_tickets(where_sql, params, limit=limit, offset=offset, fields=fields)
+
+
+def iter_all_tickets(
+    *,
+    since: str | None = None,
+    statuses: Sequence[str] | None = None,
+    fields: str = TICKET_FIELDS,
+) -> Iterator[Ticket]:
+    """Wie list_all_tickets ohne Paging, aber gestreamt: ungepufferter Cursor
+    (SSDictCursor), Zeile für Zeile → Ticket. Für Durchläufe über viele Tickets,
+    die nur filtern/aggregieren – es liegt nie die ganze Tabelle im Speicher.
+    Die Verbindung bleibt bis zum Ende der Iteration belegt; DB-Zugriffe im
+    Schleifenrumpf laufen über eigene Verbindungen aus dem Pool."""
+    where_sql, params = _all_tickets_where(since, statuses)
+    conn = get_connection()
+    try:
+        cur = conn.cursor(SSDictCursor)
+        try:
+            cur.execute(
+                f"""
+                SELECT {fields}
+                FROM {TICKET_TABLE}
+                {where_sql}
+                ORDER BY created_at DESC
+                """,
+                params,
+            )
+            for row in cur:
+                yield Ticket.from_row(row)
+        finally:
+            cur.close()
+    finally:
+        conn.close()
+
+
+def list_ticket_summaries(*, limit: int, offset: int = 0) -> Tuple[List[Ticket], int]:
+    """Eine Seite der Ticketübersicht + Gesamtzahl in EINER Abfrage (COUNT(*) OVER()).
+    Nur TICKET_SUMMARY_FIELDS sind befüllt (description/history/… bleiben leer)."""
+    conn = get_connection()
+    try:
+        rows = _fetchall(
+            conn,
+            f"""
+            SELECT {TICKET_SUMMARY_FIELDS}, COUNT(*) OVER() AS total_count
+            FROM {TICKET_TABLE}
+            ORDER BY created_at DESC
+            LIMIT %s OFFSET %s
+            """,
+            (limit, offset),
+        )
+    finally:
+        conn.close()
+    if not rows:
+        # Seite hinter dem Ende: keine Zeile trägt die Gesamtzahl.
+        return [], count_all_tickets() if offset else 0
+    return [Ticket.from_row(r) for r in rows], int(rows[0]["total_count"])
 
 
 def count_all_tickets() -> int:
@@ -174,8 +319,82 @@ def count_all_tickets() -> int:
         conn.close()
 
 
-def list_tickets_by_owner(owner_id: str) -> List[Ticket]:
-    return _select_tickets("WHERE owner_id = %s", (owner_id,))
+def count_tickets_grouped() -> List[dict]:
+    """Ticket-Anzahl je (status, priority, ticket_type) – eine GROUP-BY-Abfrage
+    statt alle Tickets zu laden (z.B. für die Prometheus-Metriken)."""
+    conn = get_connection()
+    try:
+        return _fetchall(
+            conn,
+            f"""
+            SELECT status, priority, ticket_type, COUNT(*) AS cnt
+            FROM {TICKET_TABLE}
+            GROUP BY status, priority, ticket_type
+            """,
+            (),
+        )
+    finally:
+        conn.close()
+
+
+def list_tickets_by_owner(
+    owner_id: str,
+    *,
+    limit: int | None = None,
+    offset: int | None = None,
+    fields: str = TICKET_FIELDS,
+) -> List[Ticket]:
+    return _select_tickets(
+        "WHERE owner_id = %s", (owner_id,), limit=limit, offset=offset, fields=fields,
+    )
+
+
+def list_tickets_by_owner_page(
+    owner_id: str, *, limit: int, offset: int = 0,
+) -> Tuple[List[Ticket], int]:
+    """Eine Seite der eigenen Tickets + Gesamtzahl in EINER Abfrage (COUNT(*) OVER()).
+    Nur TICKET_LIST_FIELDS sind befüllt (für die Listenausgabe)."""
+    conn = get_connection()
+    try:
+        rows = _fetchall(
+            conn,
+            f"""
+            SELECT {TICKET_LIST_FIELDS}, COUNT(*) OVER() AS total_count
+            FROM {TICKET_TABLE}
+            WHERE owner_id = %s
+            ORDER BY created_at DESC
+            LIMIT %s OFFSET %s
+            """,
+            (owner_id, limit, offset),
+        )
+    finally:
+        conn.close()
+    if not rows:
+        return [], count_tickets_by_owner(owner_id) if offset else 0
+    return [Ticket.from_row(r) for r in rows], int(rows[0]["total_count"])
+
+
+def ticket_owned_by(ticket_id: int, owner_id: str) -> bool:
+    """Gehört das Ticket dem User? Ein PK-Lookup statt alle seine Tickets zu laden."""
+    conn = get_connection()
+    try:
+        row = _fetchone(
+            conn,
+            f"SELECT 1 AS hit FROM {TICKET_TABLE} WHERE id = %s AND owner_id = %s LIMIT 1",
+            (ticket_id, owner_id),
+        )
+        return row is not None
+    finally:
+        conn.close()
+
+
+def count_tickets_by_owner(owner_id: str) -> int:
+    conn = get_connection()
+    try:
+        row = _fetchone(conn, f"SELECT COUNT(*) as cnt FROM {TICKET_TABLE} WHERE owner_id = %s", (owner_id,))
+        return row["cnt"] if row else 0
+    finally:
+        conn.close()
 
 
 def list_tickets_by_assignee(assignee_id: str) -> List[Ticket]:
@@ -219,12 +438,24 @@ def list_tickets_by_assignee_group(group_id: str) -> List[Ticket]:
     )
 
 
+def list_tickets_watched_by(user_id: str) -> List[Ticket]:
+    """Vom Nutzer beobachtete Tickets – eine Abfrage statt get_ticket je Watcher-Zeile.
+    Nur TICKET_SUMMARY_FIELDS sind befüllt (Dashboard-Kacheln)."""
+    return _select_tickets(
+        "WHERE id IN (SELECT ticket_id FROM ticket_watchers WHERE user_id = %s)",
+        (user_id,),
+        fields=TICKET_SUMMARY_FIELDS,
+    )
+
+
 def get_ticket(ticket_id: int) -> Optional[Ticket]:
     rows = _select_tickets("WHERE id = %s", (ticket_id,), limit=1)
     return rows[0] if rows else None
 
 
-def update_ticket(ticket_id: int, **fields) -> None:
+def update_ticket(ticket_id: int, conn=None, **fields) -> None:
+    """Erlaubte Felder setzen. Mit `conn` Teil einer umgebenden Transaktion
+    (siehe transaction()), sonst eigene Verbindung + Commit."""
     allowed = {
         "title", "description", "owner_id", "owner_name",
         "owner_info", "comment", "status", "priority",
@@ -239,20 +470,16 @@ def update_ticket(ticket_id: int, **fields) -> None:
     if not updates:
         return
 
-    updates["updated_at"] = _now_iso()
+    updates["updated_at"] = _now_utc()
 
     set_sql = ", ".join(f"{k}=%s" for k in updates.keys())
     params = tuple(
-        json.dumps(v, ensure_ascii=False) if isinstance(v, (dict, list)) else v
+        json_codec.dumps(v) if isinstance(v, (dict, list)) else v
         for v in updates.values()
     ) + (ticket_id,)
 
-    conn = get_connection()
-    try:
-        _exec(conn, f"UPDATE {TICKET_TABLE} SET {set_sql} WHERE id=%s", params)
-        conn.commit()
-    finally:
-        conn.close()
+    with transaction(conn) as tx:
+        _exec(tx, f"UPDATE {TICKET_TABLE} SET {set_sql} WHERE id=%s", params)
 
 
 def update_ticket_metadata(
@@ -260,76 +487,187 @@ def update_ticket_metadata(
     ninja_ticket_id: Optional[int] = None,
     synced_at: Optional[str] = None,
 ) -> None:
-    ticket = get_ticket(ticket_id)
-    metadata = ticket.metadata if ticket else {}
-
+    """Ninja-Metadaten serverseitig per JSON_SET mergen – ein UPDATE statt
+    Lesen → Parsen → Schreiben. Ungültiger Altinhalt wird wie bisher verworfen."""
+    paths = ["'$.synced_at', %s"]
+    params: list = [synced_at if synced_at else _now_iso()]
     if ninja_ticket_id is not None:
-        metadata["ninja_ticket_id"] = ninja_ticket_id
-    metadata["synced_at"] = synced_at if synced_at else _now_iso()
+        paths.insert(0, "'$.ninja_ticket_id', %s")
+        params.insert(0, ninja_ticket_id)
+
+    conn = get_connection()
+    try:
+        _exec(
+            conn,
+            f"""
+            UPDATE {TICKET_TABLE}
+            SET ninja_metadata = JSON_SET(
+                    IF(JSON_VALID(ninja_metadata), ninja_metadata, '{{}}'),
+                    {", ".join(paths)}),
+                updated_at = %s
+            WHERE id = %s
+            """,
+            tuple(params) + (_now_utc(), ticket_id),
+        )
+        conn.commit()
+    finally:
+        conn.close()
+
 
-    update_ticket(ticket_id, ninja_metadata=json.dumps(metadata, ensure_ascii=False))
+def append_history(ticket_id: int, events: Sequence[dict], conn=None) -> Optional[str]:
+    """Hängt Events an die History-Spalte an – eine gesperrte Lese-/Schreibrunde
+    über nur `title` + `history` (statt die ganze Zeile zu laden), damit parallele
+    Events sich nicht gegenseitig überschreiben. Liefert den Ticket-Titel (für
+    den Audit) oder None, wenn das Ticket nicht existiert. Mit `conn` Teil einer
+    umgebenden Transaktion."""
+    with transaction(conn) as tx:
+        row = _fetchone(
+            tx, f"SELECT title, history FROM {TICKET_TABLE} WHERE id=%s FOR UPDATE", (ticket_id,),
+        )
+        if row is None:
+            return None
+        try:
+            history = json_codec.loads(row["history"] or "[]")
+        except Exception:
+            history = []
+        if not isinstance(history, list):
+            history = []
+        history.extend(events)
+        _exec(
+            tx,
+            f"UPDATE {TICKET_TABLE} SET history=%s, updated_at=%s WHERE id=%s",
+            (json_codec.dumps(history), _now_utc(), ticket_id),
+        )
+        return row["title"]
+
+
+def archive_ticket(ticket_id: int) -> Optional[str]:
+    """Setzt den Status atomar auf archiviert. Liefert den vorherigen Status
+    (für die Historie) oder None, wenn das Ticket nicht existiert. Die Zeile wird
+    per FOR UPDATE gesperrt – kein Fenster zwischen Lesen und Schreiben.
+    (MariaDB kennt kein UPDATE … RETURNING.)"""
+    conn = get_connection()
+    try:
+        row = _fetchone(
+            conn, f"SELECT status FROM {TICKET_TABLE} WHERE id=%s FOR UPDATE", (ticket_id,),
+        )
+        if row is None:
+            conn.rollback()
+            return None
+        _exec(
+            conn,
+            f"UPDATE {TICKET_TABLE} SET status=%s, updated_at=%s WHERE id=%s",
+            (RequestStatus.archived.value, _now_utc(), ticket_id),
+        )
+        conn.commit()
+        return row["status"]
+    finally:
+        conn.close()
 
 
-def delete_ticket(ticket_id: int) -> bool:
+def delete_ticket(ticket_id: int, owner_id: Optional[str] = None) -> bool:
     """Hard-Delete inkl. Cleanup abhängiger Zeilen (Beobachter + Edit-Locks),
     damit keine Waisen zurückbleiben. Alles in einer Transaktion.
-    (Die Historie liegt in der tickets-Zeile und wird mitgelöscht.)"""
+    (Die Historie liegt in der tickets-Zeile und wird mitgelöscht.)
+
+    Mit owner_id wird nur gelöscht, wenn das Ticket diesem User gehört –
+    Besitz-Check und Löschen sind dann ein Statement (kein Check-then-Act)."""
+    where, params = "id=%s", (ticket_id,)
+    if owner_id is not None:
+        where, params = "id=%s AND owner_id=%s", (ticket_id, owner_id)
     conn = get_connection()
     try:
+        cur = _exec(conn, f"DELETE FROM {TICKET_TABLE} WHERE {where}", params)
+        if cur.rowcount == 0:
+            conn.rollback()
+            return False
         _exec(conn, "DELETE FROM ticket_watchers WHERE ticket_id=%s", (ticket_id,))
         _exec(conn, "DELETE FROM ticket_locks WHERE ticket_id=%s", (ticket_id,))
-        cur = _exec(conn, f"DELETE FROM {TICKET_TABLE} WHERE id=%s", (ticket_id,))
-        affected = cur.rowcount
         conn.commit()
-        return affected > 0
+        return True
     finally:
         conn.close()
 
 
-def _append_assignment_history(
+def delete_ticket_if_owned(ticket_id: int, owner_id: str) -> bool:
+    """Löscht das Ticket nur, wenn owner_id der Ersteller ist. False heißt:
+    existiert nicht ODER gehört jemand anderem."""
+    return delete_ticket(ticket_id, owner_id=owner_id)
+
+
+def ticket_exists(ticket_id: int) -> bool:
+    conn = get_connection()
+    try:
+        row = _fetchone(conn, f"SELECT 1 AS hit FROM {TICKET_TABLE} WHERE id = %s", (ticket_id,))
+        return row is not None
+    finally:
+        conn.close()
+
+
+def _set_role_with_history(
     ticket_id: int,
+    columns: dict,
     *,
     assignee: Optional[dict] = None,
     accountable: Optional[dict] = None,
     group: Optional[dict] = None,
     action: Optional[str] = None,
 ) -> None:
-    ticket = get_ticket(ticket_id)
-    history = ticket.assignment_history_parsed if ticket else []
-
-    history.append({
+    """Rollen-Spalten setzen und den Eintrag an assignment_history anhängen –
+    EIN UPDATE per JSON_ARRAY_APPEND, ohne die History vorher zu lesen. Das
+    UPDATE sperrt die Zeile selbst, parallele Zuweisungen können sich also keine
+    Einträge überschreiben. Ungültiger Altinhalt wird wie bisher verworfen."""
+    entry = json_codec.dumps({
         "timestamp": _now_iso(),
         "assignee": assignee,
         "accountable": accountable,
         "group": group,
         "action": action,
     })
-
-    update_ticket(ticket_id, assignment_history=json.dumps(history, ensure_ascii=False))
+    values = {**columns, "updated_at": _now_utc()}
+    set_sql = ", ".join(f"{k}=%s" for k in values)
+    conn = get_connection()
+    try:
+        _exec(
+            conn,
+            f"""
+            UPDATE {TICKET_TABLE}
+            SET {set_sql},
+                assignment_history = JSON_ARRAY_APPEND(
+                    IF(JSON_VALID(assignment_history) AND JSON_TYPE(assignment_history) = 'ARRAY',
+                       assignment_history, '[]'),
+                    '$', JSON_EXTRACT(%s, '$'))
+            WHERE id = %s
+            """,
+            tuple(values.values()) + (entry, ticket_id),
+        )
+        conn.commit()
+    finally:
+        conn.close()
 
 
 def set_assignee(ticket_id: int, user_id: str, user_name: str) -> None:
-    _append_assignment_history(
+    _set_role_with_history(
         ticket_id,
+        {"assignee_id": user_id, "assignee_name": user_name},
         assignee={"id": user_id, "name": user_name},
         action="set_assignee",
     )
-    update_ticket(ticket_id, assignee_id=user_id, assignee_name=user_name)
 
 
 def set_accountable(ticket_id: int, user_id: str, user_name: str) -> None:
-    _append_assignment_history(
+    _set_role_with_history(
         ticket_id,
+        {"accountable_id": user_id, "accountable_name": user_name},
         accountable={"id": user_id, "name": user_name},
         action="set_accountable",
     )
-    update_ticket(ticket_id, accountable_id=user_id, accountable_name=user_name)
 
 
 def set_assignee_group(ticket_id: int, group_id: str, group_name: str) -> None:
-    _append_assignment_history(
+    _set_role_with_history(
         ticket_id,
+        {"assignee_group_id": group_id, "assignee_group_name": group_name},
         group={"id": group_id, "name": group_name},
         action="set_group",
     )
-    update_ticket(ticket_id, assignee_group_id=group_id, assignee_group_name=group_name)
\ No newline at end of file
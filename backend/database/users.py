@@ -1,6 +1,5 @@
 from __future__ import annotations
 
-import json
 from dataclasses import dataclass
 from datetime import datetime, timezone
 from typing import List, Optional
@@ -8,6 +7,7 @@ from typing import List, Optional
 from backend.database.connection import (
     get_connection, _exec, _fetchone, _fetchall,
 )
+from backend.utils import json_codec
 
 # ── Roles & Permissions ───────────────────────────────────────────────────────
 
@@ -65,7 +65,7 @@ class AppUser:
     def from_row(cls, row: dict) -> "AppUser":
         extra = row.get("extra_permissions") or "[]"
         try:
-            parsed_extra = json.loads(extra) if isinstance(extra, str) else extra
+            parsed_extra = json_codec.loads(extra) if isinstance(extra, str) else extra
         except Exception:
             parsed_extra = []
         return cls(
@@ -201,7 +201,7 @@ def set_extra_permissions(microsoft_id: str, perms: List[str]) -> None:
     try:
         _exec(conn,
             "UPDATE app_users SET extra_permissions = %s WHERE microsoft_id = %s",
-            (json.dumps(perms, ensure_ascii=False), microsoft_id))
+            (json_codec.dumps(perms), microsoft_id))
         conn.commit()
     finally:
         conn.close()
@@ -6,11 +6,12 @@ from typing import cast
 from fastapi import FastAPI
 from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
+from starlette.middleware.gzip import GZipMiddleware
 from starlette.datastructures import State
 from backend.api.v1 import tickets as tickets_v1
 from backend.api.v1 import auth as auth_v1
 from backend.core.app_lifespan import lifespan
-from backend.core.session import setup_session
+from backend.core.session import setup_session, get_user_from_session
 from backend.database import init_db
 from backend.models.models import TicketType
 from backend.metrics.metrics import init_metrics
@@ -57,8 +58,13 @@ def create_app() -> FastAPI:
     app.templates = Jinja2Templates(directory=BASE_DIR / "templates")
     app.templates.env.globals["SESSION_TIMEOUT"] = config.SESSION_TIMEOUT
     app.templates.env.globals["TicketTypes"] = get_ticket_type_dict()
+    # Templates einmal beim Start auflösen – pro Request nur noch ein Attributzugriff
+    # statt Loader-Lookup (Jinja nimmt Template-Objekte direkt entgegen).
+    app.state.freigabe_template = app.templates.get_template("freigabe_result.html")
 
     setup_session(app)
+    # Große JSON-Antworten (User-Liste, Ticket-Listen, Übersicht) komprimiert ausliefern.
+    app.add_middleware(GZipMiddleware, minimum_size=1024)
     init_metrics(app, app.state.manager)
 
     @app.middleware("http")
@@ -81,7 +87,9 @@ def create_app() -> FastAPI:
             if "/admin/" in path or "/settings/" in path:
                 try:
                     from backend.database.audit_log import record_audit
-                    u = (request.scope.get("session") or {}).get("user") or {}
+                    u = (getattr(request.state, "user", None)
+                         or get_user_from_session(request.scope.get("session") or {})
+                         or {})
                     record_audit(
                         action="access_denied",
                         actor_id=u.get("id"),
@@ -14,6 +14,7 @@ from backend.metrics.http_metrics import MetricsMiddleware
 from backend.metrics.auth_metrics import collect_session_metrics
 from backend.metrics.ticket_metrics import collect_ticket_metrics
 from backend.metrics.system_metrics import collect_system_metrics
+from backend.utils.logger import logger
 
 
 # ---------------------------------------------------------
@@ -105,8 +106,8 @@ def _collector_thread():
 
             collect_system_metrics()
 
-        except Exception as e:
-            print("Metrics collector error:", e)
+        except Exception:
+            logger.exception("Metrics collector error")
 
 
 # ---------------------------------------------------------
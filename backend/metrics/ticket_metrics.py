@@ -1,7 +1,7 @@
 from datetime import datetime, timezone
 from typing import Dict, Optional
 from prometheus_client import Gauge, Counter
-from backend.models.models import RequestStatus
+from backend.models.models import RequestStatus, TicketPriority, TicketType
 from backend.services.workflow_state import current_responsibility
 
 
@@ -58,6 +58,10 @@ tickets_created_total = Counter(
     ["type"]
 )
 
+# Label-Kinder je Typ einmal beim Import binden: labels() kostet pro Aufruf
+# Validierung + Lock + Dict-Lookup; außerdem existieren die Serien so ab Start (0).
+_created_by_type = {t: tickets_created_total.labels(type=t.value) for t in TicketType}
+
 # Tickets, die einen Endzustand erreicht haben (Workflow-Ergebnis: archiviert/abgelehnt).
 # Ereignis-Zähler → ergibt Durchsatz und Ablehnquote über die Zeit.
 tickets_terminal_total = Counter(
@@ -78,6 +82,11 @@ tickets_oldest_open_age_seconds = Gauge(
 # EVENT RECORDER
 # ---------------------------------------------------------
 
+def record_ticket_created(ticket_type: TicketType) -> None:
+    """Nach dem Anlegen eines Tickets aufrufen."""
+    _created_by_type[ticket_type].inc()
+
+
 def record_ticket_terminal(outcome: str) -> None:
     """Beim Erreichen eines Endzustands aufrufen (archived/rejected). Best-effort."""
     try:
@@ -90,6 +99,10 @@ def record_ticket_terminal(outcome: str) -> None:
 # HELPERS
 # ---------------------------------------------------------
 
+_OPEN_STATUS_VALUES = frozenset({RequestStatus.in_progress.value, RequestStatus.in_request.value})
+# Unbekannte/leere Prioritäten zählen wie in Ticket.from_row als "medium".
+_PRIORITY_VALUES = frozenset(p.value for p in TicketPriority)
+
 def _current_phase_label(t) -> Optional[str]:
     """Label der aktuell aktiven Phase, oder None (kein Workflow / abgeschlossen)."""
     wf = t.workflow_state_parsed or {}
@@ -100,15 +113,14 @@ def _current_phase_label(t) -> Optional[str]:
     return None
 
 
-def _age_seconds(created_at) -> Optional[float]:
-    """Alter eines (evtl. tz-aware) created_at in Sekunden, sonst None."""
+def _created_ts(created_at) -> Optional[float]:
+    """created_at (naiv = UTC, oder tz-aware) als Unix-Timestamp, sonst None."""
     if created_at is None:
         return None
     try:
-        ca = created_at
-        if getattr(ca, "tzinfo", None) is not None:
-            ca = ca.astimezone(timezone.utc).replace(tzinfo=None)
-        return max(0.0, (datetime.utcnow() - ca).total_seconds())
+        if getattr(created_at, "tzinfo", None) is None:
+            created_at = created_at.replace(tzinfo=timezone.utc)
+        return created_at.timestamp()
     except Exception:
         return None
 
@@ -119,43 +131,45 @@ def _age_seconds(created_at) -> Optional[float]:
 
 def collect_ticket_metrics(ticket_manager):
 
-    tickets = ticket_manager.list_all()
-
-    total = len(tickets)
+    total = 0
     open_count = 0
 
     status_count: Dict[str, int] = {}
     priority_count: Dict[str, int] = {}
     type_count: Dict[str, int] = {}
     phase_count: Dict[str, int] = {}
-    phase_oldest_age: Dict[str, float] = {}
+    # Ältestes created_at je Phase als Timestamp – Alter erst nach der Schleife.
+    phase_oldest_ts: Dict[str, float] = {}
     dept_open_count: Dict[str, int] = {}
 
-    for t in tickets:
+    # Zähler per GROUP BY in der DB – archivierte Tickets (die große Mehrheit)
+    # müssen dafür nicht mehr geladen und geparst werden.
+    for row in ticket_manager.count_grouped():
+        cnt = int(row["cnt"])
+        total += cnt
+
+        s = row["status"]
+        status_count[s] = status_count.get(s, 0) + cnt
 
-        # status
-        s = t.status.value
-        status_count[s] = status_count.get(s, 0) + 1
+        p = row["priority"] if row["priority"] in _PRIORITY_VALUES else TicketPriority.medium.value
+        priority_count[p] = priority_count.get(p, 0) + cnt
 
-        # priority
-        p = t.priority.value
-        priority_count[p] = priority_count.get(p, 0) + 1
+        tt = row["ticket_type"]
+        type_count[tt] = type_count.get(tt, 0) + cnt
 
-        # type
-        tt = t.ticket_type.value
-        type_count[tt] = type_count.get(tt, 0) + 1
+        if s in _OPEN_STATUS_VALUES:
+            open_count += cnt
 
-        is_open = t.status in (RequestStatus.in_progress, RequestStatus.in_request)
-        if is_open:
-            open_count += 1
+    # Phasen/Fachabteilungen brauchen den Workflow → nur aktive Tickets laden.
+    for t in ticket_manager.list_open():
 
-            # Phase nur für aktive Tickets (terminale Tickets stehen in keiner Phase mehr)
-            label = _current_phase_label(t)
-            if label:
-                phase_count[label] = phase_count.get(label, 0) + 1
-                age = _age_seconds(getattr(t, "created_at", None))
-                if age is not None and age > phase_oldest_age.get(label, -1.0):
-                    phase_oldest_age[label] = age
+        # Phase nur für aktive Tickets (terminale Tickets stehen in keiner Phase mehr)
+        label = _current_phase_label(t)
+        if label:
+            phase_count[label] = phase_count.get(label, 0) + 1
+            ts = _created_ts(getattr(t, "created_at", None))
+            if ts is not None and ts < phase_oldest_ts.get(label, float("inf")):
+                phase_oldest_ts[label] = ts
 
         # Offene Fachabteilungen der AKTUELLEN Phase (nur department_review liefert kind=departments)
         try:
@@ -193,8 +207,9 @@ def collect_ticket_metrics(ticket_manager):
     for k, v in phase_count.items():
         tickets_by_phase.labels(phase=k).set(v)
 
-    for k, v in phase_oldest_age.items():
-        tickets_oldest_open_age_seconds.labels(phase=k).set(v)
+    now_ts = datetime.now(timezone.utc).timestamp()
+    for k, ts in phase_oldest_ts.items():
+        tickets_oldest_open_age_seconds.labels(phase=k).set(max(0.0, now_ts - ts))
 
     for k, v in dept_open_count.items():
         tickets_open_by_department.labels(department=k).set(v)
\ No newline at end of file
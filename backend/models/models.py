@@ -1,9 +1,10 @@
-import json
 from dataclasses import dataclass, field
 from enum import Enum
 from datetime import datetime, timezone
 from typing import Optional, List, Dict, Any
 
+from backend.utils import json_codec
+
 
 class RequestStatus(str, Enum):
     in_progress = "in_progress"
@@ -35,6 +36,10 @@ class TicketPriority(str, Enum):
 
 
 
+# Leere JSON-Literale → Fabrik für ein frisches (veränderbares) Objekt.
+_EMPTY_JSON = {"[]": list, "{}": dict}
+
+
 @dataclass
 class Ticket:
     # ================= CORE =================
@@ -74,23 +79,22 @@ class Ticket:
     created_at: datetime = field(default_factory=datetime.utcnow)
     updated_at: Optional[datetime] = None
 
+    # Memo für die geparsten JSON-Spalten: attr → (roher String, geparster Wert).
+    _json_cache: Dict[str, Any] = field(default_factory=dict, init=False, repr=False, compare=False)
+
     # ------------------------------------------------------------------
     # FACTORY
     # ------------------------------------------------------------------
     @classmethod
     def from_row(cls, row: Dict[str, Any]) -> "Ticket":
-
-        def parse_json(val, default):
-            if not val:
-                return default
-            try:
-                return json.loads(val)
-            except Exception:
-                return default
+        # JSON-Spalten bleiben hier roh – geparst wird erst beim ersten Zugriff
+        # über die *_parsed-Properties (siehe _parsed).
 
         def parse_dt(val):
             if not val:
                 return None
+            if isinstance(val, datetime):  # DATETIME-Spalte (pymysql liefert datetime)
+                return val
             try:
                 return datetime.fromisoformat(val)
             except Exception:
@@ -146,11 +150,37 @@ class Ticket:
     def _safe_json(val: Optional[str], default: Any):
         if not val:
             return default
+        if isinstance(val, (dict, list)):
+            return val
+        # Leere Literale (Default von history/assignment_history) ohne Parser.
+        empty = _EMPTY_JSON.get(val)
+        if empty is not None:
+            return empty()
+        # Die JSON-Spalten enthalten nur Objekte/Arrays – Platzhalter wie "-" oder
+        # "null" aus Altdaten gar nicht erst an den Parser geben (spart die Exception).
+        if val[0] not in "{[" and val.lstrip()[:1] not in ("{", "["):
+            return default
         try:
-            return json.loads(val)
+            return json_codec.loads(val)
         except Exception:
             return default
 
+    def _parsed(self, attr: str, default: Any):
+        """Parst eine JSON-Spalte einmal pro Ticket-Objekt. Wird die Spalte neu
+        zugewiesen, wird neu geparst (Vergleich über die Identität des Strings)."""
+        raw = getattr(self, attr)
+        hit = self._json_cache.get(attr)
+        if hit is not None and hit[0] is raw:
+            return hit[1]
+        value = self._safe_json(raw, default)
+        self._json_cache[attr] = (raw, value)
+        return value
+
+    def prime_parsed(self, attr: str, value: Any) -> None:
+        """Bereits geparsten Wert der aktuellen Spalte ins Memo legen (z.B. direkt
+        nach dem Anlegen, wenn der Request-Body schon geparst wurde)."""
+        self._json_cache[attr] = (getattr(self, attr), value)
+
     @property
     def assignment_history_parsed(self) -> List[Dict[str, Any]]:
         """
@@ -164,19 +194,23 @@ class Ticket:
           }
         ]
         """
-        return self._safe_json(self.assignment_history, [])
+        return self._parsed("assignment_history", [])
 
     @property
     def history_parsed(self) -> list[dict]:
-        return self._safe_json(self.history, [])
+        return self._parsed("history", [])
+
+    @property
+    def description_parsed(self) -> Dict[str, Any]:
+        return self._parsed("description", {})
 
     @property
     def owner_info_parsed(self) -> Dict[str, Any]:
-        return self._safe_json(self.owner_info, {})
+        return self._parsed("owner_info", {})
 
     @property
     def metadata(self) -> Dict[str, Any]:
-        return self._safe_json(self.ninja_metadata, {})
+        return self._parsed("ninja_metadata", {})
 
     @property
     def ninja_ticket_id(self) -> Optional[int]:
@@ -192,4 +226,4 @@ class Ticket:
 
     @property
     def workflow_state_parsed(self) -> dict:
-        return self._safe_json(self.workflow_state, {})
\ No newline at end of file
+        return self._parsed("workflow_state", {})
\ No newline at end of file
@@ -1,3 +1,6 @@
+import asyncio
+import time
+
 import httpx
 from typing import List, Dict
 from backend.utils.config import config
@@ -9,26 +12,52 @@ GRAPH_API_USERS = "https://graph.microsoft.com/v1.0/users"
 
 E3_SKU_ID = "6fd2c87f-b296-42f0-b197-1e91e994b900"
 
+# Timeout der seitenweisen Listen-Abfragen (User-/Gruppen-Sync).
+LIST_TIMEOUT = 30.0
+
+# Ein langlebiger Client für alle Graph-Aufrufe: Verbindungen (TCP + TLS) werden
+# wiederverwendet statt bei jedem Login/Sync neu aufgebaut. Geschlossen im Lifespan.
+_client: httpx.AsyncClient | None = None
+
+
+def _graph_client() -> httpx.AsyncClient:
+    global _client
+    if _client is None or _client.is_closed:
+        _client = httpx.AsyncClient(
+            limits=httpx.Limits(max_connections=100, max_keepalive_connections=20),
+        )
+    return _client
+
+
+async def close_graph_client() -> None:
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
+
 
 async def get_user_profile(access_token: str) -> dict:
     headers = {
         "Authorization": f"Bearer {access_token}"
     }
 
-    async with httpx.AsyncClient() as client:
-        # User Details mit erweiterten Feldern
-        profile_url = (
-            GRAPH_API_ME +
-            "?$select=displayName,jobTitle,mobilePhone,businessPhones,companyName,streetAddress,officeLocation,city,postalCode"
-        )
-        r = await client.get(profile_url, headers=headers)
-        r.raise_for_status()
-        me = r.json()
-
-        # Gruppenmitgliedschaften
-        groups_response = await client.get(GRAPH_API_GROUPS, headers=headers)
-        groups_response.raise_for_status()
-        groups_data = groups_response.json()
+    # User Details mit erweiterten Feldern
+    profile_url = (
+        GRAPH_API_ME +
+        "?$select=displayName,jobTitle,mobilePhone,businessPhones,companyName,streetAddress,officeLocation,city,postalCode"
+    )
+
+    client = _graph_client()
+    # Profil und Gruppenmitgliedschaften sind unabhängig → parallel abfragen
+    # (halbiert die Graph-Latenz beim Login).
+    r, groups_response = await asyncio.gather(
+        client.get(profile_url, headers=headers),
+        client.get(GRAPH_API_GROUPS, headers=headers),
+    )
+    r.raise_for_status()
+    me = r.json()
+    groups_response.raise_for_status()
+    groups_data = groups_response.json()
 
     group_names: List[str] = [
         g.get("displayName") for g in groups_data.get("value", [])
@@ -49,6 +78,35 @@ async def get_user_profile(access_token: str) -> dict:
     }
 
 
+# Kurzlebiger Cache der Graph-Profile pro User (oid). Wiederholte Logins desselben
+# Users (neuer Tab, Session abgelaufen, Logout/Login) sparen so beide Graph-Calls.
+# Bewusst nach User-ID statt Token: jeder Login liefert ein neues Access-Token.
+PROFILE_CACHE_TTL = 300
+PROFILE_CACHE_MAX = 1000
+_profile_cache: Dict[str, tuple] = {}
+
+
+async def get_user_profile_cached(access_token: str, user_id: str | None) -> dict:
+    """Wie get_user_profile, aber mit TTL-Cache (PROFILE_CACHE_TTL) je user_id."""
+    now = time.monotonic()
+    if user_id:
+        hit = _profile_cache.get(user_id)
+        if hit and hit[0] > now:
+            return hit[1]
+
+    infos = await get_user_profile(access_token)
+
+    if user_id:
+        if len(_profile_cache) >= PROFILE_CACHE_MAX:
+            for k in [k for k, (exp, _) in _profile_cache.items() if exp <= now]:
+                _profile_cache.pop(k, None)
+            while len(_profile_cache) >= PROFILE_CACHE_MAX:
+                _profile_cache.pop(next(iter(_profile_cache)))
+        _profile_cache.pop(user_id, None)
+        _profile_cache[user_id] = (now + PROFILE_CACHE_TTL, infos)
+    return infos
+
+
 async def send_mail(
     access_token: str,
     subject: str,
@@ -71,9 +129,8 @@ async def send_mail(
         "saveToSentItems": str(save_to_sent_items).lower(),
     }
 
-    async with httpx.AsyncClient() as client:
-        resp = await client.post(GRAPH_API_SENDMAIL, headers=headers, json=body)
-        resp.raise_for_status()
+    resp = await _graph_client().post(GRAPH_API_SENDMAIL, headers=headers, json=body)
+    resp.raise_for_status()
 
 
 async def list_all_users_appcontext(access_token: str) -> list[dict]:
@@ -93,26 +150,26 @@ async def list_all_users_appcontext(access_token: str) -> list[dict]:
     url = "https://graph.microsoft.com/v1.0/users"
     users = []
 
-    async with httpx.AsyncClient(timeout=30.0) as client:
-        while True:
-            resp = await client.get(url, headers=headers, params=params)
-            resp.raise_for_status()
-            data = resp.json()
+    client = _graph_client()
+    while True:
+        resp = await client.get(url, headers=headers, params=params, timeout=LIST_TIMEOUT)
+        resp.raise_for_status()
+        data = resp.json()
 
-            for u in data.get("value", []):
-                users.append({
-                    "id": u.get("id"),
-                    "displayName": u.get("displayName") or "",
-                    "mail": u.get("mail") or u.get("userPrincipalName") or "",
-                })
+        for u in data.get("value", []):
+            users.append({
+                "id": u.get("id"),
+                "displayName": u.get("displayName") or "",
+                "mail": u.get("mail") or u.get("userPrincipalName") or "",
+            })
 
-            next_link = data.get("@odata.nextLink")
-            if not next_link:
-                break
+        next_link = data.get("@odata.nextLink")
+        if not next_link:
+            break
 
-            # nextLink enthält Query-Parameters, also params NICHT mehr mitschicken
-            url = next_link
-            params = None
+        # nextLink enthält Query-Parameters, also params NICHT mehr mitschicken
+        url = next_link
+        params = None
 
     return users
 
@@ -132,26 +189,26 @@ async def list_all_users_with_e3_license(access_token: str) -> List[Dict[str, st
     url = "https://graph.microsoft.com/v1.0/users"
     users: List[Dict[str, str]] = []
 
-    async with httpx.AsyncClient(timeout=30.0) as client:
-        while True:
-            resp = await client.get(url, headers=headers, params=params)
-            resp.raise_for_status()
-            data = resp.json()
+    client = _graph_client()
+    while True:
+        resp = await client.get(url, headers=headers, params=params, timeout=LIST_TIMEOUT)
+        resp.raise_for_status()
+        data = resp.json()
 
-            for u in data.get("value", []):
+        for u in data.get("value", []):
 
-                users.append({
-                    "id": u.get("id"),
-                    "displayName": u.get("displayName") or "",
-                    "mail": u.get("mail") or u.get("userPrincipalName") or "",
-                })
+            users.append({
+                "id": u.get("id"),
+                "displayName": u.get("displayName") or "",
+                "mail": u.get("mail") or u.get("userPrincipalName") or "",
+            })
 
-            next_link = data.get("@odata.nextLink")
-            if not next_link:
-                break
+        next_link = data.get("@odata.nextLink")
+        if not next_link:
+            break
 
-            url = next_link
-            params = None  # Nicht nochmal Query-Params mitschicken
+        url = next_link
+        params = None  # Nicht nochmal Query-Params mitschicken
 
     return users
 
@@ -160,13 +217,8 @@ def get_cached_user_mail(app, user_id: str) -> str | None:
     Gibt die Mailadresse eines Users aus dem Cache zurück.
     """
 
-    users = getattr(app.state, "user_cache", [])
-
-    for user in users:
-        if user["id"] == user_id:
-            return user.get("mail")
-
-    return None
+    user = getattr(app.state, "user_index", {}).get(user_id)
+    return user.get("mail") if user else None
 
 
 async def list_all_groups(access_token: str) -> List[Dict[str, str]]:
@@ -187,24 +239,24 @@ async def list_all_groups(access_token: str) -> List[Dict[str, str]]:
     url = "https://graph.microsoft.com/v1.0/groups"
     groups: List[Dict[str, str]] = []
 
-    async with httpx.AsyncClient(timeout=30.0) as client:
-        while True:
-            resp = await client.get(url, headers=headers, params=params)
-            resp.raise_for_status()
-            data = resp.json()
-
-            for g in data.get("value", []):
-                groups.append({
-                    "id": g.get("id"),
-                    "displayName": g.get("displayName") or "",
-                    "description": g.get("description") or "",
-                })
-
-            next_link = data.get("@odata.nextLink")
-            if not next_link:
-                break
-
-            url = next_link
-            params = None
+    client = _graph_client()
+    while True:
+        resp = await client.get(url, headers=headers, params=params, timeout=LIST_TIMEOUT)
+        resp.raise_for_status()
+        data = resp.json()
+
+        for g in data.get("value", []):
+            groups.append({
+                "id": g.get("id"),
+                "displayName": g.get("displayName") or "",
+                "description": g.get("description") or "",
+            })
+
+        next_link = data.get("@odata.nextLink")
+        if not next_link:
+            break
+
+        url = next_link
+        params = None
 
     return groups
\ No newline at end of file
@@ -21,6 +21,24 @@ from backend.utils.config import config
 GRAPH_BASE_URL = "https://graph.microsoft.com/v1.0"
 
 
+# Lesbare Typ-/Prioritäts-Bezeichnungen für die Benachrichtigungs-Mails.
+_MAIL_TYPE_LABELS = {
+    TicketType.hardware: "Hardware Bestellung",
+    TicketType.niederlassung_anmelden: "Onboarding Niederlassung",
+    TicketType.niederlassung_schliessen: "Offboarding Niederlassung",
+    TicketType.niederlassung_umzug: "Umzug Niederlassung",
+    TicketType.zugang_beantragen: "Onboarding Mitarbeiter:innen",
+    TicketType.zugang_sperren: "Offboarding Mitarbeiter:innen",
+}
+
+_MAIL_PRIORITY_LABELS = {
+    TicketPriority.low: "Niedrig",
+    TicketPriority.medium: "Mittel",
+    TicketPriority.high: "Hoch",
+    TicketPriority.critical: "Kritisch",
+}
+
+
 def _dev_prefix(subject: str) -> str:
     """Betreff in Nicht-Produktionsumgebungen mit [DEV] kennzeichnen."""
     env = (config.APP_ENV or "").strip()
@@ -334,26 +352,8 @@ def send_personalnummer_warning_mail(company_name: str, remaining: int, pnr_to:
 
 
 def send_newrequest_mail(to: str, prio: TicketPriority, titel: str, ttype: TicketType, ticketid):
-
-    ticket_type_labels = {
-        TicketType.hardware: "Hardware Bestellung",
-        TicketType.niederlassung_anmelden: "Onboarding Niederlassung",
-        TicketType.niederlassung_schliessen: "Offboarding Niederlassung",
-        TicketType.niederlassung_umzug: "Umzug Niederlassung",
-        TicketType.zugang_beantragen: "Onboarding Mitarbeiter:innen",
-        TicketType.zugang_sperren: "Offboarding Mitarbeiter:innen",
-    }
-
-    priority_labels = {
-        TicketPriority.low: "Niedrig",
-        TicketPriority.medium: "Mittel",
-        TicketPriority.high: "Hoch",
-        TicketPriority.critical: "Kritisch",
-    }
-
-    readable_type = ticket_type_labels.get(ttype, ttype.value)
-
-    readable_prio = priority_labels.get(prio, prio.value)
+    readable_type = _MAIL_TYPE_LABELS.get(ttype, ttype.value)
+    readable_prio = _MAIL_PRIORITY_LABELS.get(prio, prio.value)
 
     send_mail_app_only(
         sender_upn_or_id="alpharequest@alpha-it-innovations.org",
@@ -378,24 +378,8 @@ def send_newrequest_mail(to: str, prio: TicketPriority, titel: str, ttype: Ticke
     )
 
 def send_mail_to_fachabteilung(to: str, prio: TicketPriority, titel: str, ttype: TicketType, ticketid):
-    ticket_type_labels = {
-        TicketType.hardware: "Hardware Bestellung",
-        TicketType.niederlassung_anmelden: "Onboarding Niederlassung",
-        TicketType.niederlassung_schliessen: "Offboarding Niederlassung",
-        TicketType.niederlassung_umzug: "Umzug Niederlassung",
-        TicketType.zugang_beantragen: "Onboarding Mitarbeiter:innen",
-        TicketType.zugang_sperren: "Offboarding Mitarbeiter:innen",
-    }
-
-    priority_labels = {
-        TicketPriority.low: "Niedrig",
-        TicketPriority.medium: "Mittel",
-        TicketPriority.high: "Hoch",
-        TicketPriority.critical: "Kritisch",
-    }
-
-    readable_type = ticket_type_labels.get(ttype, ttype.value)
-    readable_prio = priority_labels.get(prio, prio.value)
+    readable_type = _MAIL_TYPE_LABELS.get(ttype, ttype.value)
+    readable_prio = _MAIL_PRIORITY_LABELS.get(prio, prio.value)
     send_mail_app_only(
         sender_upn_or_id="alpharequest@alpha-it-innovations.org",
         subject=f"Neuer Fachabteilungsauftrag #{ticketid} in AlphaRequest",
@@ -469,9 +453,7 @@ def send_mail_to_all_fachabteilung(departments: dict, ticket: Ticket):
         )
 
 
-def _freigabe_buttons_html(approve_url: str, reject_url: str) -> str:
-    """Zwei E-Mail-sichere Aktions-Buttons (grün Freigeben / rot Ablehnen)."""
-    return f"""
+_FREIGABE_BUTTONS_HTML = """
     <table role="presentation" cellpadding="0" cellspacing="0" style="margin-top:14px;">
       <tr>
         <td style="padding-right:12px;">
@@ -495,6 +477,11 @@ def _freigabe_buttons_html(approve_url: str, reject_url: str) -> str:
     """
 
 
+def _freigabe_buttons_html(approve_url: str, reject_url: str) -> str:
+    """Zwei E-Mail-sichere Aktions-Buttons (grün Freigeben / rot Ablehnen)."""
+    return _FREIGABE_BUTTONS_HTML.format(approve_url=approve_url, reject_url=reject_url)
+
+
 def send_freigabe_mail(ticket, approve_url: str, reject_url: str, to_recipients: List[str]):
     """
     Freigabe-Mail an die Verteiler der Gruppe FreigabeHerrLutz: Auftragsübersicht
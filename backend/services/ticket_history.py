@@ -1,26 +1,20 @@
-import json
 from datetime import datetime
 from zoneinfo import ZoneInfo
 
-from backend.database.tickets import get_ticket, update_ticket
-from backend.database.audit_log import record_audit
+from backend.database.connection import transaction
+from backend.database.tickets import append_history, get_ticket, update_ticket
+from backend.database.audit_log import record_audits
 
 
-def add_history_event(
-    ticket_id: int,
+def history_event(
     *,
     actor_id: str | None,
     actor_name: str,
     actor_type: str = "user",  # "user" | "system"
     action: str,
     details: dict | None = None,
-) -> None:
-    ticket = get_ticket(ticket_id)
-    if not ticket:
-        return
-
-    history = ticket.history_parsed
-    history.append({
+) -> dict:
+    return {
         "timestamp": datetime.now(ZoneInfo("Europe/Berlin")).isoformat(),
         "actor": {
             "id": actor_id,
@@ -29,24 +23,79 @@ def add_history_event(
         },
         "action": action,
         "details": details or {},
-    })
+    }
+
+
+def add_history_events(ticket_id: int, events: list[dict]) -> None:
+    """Schreibt mehrere Events (aus history_event) in einem Rutsch: ein Update
+    der History-Spalte + ein mehrzeiliger Audit-Insert."""
+    if not events:
+        return
+    title = append_history(ticket_id, events)
+    if title is None:
+        return
+    record_history_audit(ticket_id, title, events)
 
-    update_ticket(
-        ticket_id=ticket_id,
-        history=json.dumps(history, ensure_ascii=False),
-    )
 
-    # Jedes Ticket-Ereignis zusätzlich persistent auditieren (überlebt Löschung).
-    record_audit(
+def record_history_audit(ticket_id: int, title: str, events: list[dict]) -> None:
+    """Jedes Ticket-Ereignis zusätzlich persistent auditieren (überlebt Löschung)."""
+    record_audits([
+        dict(
+            action=e["action"],
+            actor_id=e["actor"]["id"],
+            actor_name=e["actor"]["name"],
+            actor_type=e["actor"]["type"],
+            entity_type="ticket",
+            entity_id=str(ticket_id),
+            summary=title,
+            details=e["details"],
+        )
+        for e in events
+    ])
+
+
+def add_history_event(
+    ticket_id: int,
+    *,
+    actor_id: str | None,
+    actor_name: str,
+    actor_type: str = "user",  # "user" | "system"
+    action: str,
+    details: dict | None = None,
+) -> None:
+    add_history_events(ticket_id, [history_event(
+        actor_id=actor_id,
+        actor_name=actor_name,
+        actor_type=actor_type,
         action=action,
+        details=details,
+    )])
+
+
+def update_ticket_with_event(
+    ticket_id: int,
+    updates: dict,
+    *,
+    actor_id: str | None,
+    actor_name: str,
+    actor_type: str = "user",  # "user" | "system"
+    action: str,
+    details: dict | None = None,
+) -> None:
+    """Feld-Update + History-Event in EINER Transaktion (ein Commit statt zwei);
+    der Audit folgt danach wie bei add_history_events."""
+    event = history_event(
         actor_id=actor_id,
         actor_name=actor_name,
         actor_type=actor_type,
-        entity_type="ticket",
-        entity_id=str(ticket_id),
-        summary=ticket.title,
-        details=details or {},
+        action=action,
+        details=details,
     )
+    with transaction() as conn:
+        update_ticket(ticket_id, conn=conn, **updates)
+        title = append_history(ticket_id, [event], conn=conn)
+    if title is not None:
+        record_history_audit(ticket_id, title, [event])
 
 
 def add_field_change_events(
@@ -57,23 +106,30 @@ def add_field_change_events(
     changes: dict,  # {"field": (old_value, new_value)}
 ) -> None:
     """Schreibt pro geändertem Feld ein eigenes History-Event."""
-    for field, (old_val, new_val) in changes.items():
-        add_history_event(
-            ticket_id,
+    add_history_events(ticket_id, [
+        history_event(
             actor_id=actor_id,
             actor_name=actor_name,
             action=f"{field}_changed",
             details={"field": field, "old_value": old_val, "new_value": new_val},
         )
+        for field, (old_val, new_val) in changes.items()
+    ])
 
 
-def get_ticket_history(ticket_id: int) -> list[dict]:
-    ticket = get_ticket(ticket_id)
-    if not ticket:
-        return []
+def _event_timestamp(event: dict) -> str:
+    return event.get("timestamp", "")
 
-    history = ticket.history_parsed
+
+def sorted_history(history) -> list[dict]:
+    """History-Events chronologisch (für bereits geladene Tickets – kein DB-Zugriff)."""
     if not isinstance(history, list):
         return []
+    return sorted(history, key=_event_timestamp)
+
 
-    return sorted(history, key=lambda x: x.get("timestamp", ""))
\ No newline at end of file
+def get_ticket_history(ticket_id: int) -> list[dict]:
+    ticket = get_ticket(ticket_id)
+    if not ticket:
+        return []
+    return sorted_history(ticket.history_parsed)
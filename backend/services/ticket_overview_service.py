@@ -48,10 +48,11 @@ def get_overview_groups() -> List[str]:
     return _sanitize_groups(raw)
 
 
-def save_overview_groups(groups: Iterable[str]) -> None:
+def save_overview_groups(groups: Iterable[str]) -> List[str]:
     """
     Speichert die Liste bereinigt & eindeutig.
     Acceptet Iterable, damit du auch Sets/Tuples übergeben kannst.
+    Returns: die gespeicherte Liste (kein erneutes Lesen nötig).
     """
     if groups is None:
         raise TypeError("groups must not be None")
@@ -59,6 +60,7 @@ def save_overview_groups(groups: Iterable[str]) -> None:
     # Wir bereinigen hier bewusst nochmal, damit auch direkte Aufrufer safe sind.
     cleaned = _sanitize_groups(list(groups))
     settings_set(_SETTINGS_KEY, cleaned)
+    return cleaned
 
 
 def add_overview_groups_member(member_id: str) -> bool:
@@ -88,8 +90,7 @@ def remove_overview_groups_member(member_id: str) -> bool:
     if mid not in groups:
         return False
 
-    groups = [g for g in groups if g != mid]
-    save_overview_groups(groups)
+    save_overview_groups(g for g in groups if g != mid)
     return True
 
 
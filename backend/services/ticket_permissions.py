@@ -31,6 +31,19 @@ VALID_TICKET_TYPES: frozenset[str] = frozenset(t.value for t in TicketType)
 EVERYONE: str = "__everyone__"
 
 
+# Prozess-Cache der Gruppen-Permissions (Tickettyp → Gruppen-IDs). Wird bei jeder
+# can-create-Prüfung gebraucht (Dashboard: einmal pro Tickettyp) und ändert sich
+# nur über set_group_ticket_permissions – dort wird er verworfen.
+# Snapshot (Listen, frozensets, "Jeder"-Typen) als EIN Tupel: beim Laden werden
+# dieselben Daten als frozensets (O(1)-Schnittmengen) und die Typen, die "Jeder"
+# erstellen darf (Kurzschluss ohne weitere Prüfung), mitberechnet.
+_GroupPermsSnapshot = tuple[dict[str, list[str]], dict[str, frozenset[str]], frozenset[str]]
+_group_perms_snapshot: _GroupPermsSnapshot | None = None
+# Wird bei jedem Speichern hochgezählt; ein Laden, das davor begonnen hat,
+# veröffentlicht sein (evtl. veraltetes) Ergebnis nicht.
+_group_perms_generation = 0
+
+
 def _perm(ticket_type: str) -> str:
     return f"create_{ticket_type}"
 
@@ -81,20 +94,21 @@ def can_user_create_ticket(
     if not ticket_type or not user_id:
         return False
 
-    group_perms = load_group_ticket_permissions()
-    allowed_groups = set(group_perms.get(ticket_type, []))
+    _, group_perm_sets, everyone_types = _group_perms_index()
 
     # 0. "Jeder": jeder eingeloggte Nutzer darf diesen Typ erstellen.
     #    Bewusst vor dem get_user-Check, damit auch ein gerade erst eingeloggter
     #    (noch nicht in der DB angelegter) Nutzer erstellen darf.
-    if EVERYONE in allowed_groups:
+    if ticket_type in everyone_types:
         return True
 
+    allowed_groups = group_perm_sets.get(ticket_type, frozenset())
+
     # 3. Fachabteilungs-Mitgliedschaft (interne Gruppen) – funktioniert auch
     #    ohne DB-User-Eintrag.
     if allowed_groups:
         from backend.database.groups import get_group_ids_for_user
-        if allowed_groups & set(get_group_ids_for_user(user_id)):
+        if not allowed_groups.isdisjoint(get_group_ids_for_user(user_id)):
             return True
 
     user = get_user(user_id)
@@ -106,7 +120,7 @@ def can_user_create_ticket(
         return True
 
     # 2. AD-Gruppen-Permission
-    if user_group_ids and (allowed_groups & set(user_group_ids)):
+    if user_group_ids and not allowed_groups.isdisjoint(user_group_ids):
         return True
 
     return False
@@ -115,43 +129,41 @@ def can_user_create_ticket(
 def get_allowed_ticket_types_for_user(
     user_id: str,
     user_group_ids: list[str] | None = None,
+    *,
+    db_user=None,
 ) -> list[str]:
-    """Gibt alle Tickettypen zurück die der User erstellen darf (direkt oder via Gruppe)."""
+    """Gibt alle Tickettypen zurück die der User erstellen darf (direkt oder via Gruppe).
+    db_user: bereits geladener DB-User (spart den erneuten Lookup)."""
     if not user_id:
         return []
 
-    valid = {t.value for t in TicketType}
-    allowed = set()
-
-    group_perms = load_group_ticket_permissions()
+    _, group_perm_sets, everyone_types = _group_perms_index()
 
     # "Jeder"-Typen: für jeden eingeloggten Nutzer erlaubt
-    for ticket_type, group_ids in group_perms.items():
-        if ticket_type in valid and EVERYONE in group_ids:
-            allowed.add(ticket_type)
+    allowed = set(everyone_types)
 
     # Fachabteilungs-Mitgliedschaften (interne Gruppen) des Users
     from backend.database.groups import get_group_ids_for_user
     fach_ids = set(get_group_ids_for_user(user_id))
     if fach_ids:
-        for ticket_type, group_ids in group_perms.items():
-            if ticket_type in valid and fach_ids & set(group_ids):
+        for ticket_type, group_ids in group_perm_sets.items():
+            if ticket_type in VALID_TICKET_TYPES and not fach_ids.isdisjoint(group_ids):
                 allowed.add(ticket_type)
 
-    user = get_user(user_id)
+    user = db_user if db_user is not None else get_user(user_id)
     if not user:
         return sorted(allowed)
 
     # Direkte Permissions
     for perm in user.extra_permissions:
-        if perm.startswith("create_") and perm[len("create_"):] in valid:
+        if perm.startswith("create_") and perm[len("create_"):] in VALID_TICKET_TYPES:
             allowed.add(perm[len("create_"):])
 
     # Gruppen-Permissions
     if user_group_ids:
         user_groups_set = set(user_group_ids)
-        for ticket_type, group_ids in group_perms.items():
-            if ticket_type in valid and user_groups_set & set(group_ids):
+        for ticket_type, group_ids in group_perm_sets.items():
+            if ticket_type in VALID_TICKET_TYPES and not user_groups_set.isdisjoint(group_ids):
                 allowed.add(ticket_type)
 
     return sorted(allowed)
@@ -171,26 +183,24 @@ def remove_user_ticket_permission(ticket_type: str, user_id: str) -> None:
 
 def set_ticket_permissions_safe(
     payload: dict[str, list[str]],
-    user_cache: list[dict] | None = None,
+    user_index: dict[str, dict] | None = None,
 ) -> None:
     """
     Ersetzt für jeden übergebenen TicketType die erlaubten User komplett.
     Andere extra_permissions der User (z.B. "manage") bleiben unberührt.
 
-    user_cache: app.state.user_cache – wird benötigt um User die noch nie
-    eingeloggt waren automatisch in der DB anzulegen.
+    user_index: app.state.user_index (id → AD-User) – wird benötigt um User die
+    noch nie eingeloggt waren automatisch in der DB anzulegen.
     """
-    valid_types = {t.value for t in TicketType}
     all_users   = {u.microsoft_id: u for u in list_users()}
 
     # Unbekannte User-IDs aus dem Cache anlegen (noch nie eingeloggt)
-    if user_cache:
-        cache_by_id  = {u["id"]: u for u in user_cache}
+    if user_index:
         all_user_ids = {uid for user_ids in payload.values() for uid in user_ids}
 
         for user_id in all_user_ids:
-            if user_id not in all_users and user_id in cache_by_id:
-                u = cache_by_id[user_id]
+            if user_id not in all_users and user_id in user_index:
+                u = user_index[user_id]
                 upsert_user(
                     microsoft_id=user_id,
                     display_name=u.get("displayName", ""),
@@ -202,7 +212,7 @@ def set_ticket_permissions_safe(
     target: dict[str, set[str]] = {uid: set() for uid in all_users}
 
     for ticket_type, user_ids in payload.items():
-        if ticket_type not in valid_types:
+        if ticket_type not in VALID_TICKET_TYPES:
             continue
         perm = _perm(ticket_type)
         for user_id in user_ids:
@@ -222,18 +232,32 @@ def set_ticket_permissions_safe(
 
 # ── Group Permissions (AD-Gruppen → Ticket-Typen) ────────────────────────────
 
-def load_group_ticket_permissions() -> dict[str, list[str]]:
-    """
-    Gibt für jeden TicketType die Liste der erlaubten AD-Gruppen-IDs zurück.
-    { "zugang-beantragen": ["ad-group-id-1", ...], ... }
-    """
+def _group_perms_index() -> _GroupPermsSnapshot:
+    """Gruppen-Permissions aus dem Prozess-Cache (nur lesend verwenden)."""
+    global _group_perms_snapshot
+    snapshot = _group_perms_snapshot
+    if snapshot is not None:
+        return snapshot
+    generation = _group_perms_generation
     data = _load_group_perms_db()
     # Sicherstellen dass alle TicketTypes vorhanden sind
     result = {t.value: [] for t in TicketType}
     for k, v in data.items():
         if k in result:
             result[k] = v
-    return result
+    sets = {k: frozenset(v) for k, v in result.items()}
+    snapshot = (result, sets, frozenset(k for k, v in sets.items() if EVERYONE in v))
+    if generation == _group_perms_generation:
+        _group_perms_snapshot = snapshot
+    return snapshot
+
+
+def load_group_ticket_permissions() -> dict[str, list[str]]:
+    """
+    Gibt für jeden TicketType die Liste der erlaubten AD-Gruppen-IDs zurück.
+    { "zugang-beantragen": ["ad-group-id-1", ...], ... }
+    """
+    return {k: list(v) for k, v in _group_perms_index()[0].items()}
 
 
 def set_group_ticket_permissions(payload: dict[str, list[str]]) -> None:
@@ -241,10 +265,14 @@ def set_group_ticket_permissions(payload: dict[str, list[str]]) -> None:
     Setzt die Gruppen-Permissions für Ticket-Typen.
     payload: { "zugang-beantragen": ["ad-group-id-1", ...], ... }
     """
-    valid_types = {t.value for t in TicketType}
     cleaned = {
         k: list(set(v))
         for k, v in payload.items()
-        if k in valid_types and isinstance(v, list)
+        if k in VALID_TICKET_TYPES and isinstance(v, list)
     }
-    _set_group_perms_db(cleaned)
\ No newline at end of file
+    global _group_perms_snapshot, _group_perms_generation
+    try:
+        _set_group_perms_db(cleaned)
+    finally:
+        _group_perms_generation += 1
+        _group_perms_snapshot = None
\ No newline at end of file
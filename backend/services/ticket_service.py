@@ -1,5 +1,5 @@
 from __future__ import annotations
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Sequence
 
 from backend.utils.logger import logger
 from backend.models.models import Ticket, RequestStatus, TicketPriority, TicketType
@@ -19,6 +19,8 @@ class TicketService:
             owner_info: str,
             comment: str,
             priority: TicketPriority = TicketPriority.medium,
+            history: Sequence[Dict[str, Any]] = (),
+            watchers: Sequence[tuple] = (),
     ) -> int:
         # Zuständigkeit wird nicht mehr in assignee/accountable-Spalten geschrieben,
         # sondern als responsibility im workflow_state (siehe API-Layer).
@@ -32,6 +34,8 @@ class TicketService:
             comment=comment,
             status=RequestStatus.in_progress.value,
             priority=priority.value,
+            history=history,
+            watchers=watchers,
         )
         logger.info(f"Created ticket #{ticket_id}")
         return ticket_id
@@ -50,6 +54,15 @@ class TicketService:
     def count_all(self) -> int:
         return db.count_all_tickets()
 
+    def list_open(self) -> List[Ticket]:
+        """Nur aktive Tickets (in Bearbeitung / in Anfrage)."""
+        return db.list_all_tickets(
+            statuses=[RequestStatus.in_progress.value, RequestStatus.in_request.value],
+        )
+
+    def count_grouped(self) -> List[dict]:
+        return db.count_tickets_grouped()
+
     def list_by_owner(self, owner_id: str) -> List[Ticket]:
         return db.list_tickets_by_owner(owner_id)
 
@@ -149,8 +162,7 @@ class TicketService:
         if user.get("is_admin"):
             return True
 
-        owned = db.list_tickets_by_owner(user["id"])
-        return any(t.id == ticket_id for t in owned)
+        return db.ticket_owned_by(ticket_id, user["id"])
 
 
     def assign_to_user(self, ticket_id: int, user_id: str, user_name: str):
@@ -1,11 +1,13 @@
-import json
 from typing import Optional
 
 from backend.models.models import TicketType, RequestStatus, Ticket
+from backend.utils import json_codec
 from backend.services.phase_definitions import TICKET_PHASES, PhaseType
-from backend.database.tickets import update_ticket, get_ticket, list_all_tickets
+from backend.database.tickets import (
+    TICKET_SUMMARY_FIELDS, update_ticket, get_ticket, iter_all_tickets,
+)
 from backend.database.groups import (
-    get_users_from_group, get_groups, get_group_name_from_id, get_group_ids_for_user,
+    get_users_from_group, find_group_by_name, get_group_name_from_id, get_group_ids_for_user,
 )
 
 
@@ -37,7 +39,7 @@ PHASE_STATUS_DONE = "done"
 # ============================================================
 
 def set_workflow_state(ticket_id: int, workflow: dict) -> None:
-    update_ticket(ticket_id, workflow_state=json.dumps(workflow, ensure_ascii=False))
+    update_ticket(ticket_id, workflow_state=json_codec.dumps(workflow))
 
 
 def get_workflow_state(ticket_id: int) -> dict:
@@ -80,11 +82,10 @@ def _get_departments_from_workflow(workflow: dict) -> dict:
 # ============================================================
 
 def _build_departments_it_hr(description: dict) -> dict:
-    groups = {g["name"].lower(): g for g in get_groups()}
     departments = {}
 
     def add(name: str):
-        g = groups.get(name.lower())
+        g = find_group_by_name(name)
         if g:
             departments[g["id"]] = {"name": g["name"], "required": True, "status": DEPARTMENT_STATUS_OPEN}
 
@@ -97,11 +98,10 @@ def _build_departments_it_hr(description: dict) -> dict:
 
 
 def _build_departments_niederlassung_schliessen(description: dict) -> dict:
-    groups = {g["name"].lower(): g for g in get_groups()}
     departments = {}
 
     def add(name: str):
-        g = groups.get(name.lower())
+        g = find_group_by_name(name)
         if g:
             departments[g["id"]] = {"name": g["name"], "required": True, "status": DEPARTMENT_STATUS_OPEN}
 
@@ -114,11 +114,10 @@ def _build_departments_niederlassung_schliessen(description: dict) -> dict:
 
 
 def _build_departments_niederlassung_anmelden(description: dict) -> dict:
-    groups = {g["name"].lower(): g for g in get_groups()}
     departments = {}
 
     def add(name: str):
-        g = groups.get(name.lower())
+        g = find_group_by_name(name)
         if g:
             departments[g["id"]] = {"name": g["name"], "required": True, "status": DEPARTMENT_STATUS_OPEN}
 
@@ -133,8 +132,7 @@ def _build_departments_niederlassung_anmelden(description: dict) -> dict:
 
 def _build_departments_single(group_name: str):
     def builder(description: dict) -> dict:
-        groups = {g["name"].lower(): g for g in get_groups()}
-        g = groups.get(group_name.lower())
+        g = find_group_by_name(group_name)
         if not g:
             return {}
         return {g["id"]: {"name": g["name"], "required": True, "status": DEPARTMENT_STATUS_OPEN}}
@@ -261,10 +259,11 @@ def build_workflow(ticket: Ticket) -> dict:
     if not phase_defs:
         raise ValueError(f"No phase definition for ticket type {ticket.ticket_type}")
 
-    try:
-        description = json.loads(ticket.description)
-    except Exception:
-        raise ValueError("Ticket description is not valid JSON")
+    # Geparst über das Memo am Ticket – advance_phase & Co. nutzen dasselbe Objekt.
+    # (Gültiges JSON wird bereits beim Erstellen erzwungen.)
+    description = ticket.description_parsed
+    if not isinstance(description, dict):
+        raise ValueError("Ticket description is not a JSON object")
 
     phases = []
     for i, phase_def in enumerate(phase_defs):
@@ -284,8 +283,7 @@ def build_workflow(ticket: Ticket) -> dict:
             phase["responsibility"] = {"kind": "departments"}
         elif phase_def.assign_group:
             # assignment-Phase mit fester Gruppen-Zuweisung (Name → Gruppe auflösen)
-            groups = {g["name"].lower(): g for g in get_groups()}
-            g = groups.get(phase_def.assign_group.lower())
+            g = find_group_by_name(phase_def.assign_group)
             if g:
                 phase["responsibility"] = {"kind": "group", "id": g["id"], "name": g["name"]}
         # Sonstige assignment-Phasen: responsibility wird beim Aktivieren gesetzt
@@ -303,9 +301,15 @@ def build_workflow(ticket: Ticket) -> dict:
 # Phase transitions
 # ============================================================
 
-def advance_phase(ticket_id: int) -> dict:
-    """Completes the current phase and activates the next. Returns updated workflow."""
-    workflow = _require_workflow(ticket_id)
+def advance_phase(
+    ticket_id: int, workflow: Optional[dict] = None, *, ticket: Optional[Ticket] = None,
+) -> dict:
+    """Completes the current phase and activates the next. Returns updated workflow.
+    Ein bereits geladener Workflow bzw. ein aktuelles Ticket kann übergeben werden
+    (spart das erneute Lesen/Parsen); Workflow und Status werden in EINEM Update
+    geschrieben."""
+    if workflow is None:
+        workflow = _require_workflow(ticket_id)
     phases = workflow["phases"]
     idx = workflow["current_phase_index"]
 
@@ -314,8 +318,7 @@ def advance_phase(ticket_id: int) -> dict:
     next_idx = idx + 1
     if next_idx >= len(phases):
         workflow["current_phase_index"] = next_idx
-        set_workflow_state(ticket_id, workflow)
-        update_ticket(ticket_id, status=RequestStatus.archived.value)
+        _write_workflow_and_status(ticket_id, workflow, RequestStatus.archived)
         try:
             from backend.metrics.ticket_metrics import record_ticket_terminal
             record_ticket_terminal("archived")
@@ -332,22 +335,27 @@ def advance_phase(ticket_id: int) -> dict:
         # AKTUELLEN description bauen (z.B. Fuhrpark nur wenn Dienstwagen = Ja).
         # Beim Onboarding stehen die relevanten Felder zur Erstellungszeit noch
         # nicht fest – sie werden erst in BackOffice/Bearbeitung gefüllt.
-        ticket = get_ticket(ticket_id)
+        if ticket is None:
+            ticket = get_ticket(ticket_id)
         builder = DEPARTMENT_BUILDERS.get(ticket.ticket_type) if ticket else None
         if builder:
-            try:
-                desc = json.loads(ticket.description)
-            except Exception:
-                desc = {}
-            phases[next_idx]["departments"] = builder(desc)
-        update_ticket(ticket_id, status=RequestStatus.in_request.value)
+            phases[next_idx]["departments"] = builder(ticket.description_parsed)
+        status = RequestStatus.in_request
     else:
-        update_ticket(ticket_id, status=RequestStatus.in_progress.value)
+        status = RequestStatus.in_progress
 
-    set_workflow_state(ticket_id, workflow)
+    _write_workflow_and_status(ticket_id, workflow, status)
     return workflow
 
 
+def _write_workflow_and_status(ticket_id: int, workflow: dict, status: RequestStatus) -> None:
+    update_ticket(
+        ticket_id,
+        workflow_state=json_codec.dumps(workflow),
+        status=status.value,
+    )
+
+
 def reject_workflow(ticket_id: int, message: str, rejected_by: str, rejected_at: str) -> None:
     """Marks the ticket as rejected with a message. Can be called from any active phase."""
     workflow = _require_workflow(ticket_id)
@@ -364,8 +372,7 @@ def reject_workflow(ticket_id: int, message: str, rejected_by: str, rejected_at:
         "rejected_at": rejected_at,
     }
 
-    set_workflow_state(ticket_id, workflow)
-    update_ticket(ticket_id, status=RequestStatus.rejected.value)
+    _write_workflow_and_status(ticket_id, workflow, RequestStatus.rejected)
     try:
         from backend.metrics.ticket_metrics import record_ticket_terminal
         record_ticket_terminal("rejected")
@@ -480,7 +487,7 @@ def backfill_phase_responsibility() -> None:
     Danach ist die Zuständigkeit vollständig im workflow_state und die Spalten
     werden nicht mehr gelesen.
     """
-    for ticket in list_all_tickets():
+    for ticket in iter_all_tickets():
         workflow = ticket.workflow_state_parsed
         if not _is_new_format(workflow):
             continue
@@ -525,7 +532,9 @@ def user_is_responsible(ticket, user_id: str, user_group_ids=None) -> bool:
 # Department handling
 # ============================================================
 
-def set_department_status(ticket_id: int, group_id: str, status: str) -> None:
+def set_department_status(ticket_id: int, group_id: str, status: str) -> dict:
+    """Setzt den Status einer Fachabteilung und liefert den aktualisierten
+    Workflow (für all_required_departments_done/advance_phase ohne erneutes Lesen)."""
     if status not in ALLOWED_DEPARTMENT_STATUS:
         raise ValueError(f"Invalid department status '{status}'")
 
@@ -537,6 +546,12 @@ def set_department_status(ticket_id: int, group_id: str, status: str) -> None:
 
     departments[group_id]["status"] = status
     set_workflow_state(ticket_id, workflow)
+    return workflow
+
+
+def department_entry(workflow: dict, group_id: str) -> dict:
+    """Workflow-Eintrag einer Fachabteilung (name/required/status) oder {}."""
+    return _get_departments_from_workflow(workflow).get(group_id, {})
 
 
 def get_department_status(ticket_id: int, group_id: str) -> Optional[str]:
@@ -554,9 +569,10 @@ def get_all_department_statuses(ticket_id: int) -> dict:
     return _get_departments_from_workflow(workflow)
 
 
-def all_required_departments_done(ticket_id: int) -> bool:
+def all_required_departments_done(ticket_id: int, workflow: Optional[dict] = None) -> bool:
     """Returns True if all required departments in the current dept phase are done."""
-    workflow = get_workflow_state(ticket_id)
+    if workflow is None:
+        workflow = get_workflow_state(ticket_id)
     for dept in _get_departments_from_workflow(workflow).values():
         if dept.get("required") and dept.get("status") != DEPARTMENT_STATUS_DONE:
             return False
@@ -634,12 +650,10 @@ def user_can_complete_department(ticket_id: int, user_id: str, group_id: str) ->
 # ============================================================
 
 def get_tickets_for_department(group_id: str) -> list[Ticket]:
-    tickets = list_all_tickets()
+    tickets = iter_all_tickets(statuses=[RequestStatus.in_request.value])
     result = []
 
     for ticket in tickets:
-        if ticket.status != RequestStatus.in_request:
-            continue
         departments = _get_departments_from_workflow(ticket.workflow_state_parsed)
         dept = departments.get(group_id)
         if dept and dept.get("required") and dept.get("status") != DEPARTMENT_STATUS_DONE:
@@ -716,10 +730,9 @@ def get_dashboard_work(user_id: str) -> dict:
             }
         return boards[gid]
 
-    for ticket in list_all_tickets():
-        if ticket.status in (RequestStatus.archived, RequestStatus.rejected):
-            continue
-
+    # Abgeschlossene (archiviert/abgelehnt) Tickets gar nicht erst laden.
+    open_statuses = [RequestStatus.in_progress.value, RequestStatus.in_request.value]
+    for ticket in iter_all_tickets(statuses=open_statuses, fields=TICKET_SUMMARY_FIELDS):
         phase = _current_phase_of(ticket.workflow_state_parsed)
         if not phase:
             continue
@@ -816,16 +829,17 @@ def get_involved_tickets(user_id: str, since_days: int | None = 14) -> list[dict
         since = cutoff.isoformat()
 
     items: list[dict] = []
-    for ticket in list_all_tickets(since=since):
+    # Kopfdaten + Workflow + History (für „bearbeiter“) – ohne description & Co.
+    for ticket in iter_all_tickets(since=since, fields=f"{TICKET_SUMMARY_FIELDS}, history"):
         roles = involvement_roles(ticket, user_id, group_ids, watched_ids)
         if not roles:
             continue
         items.append({
             "id": ticket.id,
             "title": ticket.title,
-            "type_key": ticket.ticket_type.value if hasattr(ticket.ticket_type, "value") else ticket.ticket_type,
-            "status": ticket.status.value if hasattr(ticket.status, "value") else ticket.status,
-            "priority": ticket.priority.value if hasattr(ticket.priority, "value") else ticket.priority,
+            "type_key": ticket.ticket_type.value,
+            "status": ticket.status.value,
+            "priority": ticket.priority.value,
             "created_at": ticket.created_at.isoformat() if ticket.created_at else None,
             "roles": roles,
         })
@@ -0,0 +1,11 @@
+"""record_audits darf den Aufrufer nie abbrechen (DB-Zugriff gepatcht)."""
+
+from backend.database import audit_log
+
+
+def test_fehlerhafte_eintraege_werden_nur_geloggt(monkeypatch):
+    calls = []
+    monkeypatch.setattr(audit_log, "get_connection", lambda: calls.append(1))
+    audit_log.record_audits([dict(action="x", details={"obj": object()})])
+    audit_log.record_audits([dict(action="x", unbekannt=1)])
+    assert calls == []
@@ -0,0 +1,24 @@
+"""get_current_user löst den User pro Request nur einmal auf (ohne DB)."""
+
+from starlette.requests import Request
+
+from backend.core.dependencies import get_current_user
+
+
+def test_bereits_aufgeloester_user_wird_wiederverwendet():
+    user = {"id": "u1", "displayName": "User", "permissions": []}
+    # Kein "session"-Eintrag im Scope: würde get_current_user die Session
+    # anfassen, schlüge der Zugriff fehl.
+    request = Request({"type": "http", "headers": [], "state": {"user": user}})
+    assert get_current_user(request) is user
+
+
+def test_is_admin_wird_einmal_aus_permissions_abgeleitet(monkeypatch):
+    from backend.core import dependencies
+    monkeypatch.setattr(dependencies, "get_user_permissions", lambda uid: ["view", "admin"])
+    user = {"id": "u1"}
+    dependencies._attach_permissions(user)
+    assert user["is_admin"] is True and user["permissions"] == ["view", "admin"]
+    monkeypatch.setattr(dependencies, "get_user_permissions", lambda uid: ["view"])
+    dependencies._attach_permissions(user)
+    assert user["is_admin"] is False
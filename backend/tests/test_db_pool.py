@@ -0,0 +1,97 @@
+"""Connection-Pool in database.connection (ohne echte DB – Fake-Verbindungen)."""
+
+import pytest
+
+from backend.database import connection
+
+
+class FakeConn:
+    def __init__(self):
+        self.alive = True
+        self.closed = False
+        self.rollbacks = 0
+        self.pings = 0
+
+    def ping(self, reconnect=False):
+        self.pings += 1
+        if not self.alive:
+            raise ConnectionError("gone")
+
+    def rollback(self):
+        self.rollbacks += 1
+
+    def commit(self):
+        pass
+
+    def close(self):
+        self.closed = True
+
+    def cursor(self):
+        raise NotImplementedError
+
+
+@pytest.fixture
+def created(monkeypatch):
+    conns = []
+
+    def fake_connect():
+        conns.append(FakeConn())
+        return conns[-1]
+
+    monkeypatch.setattr(connection, "_connect", fake_connect)
+    monkeypatch.setattr(connection, "_pool", None)
+    yield conns
+    connection.dispose_pool()
+
+
+def test_close_gibt_verbindung_an_den_pool_zurueck(created):
+    conn = connection.get_connection()
+    conn.close()
+    conn = connection.get_connection()
+    conn.close()
+    assert len(created) == 1
+    # Rückgabe rollt offene Transaktionen zurück
+    assert created[0].rollbacks >= 2
+
+
+def test_tote_verbindung_wird_ersetzt(created, monkeypatch):
+    monkeypatch.setattr(connection, "PING_IDLE_SECONDS", 0)
+    connection.get_connection().close()
+    created[0].alive = False
+    conn = connection.get_connection()
+    conn.close()
+    assert len(created) == 2
+    assert created[0].closed
+
+
+def test_frisch_zurueckgegebene_verbindung_ohne_ping(created):
+    connection.get_connection().close()
+    pings = created[0].pings
+    connection.get_connection().close()
+    assert created[0].pings == pings
+
+
+class _TxConn(FakeConn):
+    def __init__(self):
+        super().__init__()
+        self.commits = 0
+
+    def commit(self):
+        self.commits += 1
+
+
+def test_transaction_committet_einmal_und_rollt_bei_fehler_zurueck(monkeypatch):
+    conns = []
+    monkeypatch.setattr(connection, "get_connection", lambda: conns.append(_TxConn()) or conns[-1])
+
+    with connection.transaction() as conn:
+        with connection.transaction(conn) as inner:
+            assert inner is conn
+        assert conn.commits == 0
+    assert (conns[0].commits, conns[0].rollbacks, conns[0].closed) == (1, 0, True)
+
+    with pytest.raises(RuntimeError):
+        with connection.transaction():
+            raise RuntimeError("kaputt")
+    assert (conns[1].commits, conns[1].rollbacks, conns[1].closed) == (0, 1, True)
+    assert len(conns) == 2
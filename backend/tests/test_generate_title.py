@@ -0,0 +1,28 @@
+"""Unit-Tests für generate_title (Titel-Builder je Tickettyp, ohne DB)."""
+
+from backend.api.v1 import tickets
+from backend.models.models import TicketType
+from backend.utils.ticket_labels import TICKET_LABELS
+
+USER = {"displayName": "Erika Muster"}
+
+
+def _label(ticket_type, desc) -> str:
+    # Zeitstempel-Suffix („ – YYYY-MM-DD HH:MM“) abschneiden.
+    return tickets.generate_title(ticket_type, USER, desc).rsplit(" – ", 1)[0]
+
+
+def test_person_titel():
+    desc = {"personal": {"first_name": "Max", "last_name": "Mustermann"}}
+    assert _label(TicketType.zugang_sperren, desc) == "Offboarding Mitarbeiter:innen – Max Mustermann"
+
+
+def test_basis_ticket_mit_und_ohne_betreff():
+    assert _label(TicketType.basis_ticket, '{"ticket": {"betreff": " Drucker "}}') == "Basis-Ticket – Drucker"
+    assert _label(TicketType.basis_ticket, {}) == "Basis-Ticket – Erika Muster"
+
+
+def test_stellenanzeige_und_fallback():
+    desc = {"stelle": {"gesellschaft": "AC", "niederlassung": "Köln", "berufsbezeichnung": "Dev"}}
+    assert _label(TicketType.marketing_stellenanzeige, desc) == "AC_Köln_Dev"
+    assert _label(TicketType.hardware, {}) == TICKET_LABELS.get(TicketType.hardware, "hardware")
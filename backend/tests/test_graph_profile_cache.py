@@ -0,0 +1,54 @@
+"""Unit-Tests für den TTL-Cache der Graph-Profile (ohne Netzwerk)."""
+
+import asyncio
+
+from backend.services import microsoft_graph as graph
+
+
+def _run(coro):
+    return asyncio.run(coro)
+
+
+def test_zweiter_login_nutzt_cache(monkeypatch):
+    calls = []
+
+    async def fake_profile(token):
+        calls.append(token)
+        return {"company": "Alpha"}
+
+    monkeypatch.setattr(graph, "get_user_profile", fake_profile)
+    monkeypatch.setattr(graph, "_profile_cache", {})
+
+    assert _run(graph.get_user_profile_cached("t1", "u1")) == {"company": "Alpha"}
+    assert _run(graph.get_user_profile_cached("t2", "u1")) == {"company": "Alpha"}
+    assert calls == ["t1"]
+
+
+def test_abgelaufener_eintrag_wird_neu_geholt(monkeypatch):
+    calls = []
+
+    async def fake_profile(token):
+        calls.append(token)
+        return {}
+
+    monkeypatch.setattr(graph, "get_user_profile", fake_profile)
+    monkeypatch.setattr(graph, "_profile_cache", {})
+    monkeypatch.setattr(graph, "PROFILE_CACHE_TTL", -1)
+
+    _run(graph.get_user_profile_cached("t1", "u1"))
+    _run(graph.get_user_profile_cached("t2", "u1"))
+    assert calls == ["t1", "t2"]
+
+
+def test_cache_bleibt_begrenzt(monkeypatch):
+    async def fake_profile(token):
+        return {}
+
+    monkeypatch.setattr(graph, "get_user_profile", fake_profile)
+    monkeypatch.setattr(graph, "_profile_cache", {})
+    monkeypatch.setattr(graph, "PROFILE_CACHE_MAX", 3)
+
+    for i in range(10):
+        _run(graph.get_user_profile_cached("t", f"u{i}"))
+    assert len(graph._profile_cache) <= 3
+    assert "u9" in graph._profile_cache
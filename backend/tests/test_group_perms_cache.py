@@ -0,0 +1,47 @@
+"""Prozess-Cache der Gruppen-Permissions (DB-Zugriff gepatcht)."""
+
+import pytest
+
+from backend.services import ticket_permissions as perms
+
+
+@pytest.fixture
+def db(monkeypatch):
+    rows = {"hardware": ["g1"]}
+    loads = []
+
+    def fake_load():
+        loads.append(1)
+        return {k: list(v) for k, v in rows.items()}
+
+    def fake_set(payload):
+        rows.clear()
+        rows.update(payload)
+
+    monkeypatch.setattr(perms, "_load_group_perms_db", fake_load)
+    monkeypatch.setattr(perms, "_set_group_perms_db", fake_set)
+    monkeypatch.setattr(perms, "_group_perms_snapshot", None)
+    yield rows, loads
+    perms._group_perms_snapshot = None
+
+
+def test_nur_ein_laden(db):
+    _, loads = db
+    perms.load_group_ticket_permissions()
+    perms.load_group_ticket_permissions()
+    assert len(loads) == 1
+
+
+def test_speichern_waehrend_des_ladens_veroeffentlicht_nichts(db, monkeypatch):
+    rows, _ = db
+    orig = perms._load_group_perms_db
+
+    def racing_load():
+        data = orig()
+        perms.set_group_ticket_permissions({"hardware": [perms.EVERYONE]})
+        return data
+
+    monkeypatch.setattr(perms, "_load_group_perms_db", racing_load)
+    assert perms.load_group_ticket_permissions()["hardware"] == ["g1"]
+    monkeypatch.setattr(perms, "_load_group_perms_db", orig)
+    assert perms.load_group_ticket_permissions()["hardware"] == [perms.EVERYONE]
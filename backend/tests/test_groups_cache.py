@@ -0,0 +1,69 @@
+"""Unit-Tests für den Prozess-Cache der Fachabteilungen (Settings-Zugriff gepatcht)."""
+
+import pytest
+
+from backend.database import groups as groups_db
+
+
+@pytest.fixture
+def store(monkeypatch):
+    data = {"TICKET_GROUPS": [{"id": "g1", "name": "IT", "members": ["u1"]}]}
+    reads = []
+
+    def fake_get(key, default=None):
+        reads.append(key)
+        return data.get(key, default)
+
+    def fake_set(key, value):
+        data[key] = value
+
+    monkeypatch.setattr(groups_db, "settings_get", fake_get)
+    monkeypatch.setattr(groups_db, "settings_set", fake_set)
+    groups_db.invalidate_groups_cache()
+    yield reads
+    groups_db.invalidate_groups_cache()
+
+
+def test_nur_ein_lesezugriff(store):
+    groups_db.get_groups()
+    groups_db.get_users_from_group("g1")
+    groups_db.get_group_name_from_id("g1")
+    assert store == ["TICKET_GROUPS"]
+
+
+def test_kopie_schuetzt_den_cache(store):
+    groups = groups_db.get_groups()
+    groups[0]["members"].append("u2")
+    assert groups_db.get_users_from_group("g1") == ["u1"]
+    assert groups[0]["distributions"] == [] and groups[0]["hidden"] is False
+
+
+def test_speichern_invalidiert_und_zaehlt_version(store):
+    before = groups_db.groups_version()
+    groups = groups_db.get_groups()
+    groups[0]["name"] = "EDV"
+    groups_db.save_groups(groups)
+    assert groups_db.groups_version() == before + 1
+    assert groups_db.get_group_name_from_id("g1") == "EDV"
+    assert groups_db.get_group_name_from_id("fehlt") is None
+
+
+def test_namenssuche_ohne_gross_kleinschreibung(store):
+    assert groups_db.group_name_exists("it")
+    assert groups_db.find_group_by_name(" It ")["id"] == "g1"
+    assert groups_db.find_group_by_name("HR") is None
+    assert not groups_db.group_name_exists("")
+
+
+def test_speichern_waehrend_des_ladens_veroeffentlicht_nichts(store, monkeypatch):
+    orig = groups_db.settings_get
+
+    def racing_get(key, default=None):
+        value = orig(key, default)
+        groups_db.save_groups([{"id": "g1", "name": "NEU", "members": []}])
+        return value
+
+    monkeypatch.setattr(groups_db, "settings_get", racing_get)
+    assert groups_db.get_group_name_from_id("g1") == "IT"   # alter Stand nur für diesen Aufruf
+    monkeypatch.setattr(groups_db, "settings_get", orig)
+    assert groups_db.get_group_name_from_id("g1") == "NEU"
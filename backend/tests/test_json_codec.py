@@ -0,0 +1,28 @@
+"""Unit-Tests für den orjson-basierten JSON-Codec (ohne DB)."""
+
+import json
+
+import pytest
+
+from backend.utils import json_codec
+
+
+def test_umlaute_bleiben_erhalten():
+    s = json_codec.dumps({"name": "Müller"})
+    assert "Müller" in s
+    assert isinstance(s, str)
+
+
+def test_roundtrip_wie_stdlib():
+    obj = {"a": [1, 2.5, None, True], "b": {"c": "ß"}}
+    assert json_codec.loads(json_codec.dumps(obj)) == obj
+    assert json_codec.loads(json.dumps(obj)) == obj
+
+
+def test_nicht_string_keys():
+    assert json_codec.loads(json_codec.dumps({1: "x"})) == {"1": "x"}
+
+
+def test_ungueltiges_json_wirft_valueerror():
+    with pytest.raises(ValueError):
+        json_codec.loads("{kaputt")
@@ -0,0 +1,57 @@
+"""Unit-Tests für den serverseitig abgelegten Session-User (ohne DB)."""
+
+import pytest
+
+from backend.core import session as session_mod
+from backend.core.session import get_user_from_session, store_user_in_session
+
+
+@pytest.fixture
+def store(monkeypatch):
+    s = session_mod.TokenStore()
+    monkeypatch.setattr(session_mod, "TOKENS", s)
+    return s
+
+
+def _user() -> dict:
+    return {"id": "u1", "displayName": "Max Müller", "groups": ["g"] * 200}
+
+
+def test_cookie_traegt_nur_die_sid(store):
+    session = {}
+    store_user_in_session(session, _user())
+    assert list(session) == ["sid"]
+    assert get_user_from_session(session) == _user()
+
+
+def test_kopie_schuetzt_den_store(store):
+    session = {}
+    store_user_in_session(session, _user())
+    get_user_from_session(session)["permissions"] = ["x"]
+    assert "permissions" not in get_user_from_session(session)
+
+
+def test_tokens_und_user_teilen_einen_eintrag(store):
+    session = {"sid": "s1"}
+    store.put("s1", {"access_token": "a"})
+    store_user_in_session(session, _user())
+    store.put("s1", {"access_token": "b"})
+    assert store.get("s1")["access_token"] == "b"
+    assert get_user_from_session(session)["id"] == "u1"
+
+
+def test_ohne_eintrag_kein_user(store):
+    assert get_user_from_session({"sid": "fehlt"}) is None
+    assert get_user_from_session({}) is None
+
+
+def test_touch_verlaengert(store, monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(session_mod.time, "time", lambda: now[0])
+    session = {"sid": "s1"}
+    store_user_in_session(session, _user())
+    now[0] += session_mod.TOKEN_TTL_SECONDS - 1
+    store.touch("s1")
+    now[0] += session_mod.TOKEN_TTL_SECONDS - 1
+    assert get_user_from_session(session) is not None
+    assert store.purge_expired() == 0
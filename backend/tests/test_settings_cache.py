@@ -0,0 +1,126 @@
+"""Unit-Tests für den TTL-Cache von settings_get (DB-Zugriff gepatcht)."""
+
+import pytest
+
+from backend.database import connection, settings as settings_db
+
+
+class _FakeConn:
+    def __init__(self, store, reads):
+        self.store, self.reads = store, reads
+
+    def close(self):
+        pass
+
+    def commit(self):
+        pass
+
+    def rollback(self):
+        pass
+
+
+@pytest.fixture
+def db(monkeypatch):
+    store = {"COMPANIES": '["A"]'}
+    reads = []
+
+    def fake_fetchone(conn, sql, params=()):
+        reads.append(params[0])
+        raw = store.get(params[0])
+        return {"value": raw} if raw is not None else None
+
+    def fake_exec(conn, sql, params=()):
+        store[params[0]] = params[1]
+
+    monkeypatch.setattr(settings_db, "get_connection", lambda: _FakeConn(store, reads))
+    monkeypatch.setattr(connection, "get_connection", lambda: _FakeConn(store, reads))
+    monkeypatch.setattr(settings_db, "_fetchone", fake_fetchone)
+    monkeypatch.setattr(settings_db, "_exec", fake_exec)
+    settings_db.invalidate_settings_cache()
+    yield store, reads
+    settings_db.invalidate_settings_cache()
+
+
+def test_nur_ein_select_innerhalb_der_ttl(db):
+    _, reads = db
+    assert settings_db.settings_get("COMPANIES") == ["A"]
+    assert settings_db.settings_get("COMPANIES") == ["A"]
+    assert settings_db.settings_get("FEHLT", default=1) == 1
+    assert settings_db.settings_get("FEHLT", default=2) == 2
+    assert reads == ["COMPANIES", "FEHLT"]
+
+
+def test_aufrufer_koennen_ergebnis_veraendern(db):
+    settings_db.settings_get("COMPANIES").append("B")
+    assert settings_db.settings_get("COMPANIES") == ["A"]
+
+
+def test_set_schreibt_durch(db):
+    _, reads = db
+    settings_db.settings_get("COMPANIES")
+    settings_db.settings_set("COMPANIES", ["C"])
+    assert settings_db.settings_get("COMPANIES") == ["C"]
+    assert reads == ["COMPANIES"]
+
+
+def test_abgelaufene_eintraege_werden_neu_geladen(db, monkeypatch):
+    store, reads = db
+    settings_db.settings_get("COMPANIES")
+    store["COMPANIES"] = '["D"]'
+    monkeypatch.setattr(settings_db, "SETTINGS_CACHE_TTL", 0.0)
+    assert settings_db.settings_get("COMPANIES") == ["D"]
+    assert len(reads) == 2
+
+
+def test_firmen_werden_nur_bei_neuem_wert_normalisiert(db, monkeypatch):
+    store, _ = db
+    calls = []
+    orig = settings_db.normalize_company
+    monkeypatch.setattr(settings_db, "normalize_company", lambda item: calls.append(item) or orig(item))
+    first = settings_db.get_companies_full()
+    first[0]["name"] = "X"
+    assert settings_db.get_companies_full()[0]["name"] == "A"
+    assert len(calls) == 1
+    settings_db.settings_set("COMPANIES", ["B", "C"])
+    assert [c["name"] for c in settings_db.get_companies_full()] == ["B", "C"]
+    assert len(calls) == 3
+
+
+def test_invalidierung_waehrend_des_lesens_verwirft_den_wert(db, monkeypatch):
+    store, reads = db
+    orig = settings_db._fetchone
+
+    def racing_fetchone(conn, sql, params=()):
+        row = orig(conn, sql, params)
+        settings_db.invalidate_settings_cache("COMPANIES")  # paralleler Schreiber
+        store["COMPANIES"] = '["NEU"]'
+        return row
+
+    monkeypatch.setattr(settings_db, "_fetchone", racing_fetchone)
+    assert settings_db.settings_get("COMPANIES") == ["A"]
+    monkeypatch.setattr(settings_db, "_fetchone", orig)
+    assert settings_db.settings_get("COMPANIES") == ["NEU"]
+
+
+def test_firmen_speichern_liest_zaehler_ungecacht(db):
+    store, _ = db
+    store["COMPANIES"] = '[{"name": "A", "pnr_from": "1", "pnr_to": "9", "pnr_current": 3}]'
+    assert settings_db.get_companies_full()[0]["pnr_current"] == 3
+    # Vergabe in einem anderen Worker: DB weiter, Cache hier noch alt.
+    store["COMPANIES"] = '[{"name": "A", "pnr_from": "1", "pnr_to": "9", "pnr_current": 5}]'
+    settings_db.set_companies_full([{"name": "A", "pnr_from": "1", "pnr_to": "9"}])
+    assert settings_db.get_companies_full()[0]["pnr_current"] == 5
+
+
+def test_schreiben_waehrend_des_lesens_behaelt_den_neuen_wert(db, monkeypatch):
+    orig = settings_db._fetchone
+
+    def racing_fetchone(conn, sql, params=()):
+        row = orig(conn, sql, params)
+        monkeypatch.setattr(settings_db, "_fetchone", orig)
+        settings_db.settings_set("COMPANIES", ["NEU"])  # Commit nach dem Lesen
+        return row
+
+    monkeypatch.setattr(settings_db, "_fetchone", racing_fetchone)
+    assert settings_db.settings_get("COMPANIES") == ["A"]
+    assert settings_db.settings_get("COMPANIES") == ["NEU"]
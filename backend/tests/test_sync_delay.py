@@ -0,0 +1,14 @@
+"""Unit-Tests für die Wartezeit des Hintergrund-Syncs (Backoff + Jitter)."""
+
+from backend.core.app_lifespan import SYNC_RETRY_BASE, next_sync_delay
+
+
+def test_regulaer_das_intervall_mit_jitter():
+    for _ in range(50):
+        assert 1800 * 0.9 <= next_sync_delay(1800, 0) <= 1800 * 1.1
+
+
+def test_backoff_nach_fehlschlaegen_gedeckelt():
+    assert next_sync_delay(1800, 1) <= SYNC_RETRY_BASE * 1.1
+    assert SYNC_RETRY_BASE * 2 * 0.9 <= next_sync_delay(1800, 2) <= SYNC_RETRY_BASE * 2 * 1.1
+    assert next_sync_delay(1800, 20) <= 1800 * 1.1
@@ -0,0 +1,37 @@
+"""Unit-Tests für Ticket.from_row – created_at als DATETIME oder Alt-String (ohne DB)."""
+
+from datetime import datetime
+
+from backend.models.models import Ticket
+
+
+def _row(**kw) -> dict:
+    base = dict(
+        id=1, title="T", ticket_type="hardware", description="{}",
+        owner_id="u1", owner_name="User", status="in_progress",
+    )
+    base.update(kw)
+    return base
+
+
+def test_datetime_spalte_wird_uebernommen():
+    ts = datetime(2024, 5, 1, 12, 30, 0, 123456)
+    assert Ticket.from_row(_row(created_at=ts)).created_at == ts
+
+
+def test_iso_string_aus_altdaten_wird_geparst():
+    t = Ticket.from_row(_row(created_at="2024-05-01T12:30:00.123456"))
+    assert t.created_at == datetime(2024, 5, 1, 12, 30, 0, 123456)
+
+
+def test_listen_projektion_reicht_fuer_ticket_out():
+    from backend.database.tickets import TICKET_LIST_FIELDS
+    from backend.schemas.ticket import TicketOut
+
+    cols = [c.strip() for c in TICKET_LIST_FIELDS.replace("\n", " ").split(",") if c.strip()]
+    full = _row(comment="", priority="high", created_at=datetime(2024, 5, 1),
+                updated_at=None, workflow_state=None)
+    row = {c: full.get(c) for c in cols}
+    out = TicketOut.from_ticket(Ticket.from_row(row))
+    assert out.priority.value == "high"
+    assert out.description == "{}"
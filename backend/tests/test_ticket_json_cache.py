@@ -0,0 +1,67 @@
+"""Unit-Tests für das Parse-Memo der JSON-Spalten am Ticket-Modell (ohne DB)."""
+
+import json
+from datetime import datetime
+
+from backend.models.models import Ticket, TicketType, RequestStatus
+
+
+def _ticket(**kw) -> Ticket:
+    base = dict(
+        id=1, title="T", ticket_type=TicketType.hardware,
+        description=json.dumps({"a": 1}),
+        owner_id="u1", owner_name="User", owner_info=None,
+        status=RequestStatus.in_progress,
+        created_at=datetime(2024, 1, 1),
+    )
+    base.update(kw)
+    return Ticket(**base)
+
+
+def test_wird_nur_einmal_geparst():
+    t = _ticket(workflow_state=json.dumps({"phases": []}))
+    assert t.workflow_state_parsed is t.workflow_state_parsed
+
+
+def test_neu_zugewiesene_spalte_wird_neu_geparst():
+    t = _ticket()
+    assert t.description_parsed == {"a": 1}
+    t.description = json.dumps({"a": 2})
+    assert t.description_parsed == {"a": 2}
+
+
+def test_ungueltiges_json_liefert_default():
+    t = _ticket(description="{kaputt", history="nope")
+    assert t.description_parsed == {}
+    assert t.history_parsed == []
+    assert t.owner_info_parsed == {}
+
+
+def test_memo_beeinflusst_gleichheit_nicht():
+    a, b = _ticket(), _ticket()
+    _ = a.description_parsed
+    assert a == b
+
+
+def test_kein_objekt_oder_array_liefert_default():
+    t = _ticket(owner_info="-", history="null", workflow_state='  {"phases": []}')
+    assert t.owner_info_parsed == {}
+    assert t.history_parsed == []
+    assert t.workflow_state_parsed == {"phases": []}
+
+
+def test_vorgeparster_wert_wird_genutzt():
+    t = _ticket()
+    obj = {"a": 1}
+    t.prime_parsed("description", obj)
+    assert t.description_parsed is obj
+    t.description = json.dumps({"a": 3})
+    assert t.description_parsed == {"a": 3}
+
+
+def test_leere_literale_liefern_eigene_objekte():
+    a, b = _ticket(), _ticket()
+    assert a.history_parsed == [] and a.assignment_history_parsed == []
+    a.history_parsed.append({"action": "x"})
+    assert b.history_parsed == []
+    assert _ticket(owner_info="{}").owner_info_parsed == {}
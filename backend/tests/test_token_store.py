@@ -0,0 +1,45 @@
+"""Unit-Tests für den serverseitigen Token-Store (Ablauf nach TTL)."""
+
+from backend.core import session as session_mod
+from backend.core.session import TokenStore
+
+
+def test_eintrag_laeuft_ab(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(session_mod.time, "time", lambda: now[0])
+    store = TokenStore()
+    store.put("s1", {"access_token": "a"})
+    assert store.get("s1")["access_token"] == "a"
+    now[0] += session_mod.TOKEN_TTL_SECONDS
+    assert store.get("s1") is None
+
+
+def test_purge_entfernt_nur_abgelaufene(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(session_mod.time, "time", lambda: now[0])
+    store = TokenStore()
+    store.put("alt", {"access_token": "a"})
+    now[0] += session_mod.TOKEN_TTL_SECONDS - 1
+    store.put("neu", {"access_token": "b"})
+    now[0] += 1
+    assert store.purge_expired() == 1
+    assert store.get("neu") is not None
+
+
+def test_kapazitaet_verdraengt_aeltesten():
+    store = TokenStore(max_entries=2)
+    for sid in ("a", "b", "c"):
+        store.put(sid, {"access_token": sid})
+    assert store.approx_size() == 2
+    assert store.get("a") is None
+    assert store.get("c")["access_token"] == "c"
+
+
+def test_erneutes_put_zaehlt_als_neuester_eintrag():
+    store = TokenStore(max_entries=2)
+    store.put("a", {})
+    store.put("b", {})
+    store.put("a", {})
+    store.put("c", {})
+    assert store.get("a") is not None
+    assert store.get("b") is None
@@ -0,0 +1,21 @@
+"""Unit-Tests für die gecachte Antwort von GET /users (ohne App/DB)."""
+
+import json
+
+from backend.api.v1 import users
+
+
+def test_payload_wird_je_snapshot_einmal_gebaut():
+    snapshot = (
+        {"id": "u1", "displayName": "A", "mail": "a@x.de"},
+        {"id": "u2", "displayName": ""},
+    )
+    body = users._user_list_payload(snapshot)
+    assert users._user_list_payload(snapshot) is body
+    assert json.loads(body) == {"data": {"users": [{"id": "u1", "displayName": "A", "mail": "a@x.de"}]}}
+
+
+def test_neuer_snapshot_wird_neu_serialisiert():
+    first = users._user_list_payload(({"id": "u1", "displayName": "A"},))
+    second = users._user_list_payload(({"id": "u2", "displayName": "B"},))
+    assert first != second
@@ -0,0 +1,31 @@
+"""validate_assignee: Platzhalter und User ohne Gruppen-Lookup (ohne DB)."""
+
+import pytest
+
+from backend.api.v1 import tickets
+
+
+@pytest.fixture
+def no_group_lookup(monkeypatch):
+    def boom(_group_id):
+        raise AssertionError("Gruppen-Cache darf nicht abgefragt werden")
+    monkeypatch.setattr(tickets, "group_exists", boom)
+
+
+def test_platzhalter_fachabteilung(no_group_lookup):
+    assert tickets.validate_assignee({}, "fachabteilung") is True
+
+
+def test_leere_id_ist_ungueltig(no_group_lookup):
+    assert tickets.validate_assignee({"u1": {}}, "") is False
+    assert tickets.validate_assignee({"u1": {}}, None) is False
+
+
+def test_bekannter_user_ohne_gruppen_lookup(no_group_lookup):
+    assert tickets.validate_assignee({"u1": {"id": "u1"}}, "u1") is True
+
+
+def test_unbekannte_id_faellt_auf_gruppen_zurueck(monkeypatch):
+    monkeypatch.setattr(tickets, "group_exists", lambda gid: gid == "g1")
+    assert tickets.validate_assignee({}, "g1") is True
+    assert tickets.validate_assignee({}, "x") is False
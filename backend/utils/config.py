@@ -21,6 +21,8 @@ class Config:
     REDIRECT_URI = os.getenv("REDIRECT_URI", "")
     SCOPE = [s.strip() for s in os.getenv("SCOPE", "User.Read,Mail.Send").split(",") if s.strip()]
     ADMIN_GROUP_ID = os.getenv("ADMIN_GROUP_ID", "")
+    # Auch mehrere Admin-Gruppen (komma-getrennt); frozenset für den Abgleich beim Login.
+    ADMIN_GROUP_IDS = frozenset(g.strip() for g in ADMIN_GROUP_ID.split(",") if g.strip())
     TICKET_MAIL = os.getenv("TICKET_MAIL", "")
     # Empfänger für Fehlerberichte / Feedback aus der UI
     BUG_REPORT_MAIL = os.getenv("BUG_REPORT_MAIL", "")
@@ -0,0 +1,18 @@
+"""
+JSON-(De)Serialisierung über orjson (deutlich schneller als das stdlib-json).
+
+dumps() liefert – wie json.dumps(..., ensure_ascii=False) – einen str mit
+unveränderten Umlauten; loads() nimmt str oder bytes. Ungültiges JSON wirft
+orjson.JSONDecodeError (Unterklasse von json.JSONDecodeError / ValueError).
+"""
+
+import orjson
+
+
+def loads(data: str | bytes):
+    return orjson.loads(data)
+
+
+def dumps(obj) -> str:
+    # OPT_NON_STR_KEYS: int-/Enum-Keys wie beim stdlib-json zulassen.
+    return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS).decode()